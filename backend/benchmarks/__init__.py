@@ -0,0 +1,3 @@
+"""
+Offline benchmarking tools (mock Groq server, load-test harness)
+"""
@@ -0,0 +1,290 @@
+"""
+Load Test - Drive the API at a target request rate and report tail latency
+
+Open-loop load generator: requests are scheduled at a fixed rate per
+endpoint regardless of how fast earlier ones complete, and latency is
+measured from the scheduled send time, so a stalled server shows up as
+tail latency instead of silently lowering the offered load.
+
+Reports p50/p95/p99, throughput and error rate per endpoint, and can write
+the report as JSON.
+
+Fully offline run (spawns the mock Groq server and the API):
+
+    python -m benchmarks.load_test --spawn --rps 5 --duration 30
+
+Against an already running API:
+
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 \\
+        --endpoints chat,explore_instant --rps 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+PROFILE = {
+    "age": 29,
+    "nationality": "IN",
+    "education": {"level": "masters", "field": "Computer Science"},
+    "workExperience": {"title": "Software Engineer", "yearsOfExperience": 5, "skills": ["python", "aws"]},
+    "financial": {"annualIncomeUsd": 60000, "savingsUsd": 30000},
+    "goals": {"targetCountries": ["CA", "DE"], "timeline": "within_2_years", "priorities": ["career"]},
+    "languages": [{"language": "English", "proficiency": "fluent"}]
+}
+
+EXPLORE_REQUEST = {
+    "nationality": "IN",
+    "targetCountries": ["CA", "DE"],
+    "fieldOfWork": "software",
+    "yearsOfExperience": 5,
+    "educationLevel": "masters",
+    "skills": ["python"]
+}
+
+CHAT_QUESTIONS = [
+    "What are the requirements for Canada Express Entry?",
+    "How long does a German EU Blue Card take?",
+    "Which countries offer a digital nomad visa?",
+    "What savings do I need to move to Australia?"
+]
+
+
+@dataclass
+class Scenario:
+    """One endpoint to load: HTTP method, path and a request body factory"""
+    method: str
+    path: str
+    body: Callable[[int], Optional[Dict]] = lambda i: None
+
+
+SCENARIOS = {
+    "chat": Scenario("POST", "/api/v1/chat", lambda i: {
+        "message": CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)],
+        "session_id": f"load-{i}"
+    }),
+    "analyze_real": Scenario("POST", "/api/v1/analyze/real", lambda i: PROFILE),
+    "explore_quick": Scenario("POST", "/api/v1/explore/quick", lambda i: EXPLORE_REQUEST),
+    "explore_instant": Scenario("POST", "/api/v1/explore/instant", lambda i: EXPLORE_REQUEST),
+    "countries": Scenario("GET", "/api/v1/countries"),
+}
+
+DEFAULT_ENDPOINTS = ("chat", "analyze_real", "explore_quick")
+
+
+@dataclass
+class EndpointResult:
+    """Raw samples for one endpoint"""
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> Dict:
+        requests = sum(self.statuses.values())
+        ok = sum(n for status, n in self.statuses.items() if isinstance(status, int) and status < 400)
+        latencies = np.array(self.latencies) if self.latencies else None
+        percentiles = (
+            {f"p{q}": round(float(np.percentile(latencies, q)) * 1000, 1) for q in (50, 95, 99)}
+            if latencies is not None else {"p50": None, "p95": None, "p99": None}
+        )
+        return {
+            "requests": requests,
+            "ok": ok,
+            "errorRate": round(1 - ok / requests, 4) if requests else 0.0,
+            "throughputRps": round(ok / elapsed, 2) if elapsed else 0.0,
+            "latencyMs": {
+                **percentiles,
+                "max": round(float(latencies.max()) * 1000, 1) if latencies is not None else None
+            },
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))}
+        }
+
+
+async def run_load(
+    base_url: str,
+    endpoints: List[str],
+    rps: float,
+    duration: float,
+    clients: int = 50,
+    timeout: float = 120.0,
+    max_in_flight: int = 500
+) -> Dict:
+    """Offer ``rps`` requests/second to each endpoint for ``duration`` seconds"""
+    results: Dict[str, EndpointResult] = defaultdict(EndpointResult)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def fire(name: str, scenario: Scenario, i: int, scheduled: float):
+            result = results[name]
+            async with in_flight:
+                try:
+                    response = await client.request(
+                        scenario.method,
+                        scenario.path,
+                        json=scenario.body(i),
+                        headers={"X-Session-Id": f"load-client-{i % clients}"}
+                    )
+                    result.statuses[response.status_code] += 1
+                    if response.status_code < 400:
+                        result.latencies.append(time.perf_counter() - scheduled)
+                except httpx.HTTPError as e:
+                    result.statuses[type(e).__name__] += 1
+
+        started = time.perf_counter()
+        tasks = []
+        total = int(rps * duration)
+        schedule = sorted(
+            (started + i / rps, name, i)
+            for name in endpoints
+            for i in range(total)
+        )
+        for scheduled, name, i in schedule:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(name, SCENARIOS[name], i, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "baseUrl": base_url,
+            "rpsPerEndpoint": rps,
+            "durationSeconds": duration,
+            "clients": clients
+        },
+        "elapsedSeconds": round(elapsed, 2),
+        "endpoints": {name: results[name].summary(elapsed) for name in endpoints}
+    }
+
+
+def print_report(report: Dict):
+    header = f"{'endpoint':<16}{'reqs':>7}{'ok':>7}{'err%':>8}{'rps':>8}{'p50ms':>10}{'p95ms':>10}{'p99ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, s in report["endpoints"].items():
+        lat = s["latencyMs"]
+        fmt = lambda v: f"{v:>10.1f}" if v is not None else f"{'-':>10}"
+        print(
+            f"{name:<16}{s['requests']:>7}{s['ok']:>7}{s['errorRate'] * 100:>7.1f}%"
+            f"{s['throughputRps']:>8.2f}{fmt(lat['p50'])}{fmt(lat['p95'])}{fmt(lat['p99'])}"
+        )
+
+
+def _wait_for(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def spawn_stack(args) -> List[subprocess.Popen]:
+    """Start the mock Groq server and the API wired to it"""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.mock_groq_server",
+            "--port", str(args.mock_port),
+            "--latency-ms", str(args.mock_latency_ms),
+            "--rate-429", str(args.mock_rate_429),
+            "--rate-5xx", str(args.mock_rate_5xx),
+        ],
+        cwd=BACKEND_DIR
+    )
+    _wait_for(f"{mock_url}/mock/stats")
+
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "mock-key",
+        "GROQ_BASE_URL": f"{mock_url}/openai/v1",
+        "KNOWLEDGE_HOT_RELOAD": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    if not args.keep_limits:
+        # Measure the service, not the client-side Groq quota
+        env.update({"GROQ_RPM_LIMIT": "100000", "GROQ_TPM_LIMIT": "100000000", "LLM_CLIENT_RPM_LIMIT": "100000"})
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.api_port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+    try:
+        _wait_for(f"http://127.0.0.1:{args.api_port}/health")
+    except RuntimeError:
+        api.terminate()
+        mock.terminate()
+        raise
+    return [api, mock]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Open-loop load test for the mobility API")
+    parser.add_argument("--base-url", default=None, help="Running API to test (default: spawned stack)")
+    parser.add_argument("--spawn", action="store_true", help="Start the mock Groq server and the API locally")
+    parser.add_argument("--endpoints", default=",".join(DEFAULT_ENDPOINTS),
+                        help=f"Comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--rps", type=float, default=2.0, help="Target requests/second per endpoint")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--clients", type=int, default=50, help="Distinct X-Session-Id values")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--mock-port", type=int, default=8900)
+    parser.add_argument("--mock-latency-ms", type=float, default=800.0)
+    parser.add_argument("--mock-rate-429", type=float, default=0.0)
+    parser.add_argument("--mock-rate-5xx", type=float, default=0.0)
+    parser.add_argument("--keep-limits", action="store_true", help="Keep the Groq rate governor limits when spawning")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = [e for e in endpoints if e not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)}")
+
+    processes = []
+    base_url = args.base_url
+    if args.spawn or base_url is None:
+        processes = spawn_stack(args)
+        base_url = f"http://127.0.0.1:{args.api_port}"
+
+    try:
+        report = asyncio.run(run_load(
+            base_url, endpoints, args.rps, args.duration,
+            clients=args.clients, timeout=args.timeout
+        ))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Mock Groq Server - Offline OpenAI-compatible stand-in for the Groq API
+
+Serves ``/openai/v1/chat/completions`` (and ``/v1/...``) with canned bodies
+so the backend can be exercised and benchmarked without network access or
+Groq quota:
+
+- CrewAI stage prompts (and their repair prompts) name the output schema
+  they expect ("matching the `RiskAssessmentOutput` schema") and get that
+  schema's example, so crew runs go through the normal validation path.
+- Other JSON-mode requests (``response_format: json_object``, or prompts
+  asking for JSON) get an analysis that satisfies LLMService's schema;
+  everything else gets a chat answer.
+- Latency is drawn from a log-normal distribution around a median.
+- A share of requests can be rejected with 429 + Retry-After, or 503.
+- ``stream: true`` is answered with server-sent event chunks.
+
+Run it and point the backend at it:
+
+    python -m benchmarks.mock_groq_server --port 8900 --latency-ms 800
+    GROQ_BASE_URL=http://127.0.0.1:8900/openai/v1 GROQ_API_KEY=mock uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.schemas.outputs import (
+    FinalRecommendation,
+    MobilityPathsOutput,
+    ProfileAnalysisOutput,
+    RiskAssessmentOutput,
+)
+
+CHARS_PER_TOKEN = 4
+
+_STAGE_SCHEMA = re.compile(r"matching the `(\w+)` schema")
+
+ANALYSIS_BODY = {
+    "profileSummary": {
+        "strengths": [
+            "In-demand technical skills with several years of experience",
+            "Postgraduate education recognised by most skilled-migration programs"
+        ],
+        "weaknesses": [
+            "No recent language test result on file",
+            "Savings are close to the minimum settlement funds"
+        ],
+        "eligibleVisas": [{"country": "Canada", "visaTypes": ["Express Entry"]}],
+        "profileScore": 78,
+        "competitiveAdvantages": ["Occupation on shortage lists"]
+    },
+    "rankedPaths": [
+        {
+            "id": "path_1",
+            "rank": 1,
+            "name": "Direct Path to Canada",
+            "description": "Apply for permanent residence through Express Entry",
+            "steps": [
+                {
+                    "order": 1,
+                    "country": "Canada",
+                    "countryCode": "CA",
+                    "visaType": "Express Entry",
+                    "duration": "6-8 months",
+                    "purpose": "Permanent residence",
+                    "requirements": ["IELTS CLB 7+", "Educational Credential Assessment", "Proof of funds"],
+                    "estimatedCost": 2300,
+                    "currency": "USD",
+                    "keyActions": ["Book IELTS", "Order ECA"],
+                    "timeline": "Start within 1 month"
+                }
+            ],
+            "totalDuration": "6-8 months",
+            "totalCost": 2300,
+            "overallScore": 85,
+            "approvalProbability": 75,
+            "riskLevel": "low",
+            "riskFactors": ["CRS cut-off changes between draws"],
+            "whyThisPath": "Skills and education score well under the CRS",
+            "recommendation": "Take the IELTS and create an Express Entry profile",
+            "successFactors": ["High language score"]
+        },
+        {
+            "id": "path_2",
+            "rank": 2,
+            "name": "Germany via EU Blue Card",
+            "description": "Work in Germany on a Blue Card, then settle",
+            "steps": [
+                {
+                    "order": 1,
+                    "country": "Germany",
+                    "countryCode": "DE",
+                    "visaType": "EU Blue Card",
+                    "duration": "2-3 months",
+                    "purpose": "Skilled employment",
+                    "requirements": ["Job offer above the salary threshold", "Recognised degree"],
+                    "estimatedCost": 110,
+                    "currency": "USD",
+                    "keyActions": ["Apply for roles", "Check degree in anabin"],
+                    "timeline": "After securing an offer"
+                }
+            ],
+            "totalDuration": "21-33 months to settlement",
+            "totalCost": 110,
+            "overallScore": 72,
+            "approvalProbability": 65,
+            "riskLevel": "medium",
+            "riskFactors": ["Requires a job offer"],
+            "whyThisPath": "Blue Card offers a fast track to settlement",
+            "recommendation": "Target employers that sponsor Blue Cards",
+            "successFactors": ["German A1/B1 shortens the settlement wait"]
+        }
+    ],
+    "actionItems": [
+        {
+            "order": 1,
+            "action": "Book an IELTS General Training test",
+            "deadline": "Within 4 weeks",
+            "priority": "high",
+            "details": "Aim for CLB 9 in every band",
+            "resources": ["ielts.org"],
+            "estimatedCost": 250,
+            "currency": "USD"
+        }
+    ],
+    "riskAnalysis": {
+        "overallRisk": "medium",
+        "criticalFactors": ["Language score", "Proof of funds"],
+        "mitigationStrategies": ["Retake IELTS if below target", "Build savings buffer"]
+    },
+    "citations": [
+        {
+            "id": "cite_1",
+            "source": "Immigration, Refugees and Citizenship Canada",
+            "text": "Express Entry manages applications for permanent residence.",
+            "url": "https://www.canada.ca/en/immigration-refugees-citizenship.html"
+        }
+    ]
+}
+
+# CrewAI stage outputs, keyed by schema name: each schema's own example,
+# completed where the example leaves out a required field
+STAGE_BODIES = {
+    schema.__name__: (schema.model_config.get("json_schema_extra") or {}).get("example", {})
+    for schema in (ProfileAnalysisOutput, MobilityPathsOutput, RiskAssessmentOutput, FinalRecommendation)
+}
+STAGE_BODIES["FinalRecommendation"] = {
+    **STAGE_BODIES["FinalRecommendation"],
+    "why_not_others": "The direct route falls short on CRS points without the UAE experience step.",
+}
+
+CHAT_BODY = (
+    "Canada's Express Entry system is usually the fastest route for skilled "
+    "workers. You will need a language test, an educational credential "
+    "assessment and proof of funds. Processing typically takes around six "
+    "months once you receive an invitation to apply. Please verify details "
+    "with official government sources."
+)
+
+
+@dataclass
+class MockConfig:
+    """Behaviour knobs for the mock server"""
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.5
+    tokens_per_second: float = 250.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after: float = 2.0
+    seed: Optional[int] = None
+
+
+def _estimate_tokens(messages: List[Dict]) -> int:
+    return sum(len(str(m.get("content") or "")) for m in messages) // CHARS_PER_TOKEN + 1
+
+
+def _wants_json(payload: Dict) -> bool:
+    if (payload.get("response_format") or {}).get("type") == "json_object":
+        return True
+    return any("JSON" in str(m.get("content") or "") for m in payload.get("messages", []))
+
+
+def _stage_body(payload: Dict) -> Optional[Dict]:
+    """Canned output for a CrewAI stage or repair prompt, by the schema it names"""
+    for message in reversed(payload.get("messages", [])):
+        match = _STAGE_SCHEMA.search(str(message.get("content") or ""))
+        if match and match.group(1) in STAGE_BODIES:
+            return STAGE_BODIES[match.group(1)]
+    return None
+
+
+def create_app(config: MockConfig = None) -> FastAPI:
+    """Build the mock server app"""
+    config = config or MockConfig()
+    rng = random.Random(config.seed)
+    stats = Counter()
+    app = FastAPI(title="Mock Groq API")
+
+    def sample_latency() -> float:
+        return config.latency_ms / 1000 * rng.lognormvariate(0, config.latency_sigma)
+
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        stats["requests"] += 1
+
+        roll = rng.random()
+        if roll < config.rate_429:
+            stats["429"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after)},
+                content={"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}}
+            )
+        if roll < config.rate_429 + config.rate_5xx:
+            stats["503"] += 1
+            await asyncio.sleep(sample_latency() / 4)
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"message": "Service unavailable (mock)", "type": "server_error"}}
+            )
+
+        stage_body = _stage_body(payload)
+        if stage_body is not None:
+            stats["stage"] += 1
+            content = json.dumps(stage_body)
+        else:
+            content = json.dumps(ANALYSIS_BODY) if _wants_json(payload) else CHAT_BODY
+        prompt_tokens = _estimate_tokens(payload.get("messages", []))
+        completion_tokens = len(content) // CHARS_PER_TOKEN + 1
+        model = payload.get("model", "mock")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        stats["ok"] += 1
+
+        if payload.get("stream"):
+            return StreamingResponse(
+                _stream(content, completion_id, created, model, sample_latency()),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(sample_latency())
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "service_tier": "on_demand",
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def _stream(content: str, completion_id: str, created: int, model: str, first_token_delay: float):
+        await asyncio.sleep(first_token_delay)
+        words = content.split(" ")
+        delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+        for i, word in enumerate(words):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": word if i == 0 else " " + word},
+                    "finish_reason": None
+                }]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(delay)
+        final = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def list_models():
+        return {"object": "list", "data": [{"id": "llama-3.3-70b-versatile", "object": "model", "owned_by": "mock"}]}
+
+    async def mock_stats():
+        return dict(stats)
+
+    for prefix in ("/openai/v1", "/v1"):
+        app.add_api_route(f"{prefix}/chat/completions", chat_completions, methods=["POST"])
+        app.add_api_route(f"{prefix}/models", list_models, methods=["GET"])
+    app.add_api_route("/mock/stats", mock_stats, methods=["GET"])
+
+    return app
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline OpenAI-compatible Groq stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=250.0, help="Streaming chunk rate")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests rejected with 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Share of requests failing with 503")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+RAG Benchmarks - Micro-benchmarks for the retrieval hot paths
+
+Covers:
+- EmbeddingGenerator.embed_text (one call per text) vs embed_texts (batch)
+- VectorStore.query at several collection sizes: unfiltered, with a
+  country ``where`` filter on the global collection, routed to one country
+  partition, and fanned out over three partitions (``--countries`` spreads
+  the corpus over more countries)
+- RAGRetriever.retrieve_all_context
+- DocumentIndexer._chunk_text
+- CitationExtractor.format_for_ui
+
+Collections are filled from the synthetic corpus (up to 100k chunks) in a
+throwaway ChromaDB directory, never the application's data/chromadb.
+Benchmarks whose dependencies are not installed are reported as skipped.
+
+Each run is written as JSON (with the git commit) so runs can be compared:
+
+    python -m benchmarks.rag_bench                       # full run
+    python -m benchmarks.rag_bench --sizes 1000 --only chunk
+    python -m benchmarks.rag_bench --sizes 10000 100000 --countries 200 --only vector_store
+    python -m benchmarks.rag_bench --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import synthetic_corpus
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_COUNTRIES = None  # The knowledge snapshot's countries
+CHROMA_BATCH = 5000
+EMBED_BATCH = 64
+REGRESSION_THRESHOLD = 0.10
+
+_workdir: Optional[tempfile.TemporaryDirectory] = None
+
+
+# ============================================================
+# TIMING
+# ============================================================
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> Dict:
+    """
+    Time ``fn`` like timeit: calibrate a loop count that runs for at least
+    ``min_time`` seconds, then take ``repeat`` samples of that loop.
+    """
+    fn()  # warm-up (imports, caches, lazy model init)
+
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "minSeconds": min(samples),
+        "medianSeconds": statistics.median(samples),
+        "meanSeconds": statistics.fmean(samples),
+        "stdevSeconds": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "opsPerSecond": 1 / statistics.median(samples)
+    }
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+def _tempdir() -> str:
+    global _workdir
+    if _workdir is None:
+        _workdir = tempfile.TemporaryDirectory(prefix="rag_bench_")
+    return _workdir.name
+
+
+@lru_cache(maxsize=None)
+def _embedding_generator():
+    from src.rag.embeddings import EmbeddingGenerator
+    return EmbeddingGenerator()
+
+
+@lru_cache(maxsize=None)
+def _vector_store(size: int, country_count: Optional[int] = None):
+    """
+    A VectorStore whose 'policies' collection holds ``size`` synthetic
+    chunks over ``country_count`` countries, with its country partitions
+    """
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+    from src.rag.vector_store import VectorStore
+
+    client = chromadb.PersistentClient(
+        path=str(Path(_tempdir()) / f"chroma_{size}_{country_count or 'corpus'}"),
+        settings=ChromaSettings(anonymized_telemetry=False)
+    )
+    store = VectorStore.__new__(VectorStore)
+    store.client = client
+    store.embedding_generator = _embedding_generator()
+    store.collections = {}
+    store.partitions = {}
+
+    for namespace, count in (("policies", size), ("financial", min(size, 200))):
+        collection = client.get_or_create_collection(name=namespace, metadata={"hnsw:space": "cosine"})
+        chunks = list(synthetic_corpus.generate_chunks(count, seed=size, country_count=country_count))
+        vectors = synthetic_corpus.random_embeddings(count, seed=size)
+        for start in range(0, count, CHROMA_BATCH):
+            batch = chunks[start:start + CHROMA_BATCH]
+            collection.add(
+                ids=[c["id"] for c in batch],
+                documents=[c["text"] for c in batch],
+                metadatas=[c["metadata"] for c in batch],
+                embeddings=vectors[start:start + CHROMA_BATCH].tolist()
+            )
+        store.collections[namespace] = collection
+        store.rebuild_partitions(namespace)
+    return store
+
+
+def _country_keys(count: int, country_count: Optional[int] = None) -> List[str]:
+    chunks = synthetic_corpus.generate_chunks(count, country_count=country_count)
+    return [chunk["metadata"]["country"] for chunk in chunks]
+
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+
+def bench_embed_text_loop(batch: int = EMBED_BATCH):
+    generator = _embedding_generator()
+    texts = [c["text"] for c in synthetic_corpus.generate_chunks(batch)]
+    return lambda: [generator.embed_text(t) for t in texts]
+
+
+def bench_embed_texts_batch(batch: int = EMBED_BATCH):
+    generator = _embedding_generator()
+    texts = [c["text"] for c in synthetic_corpus.generate_chunks(batch)]
+    return lambda: generator.embed_texts(texts)
+
+
+def bench_vector_query(size: int, mode: str, country_count: Optional[int] = None):
+    """mode: "none", "country" (where filter), "partition" (one) or "fanout" (three partitions)"""
+    store = _vector_store(size, country_count)
+    countries = _country_keys(3, country_count)
+    filter_dict = {"country": countries[0]} if mode == "country" else None
+    routed = {"partition": countries[:1], "fanout": countries}.get(mode)
+    return lambda: store.query(
+        "skilled worker visa requirements proof of funds",
+        top_k=5,
+        namespace="policies",
+        filter_dict=filter_dict,
+        countries=routed
+    )
+
+
+def bench_retrieve_all_context(size: int, country_count: Optional[int] = None):
+    from src.rag.retriever import RAGRetriever
+
+    retriever = RAGRetriever.__new__(RAGRetriever)
+    retriever.vector_store = _vector_store(size, country_count)
+    profile = {
+        "nationality": "IN",
+        "skills": ["python", "cloud", "data"],
+        "education": {"degree": "masters"}
+    }
+    targets = _country_keys(3, country_count)
+    return lambda: retriever.retrieve_all_context(profile, targets)
+
+
+def bench_chunk_text(paragraphs: int):
+    from src.rag.indexer import DocumentIndexer
+
+    indexer = DocumentIndexer.__new__(DocumentIndexer)  # no vector store needed
+    text = synthetic_corpus.policy_document(paragraphs)
+    return lambda: indexer._chunk_text(text, max_length=1000)
+
+
+def bench_format_for_ui(count: int):
+    from src.rag.citation_extractor import CitationExtractor
+
+    citations = synthetic_corpus.citations(count)
+    return lambda: CitationExtractor.format_for_ui(citations)
+
+
+def benchmark_cases(sizes, country_count: Optional[int] = DEFAULT_COUNTRIES) -> List[tuple]:
+    """(name, setup) pairs; setup returns the callable to time"""
+    cases = [
+        (f"embeddings.embed_text_loop[n={EMBED_BATCH}]", lambda: bench_embed_text_loop()),
+        (f"embeddings.embed_texts_batch[n={EMBED_BATCH}]", lambda: bench_embed_texts_batch()),
+    ]
+    suffix = f",countries={country_count}" if country_count else ""
+    for size in sizes:
+        for mode in ("none", "country", "partition", "fanout"):
+            cases.append((
+                f"vector_store.query[size={size},filter={mode}{suffix}]",
+                lambda size=size, mode=mode: bench_vector_query(size, mode, country_count)
+            ))
+        cases.append((
+            f"retriever.retrieve_all_context[size={size}{suffix}]",
+            lambda size=size: bench_retrieve_all_context(size, country_count)
+        ))
+    for paragraphs in (50, 500, 5000):
+        cases.append((
+            f"indexer.chunk_text[paragraphs={paragraphs}]",
+            lambda paragraphs=paragraphs: bench_chunk_text(paragraphs)
+        ))
+    for count in (10, 100, 1000):
+        cases.append((
+            f"citations.format_for_ui[n={count}]",
+            lambda count=count: bench_format_for_ui(count)
+        ))
+    return cases
+
+
+# ============================================================
+# RUN / COMPARE
+# ============================================================
+
+def _git_commit() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True
+        ).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def run(
+    sizes=DEFAULT_SIZES,
+    only: Optional[str] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    country_count: Optional[int] = DEFAULT_COUNTRIES
+) -> Dict:
+    """Run every (matching) benchmark and return the report"""
+    results = {}
+    for name, setup in benchmark_cases(sizes, country_count):
+        if only and only not in name:
+            continue
+        try:
+            fn = setup()
+        except ImportError as e:
+            results[name] = {"skipped": f"missing dependency: {e.name or e}"}
+            print(f"  skip  {name} ({results[name]['skipped']})")
+            continue
+        stats = measure(fn, min_time=min_time, repeat=repeat)
+        results[name] = stats
+        print(f"  {stats['medianSeconds'] * 1000:>10.3f} ms  {name}")
+
+    return {
+        "suite": "rag",
+        "createdAt": datetime.now().isoformat(),
+        **_git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": results
+    }
+
+
+def compare(base: Dict, head: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Print median changes from base to head; return the names that regressed"""
+    print(f"{'benchmark':<55}{'base ms':>12}{'head ms':>12}{'change':>10}")
+    regressions = []
+    for name, head_stats in head["benchmarks"].items():
+        base_stats = base["benchmarks"].get(name)
+        if not base_stats or "medianSeconds" not in base_stats or "medianSeconds" not in head_stats:
+            continue
+        base_ms = base_stats["medianSeconds"] * 1000
+        head_ms = head_stats["medianSeconds"] * 1000
+        change = head_ms / base_ms - 1
+        flag = "  ⚠️" if change > threshold else ""
+        if change > threshold:
+            regressions.append(name)
+        print(f"{name:<55}{base_ms:>12.3f}{head_ms:>12.3f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RAG hot-path micro-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Vector collection sizes (chunks)")
+    parser.add_argument("--countries", type=int, default=DEFAULT_COUNTRIES,
+                        help="Countries to spread the synthetic corpus over (default: the knowledge snapshot's)")
+    parser.add_argument("--only", default=None, help="Run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Report path (default: benchmarks/results/)")
+    parser.add_argument("--compare", nargs="+", metavar="REPORT",
+                        help="Compare BASE [HEAD] reports instead of running (HEAD defaults to a fresh run)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Median slowdown counted as a regression (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        base, head = (json.loads(Path(p).read_text()) for p in args.compare)
+    else:
+        base = json.loads(Path(args.compare[0]).read_text()) if args.compare else None
+        head = run(args.sizes, args.only, args.min_time, args.repeat, args.countries)
+        output = Path(args.output) if args.output else (
+            RESULTS_DIR / f"rag-{head['commit'] or 'nogit'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(head, indent=2))
+        print(f"\nReport written to {output}")
+
+    if base is not None:
+        print()
+        regressions = compare(base, head, args.threshold)
+        if regressions and args.fail_on_regression:
+            raise SystemExit(f"{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Synthetic Corpus - Deterministic, scalable documents for RAG benchmarks
+
+Chunks are generated from the real country and visa vocabulary in the
+knowledge snapshot, in the same text/metadata shape DocumentIndexer
+produces, so filters and chunking behave like production. Everything is
+seeded and generated lazily, so 100k chunks cost a few hundred milliseconds.
+"""
+import random
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from src.services.knowledge_snapshot import get_knowledge_snapshot
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+REQUIREMENTS = [
+    "valid passport", "proof of funds", "job offer", "health insurance",
+    "police clearance", "language test result", "degree recognition",
+    "medical examination", "employer sponsorship", "skills assessment",
+]
+
+FILLER = [
+    "Applicants must submit all documents through the official portal.",
+    "Processing times vary with application volume and completeness.",
+    "Dependants may be included in the application for an additional fee.",
+    "Biometrics are collected at an approved visa application centre.",
+    "Holders may change employers after the first year of residence.",
+    "The policy was last revised following the annual quota review.",
+    "Settlement funds must be held for at least six months before applying.",
+    "Permanent residence may be requested after the qualifying period.",
+]
+
+
+def _vocabulary() -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Country keys and (visa type, visa name) pairs from the knowledge snapshot"""
+    snapshot = get_knowledge_snapshot()
+    countries = sorted(snapshot.countries)
+    visas = sorted({
+        (visa.type, visa.name)
+        for data in snapshot.countries.values()
+        for visa in data.visa_types
+    })
+    return countries, visas or [("work", "Work Visa")]
+
+
+def generate_chunks(count: int, seed: int = 42, country_count: int = None) -> Iterator[Dict]:
+    """
+    Yield ``count`` indexer-shaped chunks ({id, text, metadata}).
+
+    Countries are drawn uniformly so country filters select ~1/N of the
+    corpus, matching the real corpus shape. ``country_count`` spreads the
+    chunks over that many countries, numbering copies of the real ones
+    ("canada_2") beyond the corpus size.
+    """
+    rng = random.Random(seed)
+    countries, visas = _vocabulary()
+    if country_count:
+        countries = [
+            countries[i % len(countries)] + (f"_{i // len(countries)}" if i >= len(countries) else "")
+            for i in range(country_count)
+        ]
+
+    for i in range(count):
+        country = countries[i % len(countries)]
+        visa_type, visa_name = rng.choice(visas)
+        requirements = ", ".join(rng.sample(REQUIREMENTS, 3))
+        filler = " ".join(rng.sample(FILLER, rng.randint(1, 4)))
+        text = (
+            f"Country: {country.title()}\n"
+            f"Visa Type: {visa_name}\n"
+            f"Requirements: {requirements}\n"
+            f"Processing Time: {rng.randint(1, 12)} months\n"
+            f"Notes: {filler}"
+        )
+        yield {
+            "id": f"synthetic_{i}",
+            "text": text,
+            "metadata": {
+                "country": country,
+                "visa_type": visa_type,
+                "source": "country_data",
+                "title": f"{country.title()} - {visa_name}"
+            }
+        }
+
+
+def random_embeddings(count: int, dim: int = EMBEDDING_DIM, seed: int = 42) -> np.ndarray:
+    """
+    Unit-normalised random vectors.
+
+    Search cost depends on index size and dimension, not on what the vectors
+    mean, so large indexes are filled with these instead of running the
+    embedding model over every chunk.
+    """
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def policy_document(paragraphs: int, seed: int = 42) -> str:
+    """A markdown policy document with ``paragraphs`` paragraphs of mixed length"""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(paragraphs):
+        if i % 6 == 0:
+            parts.append(f"## Section {i // 6 + 1}")
+        parts.append(" ".join(rng.choice(FILLER) for _ in range(rng.randint(1, 8))))
+    return "\n\n".join(parts)
+
+
+def citations(count: int, seed: int = 42) -> List[Dict]:
+    """Retriever-shaped citations, as passed to CitationExtractor.format_for_ui"""
+    rng = random.Random(seed)
+    sources = ["country_data", "policy_document", "financial_thresholds", "official government guidance"]
+    return [
+        {
+            "id": f"cite_{i + 1}",
+            "source": rng.choice(sources),
+            "title": chunk["metadata"]["title"],
+            "snippet": chunk["text"],
+            "country": chunk["metadata"]["country"],
+            "relevance_score": round(rng.uniform(0.4, 0.99), 3),
+            "url": None
+        }
+        for i, chunk in enumerate(generate_chunks(count, seed))
+    ]
@@ -17,6 +17,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.api.routes import analysis, countries, health, chat, travel
 from src.api.routes import explore  # Dynamic path exploration
 from src.core.config import settings
+from src.api.responses import FastJSONResponse
+from src.api.middleware.rate_limit import LLMRequestContextMiddleware, register_rate_limit_handler
+from src.services.path_graph_service import get_path_graph
+from src.services.knowledge_reloader import get_knowledge_reloader
 
 # Verify Groq API key is loaded
 if settings.GROQ_API_KEY:
@@ -28,7 +32,8 @@ else:
 app = FastAPI(
     title="Global Mobility Intelligence API",
     description="AI-powered global mobility and visa pathway analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS Configuration
@@ -46,6 +51,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tag requests with client identity and LLM priority for the rate governor
+app.add_middleware(LLMRequestContextMiddleware)
+register_rate_limit_handler(app)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(analysis.router, prefix="/api/v1", tags=["Analysis"])
@@ -55,6 +64,24 @@ app.include_router(chat.router, prefix="/api/v1", tags=["Chat"])
 app.include_router(travel.router, prefix="/api/v1", tags=["Travel"])
 
 
+@app.on_event("startup")
+async def warm_path_graph():
+    """Build the country transition graph once, before the first request"""
+    get_path_graph()
+
+
+@app.on_event("startup")
+async def start_knowledge_watcher():
+    """Hot-reload policy and country data when files under data/ change"""
+    if settings.KNOWLEDGE_HOT_RELOAD:
+        get_knowledge_reloader().start()
+
+
+@app.on_event("shutdown")
+async def stop_knowledge_watcher():
+    await get_knowledge_reloader().stop()
+
+
 @app.get("/")
 async def root():
     return {
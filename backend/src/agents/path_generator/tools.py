@@ -4,32 +4,42 @@ Tools available to the Path Generator Agent
 from crewai.tools import tool
 from typing import List
 
+from src.agents.tool_cache import memoized_tool
+from src.agents.profile_analyst.tools import calculate_points_test
+from src.services.agent_knowledge import get_agent_knowledge
+
 
 @tool("query_visa_requirements")
-def query_visa_requirements(country: str, visa_type: str) -> str:
+@memoized_tool
+def query_visa_requirements(country: str, visa_type: str) -> dict:
     """
     Queries visa requirements for a specific country and visa type.
-    Returns structured requirement information.
+    Returns requirements, processing time, fees, financial requirement,
+    path to PR and relevant policy excerpts. Lists every visa of the
+    country when the type does not match one.
     """
-    return f"Visa requirements for {visa_type} in {country}"
+    return get_agent_knowledge().visa_requirements(country, visa_type)
 
 
 @tool("check_stepping_stone_routes")
-def check_stepping_stone_routes(origin: str, destination: str) -> str:
+@memoized_tool
+def check_stepping_stone_routes(origin: str, destination: str) -> dict:
     """
     Finds intermediate countries that can serve as stepping stones
-    from origin to destination.
+    from origin to destination, plus the best multi-country routes.
     """
-    return f"Stepping stone routes from {origin} to {destination}"
+    return get_agent_knowledge().stepping_stones(origin, destination)
 
 
 @tool("get_country_compatibility")
-def get_country_compatibility(profile_summary: str, country: str) -> str:
+@memoized_tool
+def get_country_compatibility(profile_summary: str, country: str) -> dict:
     """
     Evaluates how compatible a user profile is with a specific country's
-    immigration requirements.
+    immigration requirements: skill demand, education level, friendliness,
+    processing speed, language and visa options.
     """
-    return f"Compatibility check for {country}"
+    return get_agent_knowledge().country_compatibility(profile_summary, country)
 
 
 def get_path_generator_tools() -> List:
@@ -37,5 +47,6 @@ def get_path_generator_tools() -> List:
     return [
         query_visa_requirements,
         check_stepping_stone_routes,
-        get_country_compatibility
+        get_country_compatibility,
+        calculate_points_test
     ]
@@ -4,29 +4,70 @@ Tools available to the Profile Analyst Agent
 from crewai.tools import tool
 from typing import List
 
+from src.agents.tool_cache import memoized_tool
+from src.services.agent_knowledge import get_agent_knowledge
+from src.services.points_service import get_points_calculator
+
 
 @tool("analyze_education_credentials")
-def analyze_education_credentials(education: str) -> str:
+@memoized_tool
+def analyze_education_credentials(education: str) -> dict:
     """
     Analyzes education credentials for international recognition.
-    Takes education details and returns recognition assessment.
+    Takes education details and returns the recognized level, points it
+    earns in each points system and the credential assessment body per country.
     """
-    # This will be enhanced with RAG in the actual implementation
-    return f"Education credential analysis for: {education}"
+    return get_agent_knowledge().education_recognition(education)
 
 
 @tool("check_skill_demand")
-def check_skill_demand(skills: str, target_region: str) -> str:
+@memoized_tool
+def check_skill_demand(skills: str, target_region: str) -> dict:
     """
     Checks if the user's skills are in demand in target regions.
-    Returns skill demand assessment.
+    target_region may be a country, a region (e.g. "Europe") or "global".
+    Returns demand level and shortage-list status per matching occupation and country.
+    """
+    return get_agent_knowledge().skill_demand(skills, target_region)
+
+
+@tool("calculate_points_test")
+@memoized_tool
+def calculate_points_test(
+    age: int,
+    education_level: str,
+    years_experience: float,
+    ielts_score: float,
+    annual_income_usd: float,
+    field_of_study: str = "",
+    system: str = ""
+) -> dict:
+    """
+    Calculates exact points for Canada Express Entry (CRS), Australia 189/190
+    and the UK Skilled Worker points test. education_level is one of
+    high_school, bachelors, masters, phd. system may be a system key or a
+    country code (CA, AU, GB); empty scores all systems. Returns points,
+    pass mark, competitive score, blockers and the per-factor breakdown.
     """
-    return f"Skill demand check for {skills} in {target_region}"
+    calculator = get_points_calculator()
+    profile = {
+        "age": age,
+        "education": {"level": education_level, "field": field_of_study},
+        "workExperience": {"yearsOfExperience": years_experience},
+        "financial": {"annualIncomeUsd": annual_income_usd},
+        "languages": [{"language": "English", "ieltsScore": ielts_score}]
+    }
+    try:
+        systems = calculator.resolve_systems([system] if system else None)
+    except ValueError as e:
+        return {"error": str(e), "systems": list(calculator.systems)}
+    return {"results": calculator.evaluate(profile, systems), "notes": calculator.notes(systems)}
 
 
 def get_profile_analyst_tools() -> List:
     """Returns all tools available to the Profile Analyst"""
     return [
         analyze_education_credentials,
-        check_skill_demand
+        check_skill_demand,
+        calculate_points_test
     ]
@@ -4,32 +4,40 @@ Tools available to the Recommendation Synthesizer Agent
 from crewai.tools import tool
 from typing import List
 
+from src.agents.tool_cache import memoized_tool
+from src.services.agent_knowledge import get_agent_knowledge
+
 
 @tool("format_citations")
-def format_citations(raw_citations: str) -> str:
+@memoized_tool
+def format_citations(raw_citations: str) -> dict:
     """
-    Formats raw citation data into user-friendly format.
+    Formats raw citation data (a JSON list or one source per line)
+    into user-friendly format.
     Returns formatted citations suitable for UI display.
     """
-    return f"Formatted citations from: {raw_citations}"
+    return get_agent_knowledge().format_citations(raw_citations)
 
 
 @tool("generate_action_timeline")
-def generate_action_timeline(path_details: str, user_situation: str) -> str:
+@memoized_tool
+def generate_action_timeline(path_details: str, user_situation: str) -> dict:
     """
     Creates a personalized action timeline based on the recommended
-    path and user's current situation.
+    path and user's current situation, using each visa's requirements
+    and processing time.
     """
-    return f"Action timeline generated for: {path_details}"
+    return get_agent_knowledge().action_timeline(path_details, user_situation)
 
 
 @tool("compile_document_checklist")
-def compile_document_checklist(country: str, visa_type: str) -> str:
+@memoized_tool
+def compile_document_checklist(country: str, visa_type: str) -> dict:
     """
     Compiles a comprehensive document checklist for the visa application.
     Returns prioritized list of required documents.
     """
-    return f"Document checklist for {visa_type} in {country}"
+    return get_agent_knowledge().document_checklist(country, visa_type)
 
 
 def get_synthesizer_tools() -> List:
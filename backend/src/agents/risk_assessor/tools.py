@@ -4,36 +4,44 @@ Tools available to the Risk Assessor Agent
 from crewai.tools import tool
 from typing import List
 
+from src.agents.tool_cache import memoized_tool
+from src.services.agent_knowledge import get_agent_knowledge
+
 
 @tool("check_rejection_patterns")
-def check_rejection_patterns(country: str, visa_type: str) -> str:
+@memoized_tool
+def check_rejection_patterns(country: str, visa_type: str) -> dict:
     """
     Retrieves common rejection patterns for a specific visa type.
-    Returns typical reasons applications fail.
+    Returns typical reasons applications fail and tips to avoid them.
     """
-    return f"Rejection patterns for {visa_type} in {country}"
+    return get_agent_knowledge().rejection_patterns(country, visa_type)
 
 
 @tool("assess_financial_adequacy")
+@memoized_tool
 def assess_financial_adequacy(
     required_amount: str, 
     user_savings: str, 
     user_income: str
-) -> str:
+) -> dict:
     """
     Evaluates if user's finances meet visa requirements.
-    Returns adequacy assessment with gap analysis.
+    Amounts may include a currency (e.g. "CAD 13,757"); required_amount may
+    instead name the country and visa (e.g. "Canada express entry").
+    Returns adequacy assessment with gap analysis in USD.
     """
-    return f"Financial assessment: Required {required_amount}, Has {user_savings}"
+    return get_agent_knowledge().financial_adequacy(required_amount, user_savings, user_income)
 
 
 @tool("check_policy_changes")
-def check_policy_changes(country: str) -> str:
+@memoized_tool
+def check_policy_changes(country: str) -> dict:
     """
     Checks for recent or upcoming policy changes that might
     affect visa applications.
     """
-    return f"Policy changes for {country}"
+    return get_agent_knowledge().policy_changes(country)
 
 
 def get_risk_assessor_tools() -> List:
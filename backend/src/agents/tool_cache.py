@@ -0,0 +1,62 @@
+"""
+Tool Cache - Per-run memoization of identical agent tool calls
+
+Agents often repeat a lookup (the same country and visa type) across
+iterations and across agents. Inside ``tool_call_scope()`` each distinct
+call is computed once and its serialized answer reused for the rest of the
+crew run. The scope is a contextvar, which CrewAI copies into the threads
+it runs tools on; outside a scope tools are simply not memoized.
+"""
+import contextvars
+import functools
+import re
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from src.utils.serialization import dump_json
+
+_run_cache: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar("tool_run_cache", default=None)
+
+_SPACE = re.compile(r"\s+")
+
+
+def _normalize(value) -> str:
+    """Case- and whitespace-insensitive form of a tool argument"""
+    return _SPACE.sub(" ", str(value)).strip().lower()
+
+
+@contextmanager
+def tool_call_scope():
+    """Memoize tool calls until the block exits; yields hit/miss counters"""
+    cache: Dict = {"hits": 0, "misses": 0, "results": {}}
+    token = _run_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _run_cache.reset(token)
+
+
+def memoized_tool(fn: Callable[..., Dict]) -> Callable[..., str]:
+    """
+    Wrap a tool body that returns a dict: memoize it per run and return
+    compact JSON (cheaper in prompt tokens than indented text).
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> str:
+        cache = _run_cache.get()
+        if cache is None:
+            return dump_json(fn(*args, **kwargs)).decode()
+
+        key = (fn.__name__,) + tuple(_normalize(a) for a in args) + tuple(
+            (name, _normalize(value)) for name, value in sorted(kwargs.items())
+        )
+        result = cache["results"].get(key)
+        if result is not None:
+            cache["hits"] += 1
+            return result
+        cache["misses"] += 1
+        result = cache["results"][key] = dump_json(fn(*args, **kwargs)).decode()
+        return result
+
+    wrapper.__annotations__ = {**fn.__annotations__, "return": str}
+    return wrapper
@@ -0,0 +1,214 @@
+"""
+API Caching - Conditional GETs and precompressed bodies for reference data
+
+Country and suggestion endpoints only change when the knowledge corpus
+changes. Their responses are serialized and compressed once per corpus
+version, then served with:
+
+- ``ETag`` derived from the corpus content hash (weak, since the same
+  entity is sent in several encodings) and ``Last-Modified`` from the
+  newest knowledge file; matching ``If-None-Match`` / ``If-Modified-Since``
+  requests get ``304 Not Modified`` with no body
+- ``Cache-Control`` so browsers revalidate instead of re-downloading
+- brotli or gzip bodies chosen by ``Accept-Encoding``, compressed at the
+  highest level once rather than on every request
+
+A hot reload produces a new corpus version, which changes every ETag and
+drops the old entries.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.core.config import settings
+from src.services.knowledge_snapshot import get_knowledge_snapshot
+from src.utils.serialization import dump_json
+
+# Brotli is optional; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MAX_CACHED_RESPONSES = 1024
+MIN_COMPRESS_BYTES = 512
+
+
+class CachedPayload:
+    """
+    One serialized response in every encoding we serve.
+    """
+
+    __slots__ = ("body", "gzip", "br", "etag", "last_modified", "last_modified_ts")
+
+    def __init__(self, body: bytes, etag: str, last_modified_ts: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified_ts = last_modified_ts
+        self.last_modified = formatdate(last_modified_ts, usegmt=True)
+        compress = len(body) >= MIN_COMPRESS_BYTES
+        self.gzip = gzip.compress(body, compresslevel=9) if compress else None
+        self.br = brotli.compress(body, quality=11) if compress and brotli is not None else None
+
+
+class ReferenceResponseCache:
+    """
+    Corpus-versioned LRU of CachedPayloads keyed by request path.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedPayload]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> CachedPayload:
+        """Cached payload for key under the current corpus, building it on a miss"""
+        snapshot = get_knowledge_snapshot()
+        with self._lock:
+            if snapshot.version != self._version:
+                self._entries.clear()
+                self._version = snapshot.version
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+
+        # Build outside the lock; exceptions (e.g. 404s) are not cached
+        body = dump_json(build())
+        digest = hashlib.blake2b(body, digest_size=6).hexdigest()
+        payload = CachedPayload(
+            body,
+            etag=f'W/"{snapshot.version}-{digest}"',
+            last_modified_ts=_corpus_mtime(snapshot)
+        )
+
+        with self._lock:
+            self.misses += 1
+            if snapshot.version == self._version:
+                self._entries[key] = payload
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "corpusVersion": self._version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "notModified": self.not_modified
+            }
+
+
+def _corpus_mtime(snapshot) -> float:
+    """Modification time of the newest knowledge file (seconds)"""
+    if not snapshot.manifest:
+        return 0.0
+    return max(mtime_ns for _, mtime_ns in snapshot.manifest.values()) / 1e9
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header value"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified(request: Request, payload: CachedPayload) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return _etag_matches(if_none_match, payload.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(payload.last_modified_ts) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Whether Accept-Encoding allows a coding (q=0 means refused)"""
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() in (coding, "*"):
+            q = params.strip()
+            if not q.startswith("q="):
+                return True
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def cached_json_response(request: Request, build: Callable[[], Any]) -> Response:
+    """
+    Serve reference data with ETag/Last-Modified, 304s and compression.
+
+    Args:
+        request: Incoming request (path + query form the cache key)
+        build: Produces the JSON-able content on a cache miss; may raise
+            HTTPException, which is passed through uncached
+    """
+    cache = get_reference_cache()
+    key = request.url.path + ("?" + request.url.query if request.url.query else "")
+    payload = cache.get_or_build(key, build)
+
+    headers = {
+        "ETag": payload.etag,
+        "Last-Modified": payload.last_modified,
+        "Cache-Control": f"public, max-age={settings.REFERENCE_CACHE_MAX_AGE}, must-revalidate",
+        "Vary": "Accept-Encoding"
+    }
+
+    if _not_modified(request, payload):
+        cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    body = payload.body
+    if payload.br is not None and _accepts(accept_encoding, "br"):
+        body = payload.br
+        headers["Content-Encoding"] = "br"
+    elif payload.gzip is not None and _accepts(accept_encoding, "gzip"):
+        body = payload.gzip
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Singleton instance
+_reference_cache = None
+
+def get_reference_cache() -> ReferenceResponseCache:
+    """Get or create the reference response cache singleton"""
+    global _reference_cache
+    if _reference_cache is None:
+        _reference_cache = ReferenceResponseCache()
+    return _reference_cache
@@ -0,0 +1,79 @@
+"""
+Rate Limit Middleware - Binds LLM client/priority context and maps shed requests to 429
+and fast-failed (circuit open) requests to 503
+"""
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from src.services.llm_resilience import CircuitOpenError
+from src.services.rate_limiter import (
+    RateLimitExceeded,
+    bind_request_context,
+    priority_for_path,
+    reset_request_context,
+)
+
+
+class LLMRequestContextMiddleware:
+    """
+    Pure ASGI middleware that tags each request with the client identity
+    (the client IP) and the LLM priority class of its route, for the rate
+    governor.
+
+    The quota is keyed by IP only: a client-chosen value such as the
+    X-Session-Id header could be rotated for a fresh quota on every
+    request. Behind a reverse proxy, run uvicorn with --proxy-headers
+    (and --forwarded-allow-ips) so the client address is the real one.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client_id = scope["client"][0] if scope.get("client") else None
+
+        tokens = bind_request_context(client_id, priority_for_path(scope["path"]))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_context(tokens)
+
+
+def register_rate_limit_handler(app):
+    """
+    Return 429 with Retry-After when the governor sheds a request, and 503
+    with Retry-After while the Groq circuit breaker is open.
+    """
+
+    @app.exception_handler(RateLimitExceeded)
+    async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+        retry_after = max(1, round(exc.retry_after))
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+            content={
+                "success": False,
+                "error": "Rate limit exceeded",
+                "message": str(exc),
+                "scope": exc.scope,
+                "retryAfter": retry_after
+            }
+        )
+
+    @app.exception_handler(CircuitOpenError)
+    async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+        retry_after = max(1, round(exc.retry_after))
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+            content={
+                "success": False,
+                "error": "LLM temporarily unavailable",
+                "message": str(exc),
+                "retryAfter": retry_after
+            }
+        )
@@ -0,0 +1,26 @@
+"""
+API Responses - Fast JSON response classes
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from src.utils.serialization import dump_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson; the app-wide default response class.
+
+    Endpoints with large payloads should return it directly: FastAPI only
+    skips its jsonable_encoder pass for returned Response objects.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+class PrecomputedJSONResponse(Response):
+    """Sends already-serialized JSON bytes as-is"""
+
+    media_type = "application/json"
@@ -2,15 +2,27 @@
 Analysis Routes - Main endpoints for mobility analysis
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Optional, List, Any
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Any, Dict
 from pydantic import BaseModel
+import asyncio
+import json
 import uuid
 from datetime import datetime
 
 from src.schemas.inputs.user_profile import UserProfile
 from src.services.session_service import get_session_service
+from src.services.progress_service import get_progress_service
 from src.services.llm_service import get_llm_service
+from src.services.country_registry import get_country_registry
 from src.services.document_loader import get_document_loader
+from src.services.sensitivity_service import get_sensitivity_service
+from src.services.eligibility_service import get_eligibility_engine
+from src.services.points_service import get_points_calculator
+from src.services.rate_limiter import RateLimitExceeded
+from src.services.llm_resilience import CircuitOpenError, llm_degraded
+from src.services.path_graph_service import get_path_graph
+from src.api.responses import FastJSONResponse, PrecomputedJSONResponse
 from src.core.logging import logger
 
 # Try to import RAG retriever, but allow fallback if chromadb isn't available
@@ -71,6 +83,16 @@ class DemoProfileRequest(BaseModel):
     nationality: str
     age: int
     languages: Optional[List[Any]] = None
+    pointsClaims: Optional[Dict[str, Any]] = None
+
+class SensitivityRequest(BaseModel):
+    profile: DemoProfileRequest
+    attributes: Optional[List[str]] = None
+    grid: Optional[Dict[str, List[Any]]] = None
+
+class PointsRequest(BaseModel):
+    profiles: List[DemoProfileRequest]
+    systems: Optional[List[str]] = None
 
 
 # ============================================================
@@ -134,7 +156,8 @@ async def analyze_mobility_real(profile: DemoProfileRequest):
         
         # Call LLM for analysis
         logger.info("Calling LLM for analysis...")
-        analysis_result = llm_service.analyze_profile(
+        analysis_result = await asyncio.to_thread(
+            llm_service.analyze_profile,
             user_profile=profile_dict,
             policy_context=policy_context,
             country_data=country_data
@@ -152,8 +175,13 @@ async def analyze_mobility_real(profile: DemoProfileRequest):
         }
         
         logger.info("Analysis complete!")
-        return response
+        return FastJSONResponse(response)
         
+    except RateLimitExceeded:
+        raise
+    except CircuitOpenError:
+        logger.warning("⚡ LLM degraded, answering from the transition graph")
+        return _graph_fallback_result(str(uuid.uuid4()), profile_dict)
     except Exception as e:
         logger.error(f"Real analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -163,6 +191,71 @@ async def analyze_mobility_real(profile: DemoProfileRequest):
 # ASYNC ANALYSIS ENDPOINT
 # ============================================================
 
+@router.post("/analyze/sensitivity")
+async def analyze_sensitivity(request: SensitivityRequest):
+    """
+    What-if sensitivity sweep over profile attributes.
+    
+    Perturbs savings, experience, education, IELTS band and timeline over a
+    grid and re-scores candidate paths deterministically - no LLM call.
+    Returns the marginal impact of each attribute on the best path's score
+    and approval probability.
+    """
+    logger.info(f"📈 Sensitivity sweep for {request.profile.goals.targetCountries}")
+    
+    try:
+        result = get_sensitivity_service().analyze(
+            request.profile.model_dump(),
+            attributes=request.attributes,
+            grid=request.grid
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"success": True, **result}
+
+
+@router.post("/analyze/eligibility")
+async def analyze_eligibility(profile: DemoProfileRequest, allCountries: bool = False):
+    """
+    Instant visa eligibility pre-screen - no LLM call.
+    
+    Checks the profile against the compiled requirements (education,
+    experience, English band, age, salary/income and proof of funds) of
+    every visa in the target countries, or in every country with
+    ?allCountries=true. Requirements that cannot be checked from a profile
+    are returned as manualChecks.
+    """
+    countries = None if allCountries else profile.goals.targetCountries
+    result = get_eligibility_engine().evaluate(profile.model_dump(), countries)
+    return FastJSONResponse({"success": True, **result})
+
+
+@router.post("/analyze/points")
+async def analyze_points(request: PointsRequest):
+    """
+    Exact points-test scores - no LLM call.
+    
+    Scores a batch of profiles under Canada's CRS, Australia's 189/190 and
+    the UK Skilled Worker points tests (or the systems named in ``systems``,
+    by key or country code). Facts a profile cannot express, such as
+    Canadian experience or a provincial nomination, go in pointsClaims.
+    """
+    calculator = get_points_calculator()
+    try:
+        systems = calculator.resolve_systems(request.systems)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results = calculator.evaluate_batch([p.model_dump() for p in request.profiles], systems)
+    return FastJSONResponse({
+        "success": True,
+        "systems": systems,
+        "notes": calculator.notes(systems),
+        "results": results
+    })
+
+
 @router.post("/analyze/async")
 async def analyze_mobility_async(
     profile: DemoProfileRequest,
@@ -188,10 +281,44 @@ async def analyze_mobility_async(
         "success": True,
         "session_id": session_id,
         "status": "processing",
-        "message": "Analysis started. Poll /analyze/status/{session_id} for results."
+        "message": "Analysis started. Stream progress from /analyze/stream/{session_id} or poll /analyze/status/{session_id}.",
+        "stream_url": f"/api/v1/analyze/stream/{session_id}"
     }
 
 
+@router.get("/analyze/stream/{session_id}")
+async def stream_analysis_progress(session_id: str):
+    """
+    Server-Sent Events stream of an async analysis.
+    
+    Emits agent_started / agent_completed as each CrewAI agent runs (with
+    partial output, e.g. profile summary or provisional paths), then a final
+    analysis_completed (with the full result) or analysis_failed event.
+    """
+    session_service = get_session_service()
+    if not session_service.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    progress_service = get_progress_service()
+    
+    async def event_stream():
+        async for payload in progress_service.subscribe(session_id):
+            if payload is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield (
+                f"id: {payload['id']}\n"
+                f"event: {payload['event']}\n"
+                f"data: {json.dumps(payload, default=str)}\n\n"
+            )
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/analyze/status/{session_id}")
 async def get_analysis_status(session_id: str):
     """Get the status of an async analysis"""
@@ -214,9 +341,9 @@ async def get_analysis_status(session_id: str):
 async def get_analysis_result(session_id: str):
     """Get the full result of a completed analysis"""
     session_service = get_session_service()
-    result = session_service.get_session_result(session_id)
+    result_json = session_service.get_session_result_json(session_id)
     
-    if not result:
+    if not result_json:
         session = session_service.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -225,10 +352,8 @@ async def get_analysis_result(session_id: str):
         if session["status"] == "failed":
             raise HTTPException(status_code=500, detail=session.get("error", "Analysis failed"))
     
-    return {
-        "success": True,
-        "data": result
-    }
+    # Splice the stored bytes into the envelope instead of re-encoding the result
+    return PrecomputedJSONResponse(b'{"success":true,"data":' + (result_json or b"null") + b"}")
 
 
 def run_analysis_background(session_id: str, profile_data: dict):
@@ -241,9 +366,20 @@ def run_analysis_background(session_id: str, profile_data: dict):
     FastAPI's BackgroundTasks handles both sync and async functions.
     """
     session_service = get_session_service()
+    progress_service = get_progress_service()
+    
+    def publish(event: str, data: dict = None):
+        progress_service.publish(session_id, event, data)
+    
+    def complete_from_graph(user_profile: dict):
+        result = _graph_fallback_result(session_id, user_profile)
+        session_service.update_session_status(session_id, "completed", result=result)
+        publish("analysis_completed", {"result": result})
+        logger.info(f"✅ Graph fallback analysis completed for session: {session_id}")
     
     try:
         session_service.update_session_status(session_id, "processing")
+        publish("analysis_started", {"mode": "crewai" if CREWAI_AVAILABLE else "enhanced_llm"})
         logger.info(f"🤖 Starting analysis for session: {session_id}")
         logger.info("=" * 80)
         
@@ -269,6 +405,13 @@ def run_analysis_background(session_id: str, profile_data: dict):
             "languages": profile_data.get("languages", [])
         }
         
+        if llm_degraded():
+            # Groq circuit breaker is open - fail fast to deterministic paths
+            logger.warning("⚡ LLM degraded, skipping agents for graph fallback")
+            publish("fallback_started", {"reason": "LLM temporarily unavailable"})
+            complete_from_graph(user_profile)
+            return
+        
         # Get RAG context
         logger.info("📚 Loading policy documents and country data...")
         from src.services.document_loader import get_document_loader
@@ -309,37 +452,32 @@ def run_analysis_background(session_id: str, profile_data: dict):
             logger.info("🚀 Starting CrewAI sequential workflow...")
             crew_result = crew.analyze(
                 user_profile=user_profile,
-                rag_context=rag_context
+                rag_context=rag_context,
+                progress_callback=publish
             )
             
             logger.info("=" * 80)
             logger.info("✅ CrewAI workflow completed!")
             logger.info("=" * 80)
             
-            # The crew returns a structured result from handoff_manager
-            # Convert it to frontend schema
+            # The crew returns schema-validated output already in frontend shape
             result = {
                 "sessionId": session_id,
-                "profileSummary": crew_result.get("recommendation", {}).get("summary", {
-                    "strengths": ["Analysis completed"],
-                    "weaknesses": [],
-                    "eligibleVisas": []
-                }),
-                "rankedPaths": _extract_paths_from_crew_result(crew_result),
-            "actionItems": _extract_action_items_from_crew_result(crew_result),
-            "citations": crew_result.get("citations", []),
-            "analysisTimestamp": datetime.now().isoformat(),
-            "analysisMode": "crewai",
-            "agentOutputs": {
-                "profileAnalyst": crew_result.get("analysis", {}).get("strengths", []),
-                "pathGenerator": crew_result.get("recommendation", {}).get("recommended_path", {}),
-                "riskAssessor": crew_result.get("recommendation", {}).get("approval_probability", 0),
-                "synthesizer": crew_result.get("recommendation", {}).get("summary", "")
-            },
-            "disclaimer": "This analysis is generated by AI using CrewAI multi-agent system and is for informational purposes only. Immigration policies change frequently. Please verify all information with official government sources and consult a licensed immigration attorney before making decisions."
-        }
-        
+                "executiveSummary": crew_result.get("executiveSummary", ""),
+                "profileSummary": crew_result.get("profileSummary", {}),
+                "rankedPaths": crew_result.get("rankedPaths", []),
+                "actionItems": crew_result.get("actionItems", []),
+                "citations": crew_result.get("citations", []),
+                "riskAnalysis": crew_result.get("riskAnalysis", {}),
+                "analysisTimestamp": datetime.now().isoformat(),
+                "analysisMode": "crewai",
+                "agentOutputs": crew_result.get("agentOutputs", {}),
+                "executionTrace": crew_result.get("executionTrace", {}),
+                "disclaimer": "This analysis is generated by AI using CrewAI multi-agent system and is for informational purposes only. Immigration policies change frequently. Please verify all information with official government sources and consult a licensed immigration attorney before making decisions."
+            }
+            
             session_service.update_session_status(session_id, "completed", result=result)
+            publish("analysis_completed", {"result": result})
             logger.info(f"✅ CrewAI analysis completed and saved for session: {session_id}")
         
         else:
@@ -376,6 +514,7 @@ def run_analysis_background(session_id: str, profile_data: dict):
             }
             
             session_service.update_session_status(session_id, "completed", result=result)
+            publish("analysis_completed", {"result": result})
             logger.info(f"✅ Enhanced LLM analysis completed and saved for session: {session_id}")
         
     except Exception as e:
@@ -385,6 +524,7 @@ def run_analysis_background(session_id: str, profile_data: dict):
         
         # Fallback to direct LLM analysis
         logger.info("🔄 Attempting fallback to direct LLM analysis...")
+        publish("fallback_started", {"reason": str(e)})
         try:
             llm_service = get_llm_service()
             goals = profile_data.get("goals", {})
@@ -411,6 +551,10 @@ def run_analysis_background(session_id: str, profile_data: dict):
                 "languages": profile_data.get("languages", [])
             }
             
+            if llm_degraded():
+                complete_from_graph(user_profile)
+                return
+            
             # Use direct LLM call as fallback
             analysis_result = llm_service.analyze_profile(
                 user_profile=user_profile,
@@ -430,61 +574,43 @@ def run_analysis_background(session_id: str, profile_data: dict):
             }
             
             session_service.update_session_status(session_id, "completed", result=result)
+            publish("analysis_completed", {"result": result})
             logger.info(f"✅ Fallback LLM analysis completed for session: {session_id}")
             
         except Exception as fallback_error:
+            if isinstance(fallback_error, CircuitOpenError):
+                complete_from_graph(user_profile)
+                return
             logger.error(f"❌ Fallback also failed: {str(fallback_error)}")
             import traceback
             traceback.print_exc()
             session_service.update_session_status(session_id, "failed", error=str(fallback_error))
+            publish("analysis_failed", {"error": str(fallback_error)})
 
 
-def _extract_paths_from_crew_result(crew_result: dict) -> list:
-    """Extract and format paths from CrewAI result"""
-    recommended_path = crew_result.get("recommendation", {}).get("recommended_path", {})
-    
-    if not recommended_path or recommended_path.get("path_id") == "path_1":
-        # CrewAI didn't return structured paths, return default
-        return [{
-            "id": "path_1",
-            "rank": 1,
-            "name": "Recommended Immigration Path",
-            "description": crew_result.get("recommendation", {}).get("summary", "Analysis completed"),
-            "steps": [],
-            "totalDuration": "Variable",
-            "overallScore": 75,
-            "approvalProbability": int(crew_result.get("recommendation", {}).get("approval_probability", 0.5) * 100),
-            "riskLevel": "medium",
-            "whyThisPath": "Based on comprehensive multi-agent analysis",
-            "recommendation": crew_result.get("recommendation", {}).get("summary", "See detailed analysis")
-        }]
-    
-    return [recommended_path]
-
-
-def _extract_action_items_from_crew_result(crew_result: dict) -> list:
-    """Extract action items from CrewAI result"""
-    next_steps = crew_result.get("analysis", {}).get("next_steps", [])
-    
-    if not next_steps:
-        return [{
-            "order": 1,
-            "action": "Review detailed analysis",
-            "deadline": "Within 1 week",
-            "priority": "high",
-            "details": "Review the comprehensive analysis provided by our AI agents"
-        }]
+def _graph_fallback_result(session_id: str, user_profile: dict) -> dict:
+    """
+    Deterministic analysis from the transition graph, used while Groq is
+    degraded (circuit breaker open). No LLM call.
+    """
+    goals = user_profile.get("goals", {})
+    ranked_paths = get_path_graph().find_paths_for_targets(
+        goals.get("targetCountries", []),
+        user_profile,
+        origin=user_profile.get("nationality"),
+        k=3
+    )
     
-    return [
-        {
-            "order": i + 1,
-            "action": step.get("action", "Action required"),
-            "deadline": step.get("deadline", "ASAP"),
-            "priority": step.get("priority", "medium"),
-            "details": step.get("details", "")
-        }
-        for i, step in enumerate(next_steps)
-    ]
+    return {
+        "sessionId": session_id,
+        "profileSummary": {},
+        "rankedPaths": ranked_paths,
+        "actionItems": [],
+        "citations": [],
+        "analysisTimestamp": datetime.now().isoformat(),
+        "analysisMode": "graph_fallback",
+        "disclaimer": "The AI analysis service is temporarily unavailable, so these paths were ranked from our policy data without AI review. Please verify all information with official government sources before making decisions."
+    }
 
 
 # Demo endpoint with mock response (for frontend testing)
@@ -499,11 +625,7 @@ async def analyze_mobility_demo(profile: DemoProfileRequest):
     
     # Get first target country for personalized response
     target_country = profile.goals.targetCountries[0] if profile.goals.targetCountries else "Canada"
-    target_country_name = {
-        "CA": "Canada", "DE": "Germany", "US": "United States", 
-        "GB": "United Kingdom", "AU": "Australia", "SG": "Singapore",
-        "NL": "Netherlands", "AE": "UAE", "PT": "Portugal", "JP": "Japan"
-    }.get(target_country, target_country)
+    target_country_name = get_country_registry().name(target_country)
     
     # Build response matching frontend AnalysisResponse interface
     mock_response = {
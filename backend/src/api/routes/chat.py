@@ -1,12 +1,16 @@
 """
 Chat Routes - API endpoints for the RAG-powered chat assistant
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional, List
+import asyncio
 import uuid
 
+from src.api.caching import cached_json_response
 from src.services.chat_service import get_chat_service
+from src.services.llm_resilience import CircuitOpenError
+from src.services.rate_limiter import RateLimitExceeded
 from src.core.logging import logger
 
 router = APIRouter()
@@ -55,7 +59,9 @@ async def chat(request: ChatMessage):
         session_id = request.session_id or str(uuid.uuid4())
         
         # Process the chat message
-        result = chat_service.chat(
+        # Run in a worker thread so rate-governor queueing doesn't block the event loop
+        result = await asyncio.to_thread(
+            chat_service.chat,
             session_id=session_id,
             message=request.message,
             context_countries=request.context_countries
@@ -69,26 +75,28 @@ async def chat(request: ChatMessage):
             has_context=result.get("has_context", False)
         )
         
+    except (RateLimitExceeded, CircuitOpenError):
+        raise
     except Exception as e:
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
 
 @router.get("/chat/suggestions")
-async def get_suggestions():
+async def get_suggestions(request: Request):
     """
     Get suggested starter questions for the chat.
     
     Returns:
         List of suggested questions to help users get started
     """
-    try:
-        chat_service = get_chat_service()
-        suggestions = chat_service.get_suggested_questions()
-        
+    def build():
         return {
-            "suggestions": suggestions
+            "suggestions": get_chat_service().get_suggested_questions()
         }
+    
+    try:
+        return cached_json_response(request, build)
         
     except Exception as e:
         logger.error(f"Error getting suggestions: {str(e)}")
@@ -1,57 +1,142 @@
 """
 Countries Routes - Endpoints for country and visa data
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
 
+from src.api.caching import cached_json_response
 from src.services.country_service import get_country_service
 
 router = APIRouter()
 
 
 @router.get("/countries")
-async def get_countries():
+async def get_countries(request: Request):
     """Get list of all supported countries"""
+    def build():
+        countries = get_country_service().get_all_countries()
+        return {
+            "success": True,
+            "count": len(countries),
+            "data": countries
+        }
+    
+    return cached_json_response(request, build)
+
+
+# Registered before /countries/{country_code}, which would otherwise match "search"
+@router.get("/countries/search")
+async def search_countries(
+    min_score: Optional[int] = 0,
+    skills: Optional[str] = None,
+    stepping_stone: Optional[bool] = False
+):
+    """
+    Search countries by criteria.
+    
+    - min_score: Minimum immigration friendliness score (1-10)
+    - skills: Comma-separated list of skills to match
+    - stepping_stone: Only return countries good as stepping stones
+    """
     country_service = get_country_service()
-    countries = country_service.get_all_countries()
+    
+    skill_list = skills.split(",") if skills else None
+    
+    results = country_service.search_countries(
+        min_immigration_score=min_score,
+        skill_areas=skill_list,
+        stepping_stone=stepping_stone
+    )
     
     return {
         "success": True,
-        "count": len(countries),
-        "data": countries
+        "count": len(results),
+        "data": results
     }
 
 
-@router.get("/countries/{country_code}")
-async def get_country(country_code: str):
-    """Get detailed information about a specific country"""
-    country_service = get_country_service()
-    country = country_service.get_country(country_code)
-    
-    if not country:
-        raise HTTPException(status_code=404, detail=f"Country not found: {country_code}")
+@router.get("/visas/search")
+async def search_visas(
+    max_processing_months: Optional[float] = None,
+    work_permitted: Optional[bool] = None,
+    family_allowed: Optional[bool] = None,
+    employer_tied: Optional[bool] = None,
+    path_to_pr: Optional[str] = None,
+    max_pr_years: Optional[float] = None,
+    max_fee_usd: Optional[float] = None,
+    region: Optional[str] = None,
+    countries: Optional[str] = None,
+    sort: str = "processing",
+    order: str = "asc",
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """
+    Search visa types across every country.
+    
+    - max_processing_months: Upper bound of processing time, in months
+    - work_permitted / family_allowed / employer_tied: Required flag value
+    - path_to_pr: direct, eventual (includes direct), any or none
+    - max_pr_years: Years until PR eligibility
+    - max_fee_usd: Application fee in USD
+    - region: Comma-separated regions (e.g. "Europe,Asia")
+    - countries: Comma-separated country codes
+    - sort: processing, fee, pr_years or friendliness; order: asc or desc
+    """
+    try:
+        results = get_country_service().search_visas(
+            max_processing_months=max_processing_months,
+            work_permitted=work_permitted,
+            family_allowed=family_allowed,
+            employer_tied=employer_tied,
+            path_to_pr=path_to_pr,
+            max_pr_years=max_pr_years,
+            max_fee_usd=max_fee_usd,
+            regions=region.split(",") if region else None,
+            countries=countries.split(",") if countries else None,
+            sort=sort,
+            descending=order.lower() == "desc",
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "success": True,
-        "data": country
+        "count": len(results),
+        "data": results
     }
 
 
+@router.get("/countries/{country_code}")
+async def get_country(country_code: str, request: Request):
+    """Get detailed information about a specific country"""
+    def build():
+        country = get_country_service().get_country(country_code)
+        if not country:
+            raise HTTPException(status_code=404, detail=f"Country not found: {country_code}")
+        return {
+            "success": True,
+            "data": country.to_dict()
+        }
+    
+    return cached_json_response(request, build)
+
+
 @router.get("/countries/{country_code}/visas")
-async def get_country_visas(country_code: str):
+async def get_country_visas(country_code: str, request: Request):
     """Get all visa types for a country"""
-    country_service = get_country_service()
-    visas = country_service.get_visa_types(country_code)
+    def build():
+        visas = get_country_service().get_visa_types(country_code)
+        if not visas:
+            raise HTTPException(status_code=404, detail=f"No visa data for: {country_code}")
+        return {
+            "success": True,
+            "country": country_code,
+            "count": len(visas),
+            "data": [visa.to_dict() for visa in visas]
+        }
     
-    if not visas:
-        raise HTTPException(status_code=404, detail=f"No visa data for: {country_code}")
-    
-    return {
-        "success": True,
-        "country": country_code,
-        "count": len(visas),
-        "data": visas
-    }
+    return cached_json_response(request, build)
 
 
 @router.get("/countries/{country_code}/visas/{visa_type}")
@@ -68,7 +153,7 @@ async def get_visa_details(country_code: str, visa_type: str):
     
     return {
         "success": True,
-        "data": visa
+        "data": visa.to_dict()
     }
 
 
@@ -121,33 +206,3 @@ async def compare_countries(country_codes: List[str]):
         "success": True,
         "data": comparison
     }
-
-
-@router.get("/countries/search")
-async def search_countries(
-    min_score: Optional[int] = 0,
-    skills: Optional[str] = None,
-    stepping_stone: Optional[bool] = False
-):
-    """
-    Search countries by criteria.
-    
-    - min_score: Minimum immigration friendliness score (1-10)
-    - skills: Comma-separated list of skills to match
-    - stepping_stone: Only return countries good as stepping stones
-    """
-    country_service = get_country_service()
-    
-    skill_list = skills.split(",") if skills else None
-    
-    results = country_service.search_countries(
-        min_immigration_score=min_score,
-        skill_areas=skill_list,
-        stepping_stone=stepping_stone
-    )
-    
-    return {
-        "success": True,
-        "count": len(results),
-        "data": results
-    }
@@ -5,11 +5,18 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import Optional, List
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import uuid
 
 from src.core.logging import logger
 from src.services.document_loader import get_document_loader
+from src.services.country_registry import get_country_registry
 from src.services.country_service import get_country_service
+from src.services.path_graph_service import get_path_graph
+from src.services.llm_resilience import llm_degraded
+from src.services.explore_session_store import get_explore_session_store
+from src.api.responses import PrecomputedJSONResponse
+from src.utils.serialization import dump_json
 
 # Try to import CrewAI
 CREWAI_AVAILABLE = False
@@ -63,13 +70,6 @@ class ExploreResponse(BaseModel):
     generatedAt: str
 
 
-# ============================================================
-# IN-MEMORY CACHE FOR EXPLORATION SESSIONS
-# ============================================================
-
-_explore_cache = {}
-
-
 # ============================================================
 # EXPLORE ENDPOINTS
 # ============================================================
@@ -129,21 +129,23 @@ async def quick_explore(request: QuickExploreRequest):
             if country:
                 country_insights.append({
                     "code": code,
-                    "name": country.get("name", code),
-                    "immigration_friendliness": country.get("immigration_friendliness", 5),
-                    "skill_demand": country.get("skill_demand", [])[:5],
-                    "processing_speed": country.get("processing_speed", 5),
-                    "notes": country.get("notes", ""),
-                    "visa_types": len(country.get("visa_types", []))
+                    "name": country.name,
+                    "immigration_friendliness": country.immigration_friendliness,
+                    "skill_demand": list(country.skill_demand[:5]),
+                    "processing_speed": country.processing_speed,
+                    "notes": country.notes,
+                    "visa_types": len(country.visa_types)
                 })
         
-        # Check if CrewAI is available
-        if CREWAI_AVAILABLE and get_mobility_crew is not None:
+        # Check if CrewAI is available (and Groq is not failing fast)
+        degraded = llm_degraded()
+        if CREWAI_AVAILABLE and get_mobility_crew is not None and not degraded:
             logger.info("🤖 Using CrewAI for dynamic path generation...")
             
             try:
                 crew = get_mobility_crew()
-                result = crew.analyze(
+                result = await asyncio.to_thread(
+                    crew.analyze,
                     user_profile=user_profile,
                     rag_context=rag_context
                 )
@@ -180,6 +182,16 @@ async def quick_explore(request: QuickExploreRequest):
                         ]
                     }
                 }
+        elif degraded:
+            # Groq circuit breaker is open - don't wait on a degraded upstream
+            logger.warning("⚡ LLM degraded, using graph path generation")
+            paths = _generate_static_paths(request.targetCountries, user_profile)
+            agent_analysis = {
+                "mode": "fallback",
+                "error": "LLM temporarily unavailable",
+                "agentsUsed": 0,
+                "message": "Paths generated from the transition graph while the AI service recovers"
+            }
         else:
             # Fallback to static path generation
             logger.info("📋 Using static path generation (CrewAI unavailable)")
@@ -220,10 +232,11 @@ async def quick_explore(request: QuickExploreRequest):
             "disclaimer": "This is AI-generated guidance. Please verify with official sources."
         }
         
-        # Cache the response
-        _explore_cache[session_id] = response
+        # Store the serialized response; session reads send these bytes as-is
+        body = dump_json(response)
+        get_explore_session_store().put(session_id, body)
         
-        return response
+        return PrecomputedJSONResponse(body)
         
     except Exception as e:
         logger.error(f"Explore failed: {str(e)}")
@@ -232,6 +245,44 @@ async def quick_explore(request: QuickExploreRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/explore/instant")
+async def instant_explore(request: QuickExploreRequest):
+    """
+    Instant exploration - scores precomputed graph paths without any LLM call.
+    Returns in milliseconds, so the UI can render paths while a deeper
+    /explore/quick analysis runs.
+    """
+    logger.info(f"⚡ Instant explore request: {request.nationality} → {request.targetCountries}")
+    
+    user_profile = {
+        "nationality": request.nationality,
+        "education": {
+            "level": request.educationLevel,
+            "field": request.fieldOfWork,
+        },
+        "workExperience": {
+            "title": request.fieldOfWork,
+            "yearsOfExperience": request.yearsOfExperience,
+            "skills": request.skills,
+        },
+        "financial": {
+            "savingsUsd": 30000,
+        },
+        "goals": {
+            "targetCountries": request.targetCountries,
+            "timeline": "within_2_years",
+        },
+    }
+    
+    return {
+        "success": True,
+        "paths": _generate_static_paths(request.targetCountries, user_profile),
+        "steppingStones": _get_stepping_stone_suggestions(request.targetCountries, request.nationality),
+        "agentAnalysis": {"mode": "graph", "agentsUsed": 0},
+        "generatedAt": datetime.now().isoformat()
+    }
+
+
 @router.get("/explore/paths/{destination}")
 async def explore_paths_to_destination(
     destination: str,
@@ -272,10 +323,11 @@ async def get_stepping_stones(destination: str, nationality: str = "IN"):
 @router.get("/explore/session/{session_id}")
 async def get_explore_session(session_id: str):
     """Retrieve a previously generated exploration session."""
-    if session_id not in _explore_cache:
+    body = get_explore_session_store().get(session_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return _explore_cache[session_id]
+    return PrecomputedJSONResponse(body)
 
 
 @router.get("/explore/compare")
@@ -299,16 +351,16 @@ async def compare_destinations(countries: str, nationality: str = "IN"):
         if country:
             comparison.append({
                 "code": code,
-                "name": country.get("name", code),
-                "immigration_friendliness": country.get("immigration_friendliness", 5),
-                "processing_speed": country.get("processing_speed", 5),
-                "cost_of_living": country.get("cost_of_living", "Medium"),
-                "skill_demand": country.get("skill_demand", [])[:5],
+                "name": country.name,
+                "immigration_friendliness": country.immigration_friendliness,
+                "processing_speed": country.processing_speed,
+                "cost_of_living": country.cost_of_living or "Medium",
+                "skill_demand": list(country.skill_demand[:5]),
                 "visa_types": [
-                    {"type": v.get("type"), "name": v.get("name")}
-                    for v in country.get("visa_types", [])[:3]
+                    {"type": v.type, "name": v.name}
+                    for v in country.visa_types[:3]
                 ],
-                "notes": country.get("notes", "")
+                "notes": country.notes
             })
     
     return {
@@ -323,105 +375,30 @@ async def compare_destinations(countries: str, nationality: str = "IN"):
 # ============================================================
 
 def _generate_static_paths(target_countries: List[str], user_profile: dict) -> list:
-    """Generate static paths when CrewAI is unavailable."""
-    country_codes = {
-        "Canada": "CA", "USA": "US", "Germany": "DE", "UK": "GB",
-        "Australia": "AU", "UAE": "AE", "Singapore": "SG",
-        "Netherlands": "NL", "Portugal": "PT", "Japan": "JP"
-    }
-    
-    country_names = {v: k for k, v in country_codes.items()}
-    
-    paths = []
-    for i, code in enumerate(target_countries[:3]):
-        country_name = country_names.get(code.upper(), code)
-        
-        paths.append({
-            "id": f"static_path_{i+1}",
-            "rank": i + 1,
-            "name": f"Direct Path to {country_name}",
-            "description": f"Standard immigration pathway to {country_name}",
-            "steps": [
-                {
-                    "order": 1,
-                    "country": country_name,
-                    "countryCode": code.upper(),
-                    "visaType": "Skilled Worker Visa",
-                    "duration": "2-4 years",
-                    "purpose": "Work authorization and settlement",
-                    "requirements": [
-                        "Valid job offer from employer",
-                        "Skills/qualification assessment",
-                        "Language proficiency test",
-                        "Proof of funds"
-                    ],
-                    "estimatedCost": 8000 + (i * 2000),
-                    "currency": "USD"
-                }
-            ],
-            "totalDuration": "2-4 years",
-            "overallScore": 80 - (i * 10),
-            "approvalProbability": 75 - (i * 8),
-            "riskLevel": ["low", "medium", "medium"][min(i, 2)],
-            "whyThisPath": f"{country_name} has strong demand for skilled workers in your field.",
-            "recommendation": "Recommended" if i == 0 else "Alternative option"
-        })
-    
-    return paths
+    """Generate data-driven paths from the precomputed transition graph."""
+    return get_path_graph().find_paths_for_targets(
+        target_countries,
+        user_profile,
+        origin=user_profile.get("nationality"),
+        k=3
+    )
 
 
 def _get_stepping_stone_suggestions(target_countries: List[str], nationality: str) -> list:
-    """Get stepping stone country suggestions."""
+    """Get stepping stone country suggestions from the transition graph."""
+    graph = get_path_graph()
+    registry = get_country_registry()
+    destinations = registry.codes(target_countries)
+    excluded = set(destinations) | {registry.code(nationality) or nationality.upper()}
     
-    # Stepping stone logic based on common patterns
     stepping_stones = []
-    
-    # UAE is often a good stepping stone
-    if any(c.upper() in ["CA", "AU", "UK", "US"] for c in target_countries):
-        stepping_stones.append({
-            "country": "UAE",
-            "countryCode": "AE",
-            "reason": "UAE provides excellent international work experience and is easier to enter",
-            "typicalDuration": "2-3 years",
-            "benefits": [
-                "No income tax",
-                "International work exposure",
-                "Easy visa process",
-                "Strong networking opportunities"
-            ],
-            "unlocks": ["CA", "AU", "UK", "US"]
-        })
-    
-    # Singapore as stepping stone
-    if any(c.upper() in ["AU", "CA"] for c in target_countries):
-        stepping_stones.append({
-            "country": "Singapore",
-            "countryCode": "SG",
-            "reason": "Singapore experience is valued by Australian and Canadian immigration",
-            "typicalDuration": "2-3 years",
-            "benefits": [
-                "Strong tech ecosystem",
-                "English-speaking environment",
-                "Good salary potential",
-                "Regional experience"
-            ],
-            "unlocks": ["AU", "CA"]
-        })
-    
-    # Portugal for EU access
-    if any(c.upper() in ["DE", "NL", "UK"] for c in target_countries):
-        stepping_stones.append({
-            "country": "Portugal",
-            "countryCode": "PT",
-            "reason": "Portugal offers easier EU entry with path to EU residency",
-            "typicalDuration": "2-5 years",
-            "benefits": [
-                "EU freedom of movement",
-                "Lower cost of living",
-                "Growing tech scene",
-                "Path to EU citizenship"
-            ],
-            "unlocks": ["DE", "NL", "FR", "ES"]
-        })
+    seen = set()
+    for destination in destinations:
+        for suggestion in graph.get_stepping_stones(destination, limit=5):
+            code = suggestion["countryCode"]
+            if code in excluded or code in seen:
+                continue
+            seen.add(code)
+            stepping_stones.append(suggestion)
     
     return stepping_stones[:3]  # Max 3 suggestions
@@ -3,6 +3,15 @@ Health Check Routes
 """
 from fastapi import APIRouter
 
+from src.api.caching import get_reference_cache
+from src.services.explore_session_store import get_explore_session_store
+from src.services.knowledge_snapshot import get_knowledge_snapshot
+from src.services.knowledge_reloader import get_knowledge_reloader
+from src.services.llm_resilience import get_llm_resilience
+from src.services.model_router import get_model_router
+from src.services.rate_limiter import get_llm_governor
+from src.utils.single_flight import single_flight_stats
+
 router = APIRouter()
 
 
@@ -19,6 +28,7 @@ async def health_check():
 @router.get("/health/detailed")
 async def detailed_health():
     """Detailed health check with component status"""
+    snapshot = get_knowledge_snapshot()
     return {
         "status": "healthy",
         "components": {
@@ -26,5 +36,30 @@ async def detailed_health():
             "agents": "ready",
             "rag": "connected",
             "database": "not_required"
-        }
+        },
+        "knowledge": {
+            "version": snapshot.version,
+            "builtAt": snapshot.built_at,
+            "reloads": get_knowledge_reloader().reload_count,
+            "lastReload": get_knowledge_reloader().last_reload
+        },
+        "llmGovernor": get_llm_governor().stats(),
+        "llmResilience": get_llm_resilience().stats(),
+        "modelRouter": get_model_router().stats(),
+        "referenceCache": get_reference_cache().stats(),
+        "exploreSessions": get_explore_session_store().stats(),
+        "singleFlight": single_flight_stats()
+    }
+
+
+@router.get("/health/metrics")
+async def metrics():
+    """Runtime metrics for capacity monitoring"""
+    return {
+        "llmGovernor": get_llm_governor().stats(),
+        "llmResilience": get_llm_resilience().stats(),
+        "modelRouter": get_model_router().stats(),
+        "referenceCache": get_reference_cache().stats(),
+        "exploreSessions": get_explore_session_store().stats(),
+        "singleFlight": single_flight_stats()
     }
@@ -2,7 +2,7 @@
 Configuration management using Pydantic Settings
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -14,14 +14,67 @@ class Settings(BaseSettings):
     
     # ChromaDB Settings (local, no API key needed)
     CHROMADB_PERSIST_DIR: str = "data/chromadb"
+    VECTOR_PARTITION_BY_COUNTRY: bool = True  # Per-country collections beside each global one
+    VECTOR_FANOUT_WORKERS: int = 8  # Parallel partition queries for multi-country searches
     
     # Groq Settings
     GROQ_MODEL: str = "llama-3.3-70b-versatile"  # Fast and powerful model from Groq
     GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
+    GROQ_FAST_MODEL: str = "llama-3.1-8b-instant"  # Small model for extraction-style stages
+    
+    # Model per agent stage / service call: "large", "fast" or a literal Groq model id
+    MODEL_ROUTES: Dict[str, str] = {
+        "profile_analyst": "fast",
+        "path_generator": "large",  # Ranks and reasons over routes; quality-critical
+        "risk_assessor": "large",  # Risk scores feed the final recommendation
+        "synthesizer": "large",
+        "repair": "fast",
+        "analysis": "large",
+        "analysis.deep": "large",
+        "chat": "large",
+    }
+    MODEL_FALLBACK_ENABLED: bool = True  # Switch to the other model while one is rate-limited
+    
+    # Client-side Groq rate governor (keep at or below the account's limits)
+    GROQ_RPM_LIMIT: int = 30
+    GROQ_TPM_LIMIT: int = 12000
+    LLM_CLIENT_RPM_LIMIT: int = 10  # Per client IP
+    
+    # Groq call resilience (retries, hedging, circuit breaker, SLOs)
+    LLM_RETRY_ATTEMPTS: int = 3  # Total attempts, including the first
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_WAIT_SECONDS: float = 20.0  # Longer Retry-After values are not waited out
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # Latencies needed before the p95 deadline is trusted
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive upstream failures
+    CIRCUIT_ERROR_RATE: float = 0.5  # Over the sliding window
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_COOLDOWN_SECONDS: float = 30.0
+    LLM_SLO_P95_SECONDS: float = 10.0
+    LLM_SLO_ERROR_RATE: float = 0.05
+    
+    # Max tokens of each agent's output passed to downstream agents
+    HANDOFF_MAX_TOKENS: int = 1000
+    
+    # Explore session store (SQLite, shared by all workers on the host)
+    EXPLORE_SESSION_DB: str = "data/explore_sessions.db"  # Relative to backend/
+    EXPLORE_SESSION_TTL_SECONDS: float = 3600.0
+    EXPLORE_SESSION_MAX_ENTRIES: int = 10000
+    
+    # Browser cache lifetime for corpus-derived reference endpoints (revalidated via ETag)
+    REFERENCE_CACHE_MAX_AGE: int = 300
     
     # Embedding Settings (using free sentence-transformers)
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # Free, fast, 384 dimensions
     
+    # Knowledge hot reload (watch data/ and swap in a new snapshot on change;
+    # with several workers one rebuilds under data/.knowledge.lock, the rest adopt its snapshot)
+    KNOWLEDGE_HOT_RELOAD: bool = True
+    KNOWLEDGE_RELOAD_DEBOUNCE_MS: int = 1000
+    KNOWLEDGE_POLL_SECONDS: float = 5.0  # Used when watchfiles is not installed
+    KNOWLEDGE_SNAPSHOT_KEY: str = ""  # HMAC key for data/knowledge.snapshot (keep it outside data/)
+    
     # Application Settings
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
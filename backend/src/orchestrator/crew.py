@@ -6,9 +6,9 @@ only set to satisfy internal validation.
 """
 
 import os
-import json
 import re
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime
 
 from crewai import Crew, Process, LLM
@@ -19,13 +19,28 @@ from src.agents.risk_assessor import create_risk_assessor
 from src.agents.recommendation_synthesizer import (
     create_recommendation_synthesizer,
 )
+from src.orchestrator.handoff_manager import HandoffManager
 from src.orchestrator.task_definitions import (
     create_profile_analysis_task,
     create_path_generation_task,
     create_risk_assessment_task,
     create_synthesis_task,
 )
+from src.schemas.outputs.profile_analysis import ProfileAnalysisOutput
+from src.schemas.outputs.mobility_paths import MobilityPathsOutput, PathStep
+from src.schemas.outputs.risk_assessment import RiskAssessmentOutput
+from src.schemas.outputs.final_recommendation import FinalRecommendation
+from src.utils.structured_output import StructuredOutputError, parse_structured_output
+from src.services.rate_limiter import install_litellm_hook
+from src.services.llm_resilience import install_litellm_breaker_hook
+from src.services.model_router import get_model_router, install_litellm_router_hook
+from src.services.country_registry import get_country_registry
+from src.services.eligibility_service import get_eligibility_engine
+from src.services.points_service import get_points_calculator
+from src.utils.single_flight import fingerprint, get_single_flight
+from src.agents.tool_cache import tool_call_scope
 from src.core.config import settings
+from src.core.constants import RISK_LEVELS
 from src.core.logging import logger
 
 
@@ -41,13 +56,51 @@ if settings.GROQ_API_KEY:
 os.environ.setdefault("OPENAI_API_KEY", "dummy")
 
 
+# Output schema each task must produce, in execution order
+STAGE_SCHEMAS = {
+    "profile_analyst": ProfileAnalysisOutput,
+    "path_generator": MobilityPathsOutput,
+    "risk_assessor": RiskAssessmentOutput,
+    "synthesizer": FinalRecommendation,
+}
+
+def _risk_level(risk_score: int) -> str:
+    """Map a 0-100 risk score to a low/medium/high label."""
+    for level, bounds in RISK_LEVELS.items():
+        if risk_score <= bounds["max"]:
+            return level.lower()
+    return "high"
+
+
+def _parse_cost(cost: Optional[str]) -> int:
+    """Pull the first amount out of a cost string like '$2,000'."""
+    if not cost:
+        return 0
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", cost)
+    return int(float(match.group(0).replace(",", ""))) if match else 0
+
+
 class AgentExecutionTracker:
-    """Tracks each agent's execution status and output."""
+    """Tracks each agent's execution status and output.
     
-    def __init__(self):
+    An optional listener is called with (event, data) on every start and
+    completion so progress can be streamed to clients.
+    """
+    
+    def __init__(self, listener: Optional[Callable[[str, Dict], None]] = None):
         self.agent_outputs: Dict[str, Dict] = {}
         self.execution_order: list = []
         self.start_time = datetime.utcnow()
+        self.listener = listener
+    
+    def _notify(self, event: str, data: Dict):
+        """Forward an event to the listener without letting it break the run."""
+        if self.listener is None:
+            return
+        try:
+            self.listener(event, data)
+        except Exception as e:
+            logger.warning(f"Progress listener failed on {event}: {e}")
     
     def record_agent_start(self, agent_name: str):
         """Record when an agent starts execution."""
@@ -58,6 +111,11 @@ class AgentExecutionTracker:
         }
         self.execution_order.append(agent_name)
         logger.info(f"🚀 Agent Started: {agent_name}")
+        self._notify("agent_started", {
+            "agent": agent_name,
+            "step": len(self.execution_order),
+            "total_steps": len(STAGE_SCHEMAS)
+        })
     
     def record_agent_complete(self, agent_name: str, output: Any):
         """Record when an agent completes execution."""
@@ -66,6 +124,12 @@ class AgentExecutionTracker:
             self.agent_outputs[agent_name]["completed_at"] = datetime.utcnow().isoformat()
             self.agent_outputs[agent_name]["output"] = output
             logger.info(f"✅ Agent Completed: {agent_name}")
+            self._notify("agent_completed", {
+                "agent": agent_name,
+                "step": self.execution_order.index(agent_name) + 1,
+                "total_steps": len(STAGE_SCHEMAS),
+                "output": output
+            })
     
     def get_summary(self) -> Dict:
         """Get execution summary."""
@@ -77,6 +141,26 @@ class AgentExecutionTracker:
         }
 
 
+class CrewRun:
+    """
+    State of one analysis run: its stage models, agents, tracker, handoffs
+    and validated stage outputs. Every run gets its own, so concurrent runs
+    on the shared crew never see each other's state.
+    """
+    
+    def __init__(
+        self,
+        stage_models: Dict[str, str],
+        agents: Dict[str, Any],
+        progress_callback: Optional[Callable[[str, Dict], None]] = None
+    ):
+        self.stage_models = stage_models
+        self.agents = agents
+        self.tracker = AgentExecutionTracker(listener=progress_callback)
+        self.structured_outputs: Dict[str, Any] = {}
+        self.handoffs = HandoffManager()
+
+
 class MobilityAnalysisCrew:
     """
     The main orchestrator that coordinates all AI agents.
@@ -94,77 +178,150 @@ class MobilityAnalysisCrew:
         if not settings.GROQ_API_KEY:
             raise RuntimeError("GROQ_API_KEY is not set; cannot initialize Groq LLM")
 
-        self.llm = LLM(
-            model=f"groq/{settings.GROQ_MODEL}",
-            api_key=settings.GROQ_API_KEY,
-            temperature=0.7,
-        )
+        # One LLM per Groq model, shared by the stages (and runs) routed to it
+        self._llms: Dict[str, LLM] = {}
+        self._llms_lock = threading.Lock()
 
         logger.info(
-            f"🚀 Initializing CrewAI with Groq model: groq/{settings.GROQ_MODEL}"
+            "🚀 Initializing CrewAI with Groq models: "
+            + ", ".join(f"{stage}={model}" for stage, model in self._route_stages().items())
         )
-        
-        self.tracker = AgentExecutionTracker()
-        
-        # Initialize all agents with Groq LLM
-        self.profile_analyst = create_profile_analyst(self.llm)
-        self.path_generator = create_path_generator(self.llm)
-        self.risk_assessor = create_risk_assessor(self.llm)
-        self.recommendation_synthesizer = create_recommendation_synthesizer(self.llm)
+        install_litellm_hook()
+        install_litellm_breaker_hook()
+        install_litellm_router_hook()
         
         logger.info("✅ MobilityAnalysisCrew initialized with 4 agents")
     
-    def analyze(self, user_profile: dict, rag_context: dict = None) -> dict:
+    def _route_stages(self) -> Dict[str, str]:
+        """Model each stage should use for the next run."""
+        router = get_model_router()
+        return {stage: router.model_for(stage) for stage in STAGE_SCHEMAS}
+    
+    def _new_run(self, progress_callback: Optional[Callable[[str, Dict], None]]) -> CrewRun:
+        """
+        Fresh run state with agents on the stages' current models (stages
+        whose model is rate-limited are re-routed).
+        """
+        stage_models = self._route_stages()
+        agents = {
+            stage: create(self._llm(stage_models[stage]))
+            for stage, create in (
+                ("profile_analyst", create_profile_analyst),
+                ("path_generator", create_path_generator),
+                ("risk_assessor", create_risk_assessor),
+                ("synthesizer", create_recommendation_synthesizer),
+            )
+        }
+        return CrewRun(stage_models, agents, progress_callback)
+    
+    def _llm(self, model: str) -> LLM:
+        """
+        CrewAI LLM for a Groq model. A call that fails mid-run (e.g. a 429)
+        is retried by LiteLLM on the fallback model, so a long crew run is
+        not aborted by one rate-limited stage.
+        """
+        with self._llms_lock:
+            if model not in self._llms:
+                fallback = get_model_router().alternate(model)
+                extra = {"fallbacks": [f"groq/{fallback}"]} if fallback else {}
+                self._llms[model] = LLM(
+                    model=f"groq/{model}",
+                    api_key=settings.GROQ_API_KEY,
+                    base_url=settings.GROQ_BASE_URL,
+                    temperature=0.7,
+                    **extra,
+                )
+            return self._llms[model]
+    
+    def analyze(
+        self,
+        user_profile: dict,
+        rag_context: dict = None,
+        progress_callback: Optional[Callable[[str, Dict], None]] = None
+    ) -> dict:
         """
         Run the complete analysis workflow with proper orchestration.
         
         Args:
             user_profile: User's profile data
             rag_context: Retrieved context from RAG layer
+            progress_callback: Optional (event, data) callable notified as each
+                agent starts and finishes, with its partial output
             
         Returns:
             Complete analysis result with structured paths and recommendations
+            
+        Concurrent calls with an identical profile and context join the
+        running workflow instead of starting another; every caller's
+        progress_callback receives the agent events. Runs for different
+        profiles proceed in parallel, each with its own CrewRun state.
         """
+        def run(notify: Callable[[str, Dict], None]) -> dict:
+            return self._run_workflow(user_profile, rag_context, notify)
+        
+        key = fingerprint(user_profile, rag_context)
+        return get_single_flight("crew.analyze").do(key, run, listener=progress_callback)
+    
+    def _run_workflow(
+        self,
+        user_profile: dict,
+        rag_context: dict,
+        progress_callback: Callable[[str, Dict], None]
+    ) -> dict:
+        """Build the four tasks, run the crew and assemble the result."""
         logger.info("="*80)
         logger.info(f"🎯 Starting CrewAI Orchestration for: {user_profile.get('nationality', 'Unknown')} national")
         logger.info("="*80)
         
-        # Track agent execution
-        self.tracker = AgentExecutionTracker()
+        # Agents, tracker and handoffs for this run only
+        run = self._new_run(progress_callback)
+        agents = run.agents
+        
+        # Deterministic pre-screen: agents reason only about reachable visas
+        target_countries = (
+            (user_profile.get("goals") or {}).get("targetCountries")
+            or (rag_context or {}).get("target_countries")
+            or []
+        )
+        eligibility = get_eligibility_engine().prompt_summary(user_profile, target_countries)
+        points = get_points_calculator().prompt_summary(user_profile, target_countries)
+        if points:
+            eligibility += f"\nExact points-test scores (use these, do not estimate points):\n{points}"
         
         # Create tasks with proper context
         profile_task = create_profile_analysis_task(
-            agent=self.profile_analyst,
+            agent=agents["profile_analyst"],
             user_profile=user_profile,
-            rag_context=rag_context
+            rag_context=rag_context,
+            eligibility=eligibility,
+            callback=self._stage_callback(run, "profile_analyst")
         )
         
         path_task = create_path_generation_task(
-            agent=self.path_generator,
+            agent=agents["path_generator"],
             user_profile=user_profile,
-            context=[profile_task]
+            eligibility=eligibility,
+            context=[profile_task],
+            callback=self._stage_callback(run, "path_generator")
         )
         
         risk_task = create_risk_assessment_task(
-            agent=self.risk_assessor,
+            agent=agents["risk_assessor"],
             user_profile=user_profile,
-            context=[profile_task, path_task]
+            context=[profile_task, path_task],
+            callback=self._stage_callback(run, "risk_assessor")
         )
         
         synthesis_task = create_synthesis_task(
-            agent=self.recommendation_synthesizer,
+            agent=agents["synthesizer"],
             rag_context=rag_context,
-            context=[profile_task, path_task, risk_task]
+            context=[profile_task, path_task, risk_task],
+            callback=self._stage_callback(run, "synthesizer")
         )
         
         # Create the crew with sequential process
         crew = Crew(
-            agents=[
-                self.profile_analyst,
-                self.path_generator,
-                self.risk_assessor,
-                self.recommendation_synthesizer
-            ],
+            agents=list(agents.values()),
             tasks=[
                 profile_task,
                 path_task,
@@ -187,14 +344,20 @@ class MobilityAnalysisCrew:
         logger.info("   Step 4/4: Final Synthesis")
         
         try:
-            result = crew.kickoff()
-            logger.info("✅ Crew execution completed successfully")
+            run.tracker.record_agent_start("profile_analyst")
+            with tool_call_scope() as tool_cache:
+                result = crew.kickoff()
+            logger.info(
+                f"✅ Crew execution completed successfully "
+                f"(tool calls: {tool_cache['misses']} computed, {tool_cache['hits']} memoized)"
+            )
         except Exception as e:
             logger.error(f"❌ Crew execution failed: {str(e)}")
             raise
         
         # Process and structure the result
         final_result = self._process_crew_output(
+            run,
             crew_result=result,
             user_profile=user_profile,
             rag_context=rag_context
@@ -208,247 +371,248 @@ class MobilityAnalysisCrew:
     
     def _process_crew_output(
         self, 
+        run: CrewRun,
         crew_result: Any, 
         user_profile: dict,
         rag_context: dict = None
     ) -> dict:
-        """Process the raw CrewAI output into structured API response."""
+        """Assemble the API response from the validated per-stage outputs."""
         # Get raw output
         if hasattr(crew_result, 'raw'):
             raw_output = crew_result.raw
         else:
             raw_output = str(crew_result)
         
-        # Try to get individual task outputs
+        # Individual task outputs (already validated by the stage callbacks;
+        # anything a callback didn't see is parsed here)
         task_outputs = {}
         if hasattr(crew_result, 'tasks_output'):
-            agent_names = ["profile_analyst", "path_generator", "risk_assessor", "synthesizer"]
-            for i, task_output in enumerate(crew_result.tasks_output):
-                if i < len(agent_names):
-                    if hasattr(task_output, 'raw'):
-                        task_outputs[agent_names[i]] = task_output.raw
-                    else:
-                        task_outputs[agent_names[i]] = str(task_output)
-        
-        # Parse the paths from the output
-        target_countries = user_profile.get('goals', {}).get('targetCountries', ['Canada', 'Germany'])
-        parsed_paths = self._parse_mobility_paths(raw_output, task_outputs.get("path_generator", ""), target_countries)
+            for stage, task_output in zip(STAGE_SCHEMAS, crew_result.tasks_output):
+                # Compacted stages hold their digest in .raw; report the original text
+                task_outputs[stage] = run.handoffs.raw_outputs.get(stage) or getattr(task_output, 'raw', None) or str(task_output)
+                if stage not in run.structured_outputs:
+                    self._parse_stage_output(run, stage, task_outputs[stage])
         
-        # Parse risk assessment
-        risk_analysis = self._parse_risk_assessment(task_outputs.get("risk_assessor", ""))
+        missing = [stage for stage in STAGE_SCHEMAS if stage not in run.structured_outputs]
+        if missing:
+            raise StructuredOutputError(f"No structured output for stages: {', '.join(missing)}")
         
-        # Parse profile summary
-        profile_summary = self._parse_profile_summary(task_outputs.get("profile_analyst", ""))
+        profile = run.structured_outputs["profile_analyst"]
+        paths = run.structured_outputs["path_generator"]
+        risk = run.structured_outputs["risk_assessor"]
+        final = run.structured_outputs["synthesizer"]
         
-        # Parse action items
-        action_items = self._parse_action_items(raw_output)
+        ranked_paths = self._build_ranked_paths(paths, risk, final)
         
         # Build final response
         return {
             "success": True,
             "timestamp": datetime.utcnow().isoformat(),
-            "profileSummary": profile_summary,
-            "rankedPaths": parsed_paths,
-            "riskAnalysis": risk_analysis,
-            "actionItems": action_items,
+            "executiveSummary": final.executive_summary,
+            "profileSummary": self._build_profile_summary(profile),
+            "rankedPaths": ranked_paths,
+            "riskAnalysis": self._build_risk_analysis(risk, ranked_paths),
+            "actionItems": self._build_action_items(final),
             "agentOutputs": {
                 "profileAnalyst": task_outputs.get("profile_analyst", "")[:1000],
                 "pathGenerator": task_outputs.get("path_generator", "")[:1000],
                 "riskAssessor": task_outputs.get("risk_assessor", "")[:1000],
                 "synthesizer": (task_outputs.get("synthesizer", "") or raw_output)[:1000]
             },
-            "executionTrace": self.tracker.get_summary(),
-            "citations": self._extract_citations(rag_context),
+            "executionTrace": run.tracker.get_summary(),
+            "citations": self._build_citations(final, rag_context),
             "metadata": {
                 "agents_used": 4,
                 "workflow": "crewai_sequential",
-                "model": f"groq/{settings.GROQ_MODEL}",
-                "processing_time_seconds": self.tracker.get_summary().get("duration_seconds", 0)
+                "model": f"groq/{run.stage_models['synthesizer']}",
+                "stageModels": dict(run.stage_models),
+                "processing_time_seconds": run.tracker.get_summary().get("duration_seconds", 0),
+                "handoffs": run.handoffs.token_summary()
             }
         }
     
-    def _parse_mobility_paths(self, raw_output: str, path_generator_output: str, target_countries: List[str]) -> list:
-        """Parse mobility paths from agent output."""
-        paths = []
-        combined = path_generator_output + "\n" + raw_output
-        
-        # Country code mapping
-        country_codes = {
-            "India": "IN", "Canada": "CA", "USA": "US", "United States": "US",
-            "Germany": "DE", "UK": "GB", "United Kingdom": "GB", "Australia": "AU",
-            "UAE": "AE", "Singapore": "SG", "Netherlands": "NL", "Portugal": "PT",
-            "Japan": "JP", "Dubai": "AE"
+    def _stage_callback(self, run: CrewRun, stage: str) -> Callable:
+        """
+        Task callback that validates a stage's output as soon as it finishes
+        and compacts it for the downstream stages. Raising here aborts the
+        crew, so we never pay for later stages built on output we can't use.
+        """
+        stages = list(STAGE_SCHEMAS)
+        next_stage = stages[stages.index(stage) + 1] if stage != stages[-1] else None
+        
+        def callback(task_output: Any) -> None:
+            raw = getattr(task_output, 'raw', None) or str(task_output)
+            self._parse_stage_output(run, stage, raw)
+            run.tracker.record_agent_complete(stage, self._partial_output(run, stage))
+            # Tasks run sequentially, so the next agent starts right away,
+            # reading a bounded digest of this stage instead of its raw text
+            if next_stage:
+                run.handoffs.compact(stage, task_output, run.structured_outputs[stage])
+                run.tracker.record_agent_start(next_stage)
+        return callback
+    
+    def _partial_output(self, run: CrewRun, stage: str) -> dict:
+        """Frontend-shaped output available once the given stage has finished."""
+        outputs = run.structured_outputs
+        if stage == "profile_analyst":
+            return {"profileSummary": self._build_profile_summary(outputs[stage])}
+        if stage == "path_generator":
+            return {"rankedPaths": self._build_ranked_paths(outputs[stage])}
+        if stage == "risk_assessor":
+            ranked_paths = self._build_ranked_paths(outputs["path_generator"], outputs[stage])
+            return {
+                "rankedPaths": ranked_paths,
+                "riskAnalysis": self._build_risk_analysis(outputs[stage], ranked_paths)
+            }
+        final = outputs[stage]
+        return {
+            "executiveSummary": final.executive_summary,
+            "actionItems": self._build_action_items(final)
         }
+    
+    def _parse_stage_output(self, run: CrewRun, stage: str, raw: str) -> None:
+        """Validate a stage's raw output against its schema (one repair retry)."""
+        schema = STAGE_SCHEMAS[stage]
+        try:
+            run.structured_outputs[stage] = parse_structured_output(
+                raw, schema, repair=self._repair_output
+            )
+            logger.info(f"✅ {stage} output validated as {schema.__name__}")
+        except StructuredOutputError as e:
+            logger.error(f"❌ {stage} output failed validation: {e} {e.errors[:5]}")
+            raise
+    
+    def _repair_output(self, prompt: str) -> str:
+        """Single targeted repair call used by the structured output parser."""
+        logger.warning("🔧 Requesting structured output repair from LLM")
+        return self._llm(get_model_router().model_for("repair")).call([{"role": "user", "content": prompt}])
+    
+    def _build_profile_summary(self, profile: ProfileAnalysisOutput) -> dict:
+        """Convert the Profile Analyst output to the frontend profile summary."""
+        eligible: Dict[str, List[str]] = {}
+        for visa in profile.eligible_visas:
+            eligible.setdefault(visa.country, []).append(visa.visa_type)
         
-        # Look for country transitions
-        transition_pattern = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*[→➔->]+\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)"
-        transitions = re.findall(transition_pattern, combined)
-        
-        if transitions:
-            visited = set()
-            steps = []
-            for from_country, to_country in transitions:
-                if from_country not in visited:
-                    visited.add(from_country)
-                    steps.append({
-                        "order": len(steps) + 1,
-                        "country": from_country,
-                        "countryCode": country_codes.get(from_country, "XX"),
-                        "visaType": "Work Visa",
-                        "duration": "1-2 years",
-                        "purpose": "Initial step or stepping stone",
-                        "requirements": ["Valid passport", "Work permit"],
-                        "estimatedCost": 5000,
-                        "currency": "USD"
-                    })
-                if to_country not in visited:
-                    visited.add(to_country)
-                    steps.append({
-                        "order": len(steps) + 1,
-                        "country": to_country,
-                        "countryCode": country_codes.get(to_country, "XX"),
-                        "visaType": "Skilled Worker Visa",
-                        "duration": "2-5 years",
-                        "purpose": "Target destination",
-                        "requirements": ["Job offer", "Qualification recognition"],
-                        "estimatedCost": 10000,
-                        "currency": "USD"
-                    })
+        return {
+            "summary": profile.profile_summary,
+            "profileScore": round(profile.overall_strength_score),
+            "strengths": [s.factor for s in profile.strengths][:5],
+            "weaknesses": [w.factor for w in profile.weaknesses][:5],
+            "eligibleVisas": [
+                {"country": country, "visaTypes": visa_types}
+                for country, visa_types in eligible.items()
+            ]
+        }
+    
+    def _build_ranked_paths(
+        self,
+        paths: MobilityPathsOutput,
+        risk: Optional[RiskAssessmentOutput] = None,
+        final: Optional[FinalRecommendation] = None
+    ) -> list:
+        """Join generated paths with their risk assessment and final ranking.
+        
+        Risk and ranking are optional so provisional paths can be streamed
+        before the later agents have run.
+        """
+        risk_by_id = {a.path_id: a for a in risk.path_assessments} if risk else {}
+        rank_by_id = {r.path_id: r for r in final.ranked_paths} if final else {}
+        
+        built = []
+        for path in paths.paths:
+            assessment = risk_by_id.get(path.path_id)
+            ranked = rank_by_id.get(path.path_id)
+            risk_score = assessment.risk_score if assessment else 50
             
-            if steps:
-                paths.append({
-                    "id": "path_1",
-                    "rank": 1,
-                    "name": f"Multi-Step Route: {steps[0]['country']} → {steps[-1]['country']}",
-                    "description": f"Strategic pathway from {steps[0]['country']} to {steps[-1]['country']}",
-                    "steps": steps,
-                    "totalDuration": f"{len(steps) * 2} years estimated",
-                    "overallScore": 78,
-                    "approvalProbability": 72,
-                    "riskLevel": "medium",
-                    "whyThisPath": "This path optimizes your profile strengths and uses stepping stones strategically.",
-                    "recommendation": "Recommended based on profile match"
-                })
+            if assessment:
+                probability = assessment.approval_probability
+            elif ranked:
+                probability = ranked.approval_probability
+            else:
+                probability = 0.5
+            
+            built.append({
+                "id": path.path_id,
+                "rank": ranked.rank if ranked else None,
+                "name": path.path_name,
+                "description": path.route_summary,
+                "steps": [self._build_step(step) for step in path.steps],
+                "totalDuration": path.total_timeline,
+                "overallScore": ranked.score if ranked else 100 - risk_score,
+                "approvalProbability": round(probability * 100),
+                "riskLevel": _risk_level(risk_score),
+                "whyThisPath": path.why_this_path,
+                "recommendation": (
+                    ranked.one_line_reason if ranked
+                    else (assessment.overall_assessment if assessment else "")
+                )
+            })
         
-        # Create paths for target countries if no transitions found
-        for i, country in enumerate(target_countries[:3]):
-            if not any(country in str(p) for p in paths):
-                paths.append({
-                    "id": f"path_{len(paths) + 1}",
-                    "rank": len(paths) + 1,
-                    "name": f"Direct Path to {country}",
-                    "description": f"Direct immigration pathway to {country}",
-                    "steps": [
-                        {
-                            "order": 1,
-                            "country": country,
-                            "countryCode": country_codes.get(country, country[:2].upper()),
-                            "visaType": "Skilled Worker Visa",
-                            "duration": "2-4 years",
-                            "purpose": "Primary work authorization and settlement",
-                            "requirements": ["Job offer", "Skills assessment", "Language test"],
-                            "estimatedCost": 8000,
-                            "currency": "USD"
-                        }
-                    ],
-                    "totalDuration": "2-4 years",
-                    "overallScore": 75 - (i * 8),
-                    "approvalProbability": 70 - (i * 8),
-                    "riskLevel": ["low", "medium", "medium"][min(i, 2)],
-                    "whyThisPath": f"{country} matches your skills and has active demand in your field.",
-                    "recommendation": "Strong alternative" if i > 0 else "Primary recommendation"
-                })
+        built.sort(key=lambda p: (p["rank"] is None, p["rank"] or 0, -p["overallScore"]))
+        for i, path in enumerate(built):
+            path["rank"] = i + 1
         
-        return paths[:4]  # Return max 4 paths
+        return built[:4]  # Return max 4 paths
     
-    def _parse_risk_assessment(self, risk_output: str) -> dict:
-        """Parse risk assessment from agent output."""
-        risk_score = 45
-        score_match = re.search(r"(?:risk\s*score|score)[:\s]*(\d+)", risk_output, re.IGNORECASE)
-        if score_match:
-            risk_score = int(score_match.group(1))
-        
-        probability = 65
-        prob_match = re.search(r"(\d+)\s*%", risk_output)
-        if prob_match:
-            probability = int(prob_match.group(1))
-        
+    def _build_step(self, step: PathStep) -> dict:
+        """Convert a schema PathStep to the frontend step format."""
         return {
-            "overallRiskScore": risk_score,
-            "approvalProbability": probability,
-            "riskLevel": "low" if risk_score < 30 else ("high" if risk_score > 70 else "medium"),
-            "factors": ["Documentation completeness", "Financial stability", "Skills demand match"],
-            "mitigations": ["Prepare all documents in advance", "Maintain proof of funds", "Get skills assessed"]
+            "order": step.step_number,
+            "country": step.country,
+            "countryCode": get_country_registry().code(step.country) or step.country[:2].upper(),
+            "visaType": step.visa_type,
+            "duration": step.duration,
+            "purpose": step.purpose,
+            "requirements": step.key_requirements,
+            "estimatedCost": _parse_cost(step.estimated_cost),
+            "currency": "USD"
         }
     
-    def _parse_profile_summary(self, profile_output: str) -> dict:
-        """Parse profile summary from agent output."""
-        strengths = []
-        weaknesses = []
-        
-        strength_keywords = ["strength", "advantage", "strong", "qualified", "eligible", "positive", "benefit"]
-        weakness_keywords = ["weakness", "concern", "gap", "lacking", "improve", "challenge", "risk"]
-        
-        lines = profile_output.split("\n")
-        for line in lines:
-            line_lower = line.lower()
-            if any(kw in line_lower for kw in strength_keywords) and len(line) > 15:
-                cleaned = re.sub(r'^[\s\-\*\d\.]+', '', line).strip()
-                if cleaned and len(cleaned) > 10:
-                    strengths.append(cleaned[:150])
-            elif any(kw in line_lower for kw in weakness_keywords) and len(line) > 15:
-                cleaned = re.sub(r'^[\s\-\*\d\.]+', '', line).strip()
-                if cleaned and len(cleaned) > 10:
-                    weaknesses.append(cleaned[:150])
-        
-        if not strengths:
-            strengths = [
-                "Educational qualifications recognized internationally",
-                "Relevant work experience in high-demand field",
-                "Financial resources meet visa requirements"
-            ]
-        if not weaknesses:
-            weaknesses = [
-                "May need language proficiency certification",
-                "Consider gathering additional documentation"
-            ]
+    def _build_risk_analysis(self, risk: RiskAssessmentOutput, ranked_paths: list) -> dict:
+        """Summarize the Risk Assessor output for the top-ranked path."""
+        top_id = ranked_paths[0]["id"] if ranked_paths else None
+        primary = next(
+            (a for a in risk.path_assessments if a.path_id == top_id),
+            risk.path_assessments[0] if risk.path_assessments else None
+        )
+        if primary is None:
+            return {}
         
         return {
-            "strengths": strengths[:5],
-            "weaknesses": weaknesses[:5],
-            "eligibleVisas": []
+            "overallRiskScore": primary.risk_score,
+            "approvalProbability": round(primary.approval_probability * 100),
+            "riskLevel": _risk_level(primary.risk_score),
+            "factors": (risk.common_risks + risk.user_specific_concerns)[:5] or primary.negative_factors[:5],
+            "mitigations": [r.mitigation for r in primary.risks][:5],
+            "safestPath": risk.safest_path,
+            "highestProbabilityPath": risk.highest_probability_path
         }
     
-    def _parse_action_items(self, output: str) -> list:
-        """Parse action items from synthesizer output."""
-        action_items = []
-        
-        action_patterns = [
-            r"(?:\d+[\.\)]\s*)([A-Z][^\.]{10,100}\.)",
-            r"(?:Step|Action|Task|TODO)\s*\d*[:\s]*([^\n]{15,100})"
+    def _build_action_items(self, final: FinalRecommendation) -> list:
+        """Convert the synthesizer's next steps to frontend action items."""
+        return [
+            {
+                "order": step.order,
+                "action": step.action,
+                "deadline": step.timeline,
+                "priority": step.priority.lower(),
+                "details": step.details
+            }
+            for step in sorted(final.next_steps, key=lambda s: s.order)
         ]
-        
-        for pattern in action_patterns:
-            matches = re.findall(pattern, output)
-            for i, match in enumerate(matches[:6]):
-                action_items.append({
-                    "order": i + 1,
-                    "action": match.strip()[:150],
-                    "priority": "high" if i < 2 else ("medium" if i < 4 else "low"),
-                    "deadline": None,
-                    "details": None
-                })
-        
-        if not action_items:
-            action_items = [
-                {"order": 1, "action": "Research visa requirements for target countries", "priority": "high"},
-                {"order": 2, "action": "Gather educational credentials and get them authenticated", "priority": "high"},
-                {"order": 3, "action": "Take required language proficiency tests (IELTS/TOEFL)", "priority": "medium"},
-                {"order": 4, "action": "Prepare proof of funds documentation", "priority": "medium"},
-                {"order": 5, "action": "Create a timeline for application submission", "priority": "low"},
-            ]
-        
-        return action_items
+    
+    def _build_citations(self, final: FinalRecommendation, rag_context: dict = None) -> list:
+        """Citations referenced by the synthesizer, falling back to RAG sources."""
+        citations = [
+            {
+                "id": citation.id,
+                "source": citation.title,
+                "text": citation.snippet,
+                "url": citation.url
+            }
+            for citation in final.citations
+        ]
+        return citations or self._extract_citations(rag_context)
     
     def _extract_citations(self, rag_context: dict) -> list:
         """Extract citations from RAG context."""
@@ -1,11 +1,44 @@
 """
 Handoff Manager - Manages data passing between agents
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
+from pydantic import BaseModel
+
+from src.core.config import settings
 from src.core.logging import logger
+from src.services.rate_limiter import CHARS_PER_TOKEN
+
+# Agents whose task context includes each stage's output
+HANDOFF_TARGETS = {
+    "profile_analyst": ["path_generator", "risk_assessor", "synthesizer"],
+    "path_generator": ["risk_assessor", "synthesizer"],
+    "risk_assessor": ["synthesizer"],
+}
+
+# (max string chars, max list items), loosest first
+DIGEST_LEVELS = [(400, 8), (240, 5), (120, 4), (60, 3), (40, 3)]
+
+
+def _count_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _bound(value: Any, max_chars: int, max_items: int) -> Any:
+    """Cap strings and lists recursively; drop empty values"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars - 1].rstrip() + "…"
+    if isinstance(value, list):
+        return [_bound(item, max_chars, max_items) for item in value[:max_items]]
+    if isinstance(value, dict):
+        return {
+            key: _bound(item, max_chars, max_items)
+            for key, item in value.items()
+            if item not in ("", [], {})
+        }
+    return value
 
 
 class HandoffManager:
@@ -13,15 +46,17 @@ class HandoffManager:
     Manages the handoff of data between agents.
     
     Responsibilities:
-    1. Transform outputs from one agent to inputs for the next
+    1. Compact each agent's output into a bounded digest for the next
     2. Maintain context chain across the workflow
     3. Extract and preserve citations
     4. Structure final output for API response
     """
     
-    def __init__(self):
+    def __init__(self, token_budget: Optional[int] = None):
         self.context_chain: List[Dict] = []
         self.citations: List[Dict] = []
+        self.raw_outputs: Dict[str, str] = {}
+        self.token_budget = token_budget or settings.HANDOFF_MAX_TOKENS
     
     def record_handoff(
         self, 
@@ -39,49 +74,67 @@ class HandoffManager:
         self.context_chain.append(handoff_record)
         logger.debug(f"Handoff recorded: {from_agent} → {to_agent}")
     
-    def transform_profile_to_paths(self, profile_analysis: str) -> Dict:
+    def compact(self, from_agent: str, task_output: Any, output: BaseModel) -> str:
         """
-        Transform Profile Analyst output for Path Generator.
-        Extracts key information needed for path generation.
+        Replace a finished task's raw output with a bounded digest of its
+        validated schema, so downstream tasks receive the digest as context.
+        
+        CrewAI builds each task's context from ``task.output.raw`` of the
+        tasks it depends on; the original text is kept in ``raw_outputs``.
         """
-        return {
-            "profile_analysis": profile_analysis,
-            "extracted_at": datetime.utcnow().isoformat()
-        }
+        raw = getattr(task_output, "raw", None) or str(task_output)
+        digest = self.digest(output)
+        task_output.raw = digest
+        self.raw_outputs[from_agent] = raw
+        
+        to_agents = HANDOFF_TARGETS.get(from_agent, [])
+        raw_tokens = _count_tokens(raw)
+        digest_tokens = _count_tokens(digest)
+        self.context_chain.append({
+            "from": from_agent,
+            "to": to_agents,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data_keys": list(output.model_fields),
+            "raw_tokens": raw_tokens,
+            "digest_tokens": digest_tokens
+        })
+        logger.info(
+            f"📦 Handoff {from_agent} → {', '.join(to_agents) or 'output'}: "
+            f"{raw_tokens} → {digest_tokens} tokens"
+        )
+        return digest
     
-    def transform_paths_to_risk(
-        self, 
-        profile_analysis: str, 
-        mobility_paths: str
-    ) -> Dict:
+    def digest(self, output: BaseModel) -> str:
         """
-        Transform outputs for Risk Assessor.
-        Combines profile and paths for comprehensive risk analysis.
+        Compact JSON of a stage output, tightened until it fits the budget.
+        
+        Every string and list is capped, so the size is bounded by the
+        schema's shape regardless of how verbose the agent was.
         """
-        return {
-            "profile_summary": profile_analysis,
-            "proposed_paths": mobility_paths,
-            "extracted_at": datetime.utcnow().isoformat()
-        }
+        data = output.model_dump(mode="json", exclude_none=True)
+        for max_chars, max_items in DIGEST_LEVELS:
+            digest = json.dumps(_bound(data, max_chars, max_items), separators=(",", ":"), ensure_ascii=False)
+            if _count_tokens(digest) <= self.token_budget:
+                break
+        return digest
     
-    def transform_all_to_synthesis(
-        self,
-        profile_analysis: str,
-        mobility_paths: str,
-        risk_assessment: str,
-        rag_context: Dict = None
-    ) -> Dict:
-        """
-        Transform all outputs for final synthesis.
-        Prepares complete context for recommendation generation.
-        """
+    def token_summary(self) -> Dict:
+        """Token accounting across all compacted handoffs"""
+        handoffs = [h for h in self.context_chain if "digest_tokens" in h]
+        raw = sum(h["raw_tokens"] for h in handoffs)
+        digest = sum(h["digest_tokens"] for h in handoffs)
         return {
-            "profile_analysis": profile_analysis,
-            "proposed_paths": mobility_paths,
-            "risk_assessment": risk_assessment,
-            "policy_context": rag_context.get('policy_snippets', '') if rag_context else '',
-            "citations": rag_context.get('citations', []) if rag_context else [],
-            "extracted_at": datetime.utcnow().isoformat()
+            "budgetTokens": self.token_budget,
+            "rawTokens": raw,
+            "digestTokens": digest,
+            # Each digest is read by every downstream agent
+            "contextTokensSaved": sum(
+                (h["raw_tokens"] - h["digest_tokens"]) * len(h["to"]) for h in handoffs
+            ),
+            "handoffs": [
+                {"from": h["from"], "to": h["to"], "rawTokens": h["raw_tokens"], "digestTokens": h["digest_tokens"]}
+                for h in handoffs
+            ]
         }
     
     def extract_citations(self, agent_output: str, source_context: Dict) -> List[Dict]:
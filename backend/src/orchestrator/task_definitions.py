@@ -1,19 +1,27 @@
 """
 Task Definitions - Templates for each agent's task
 """
+import json
 from crewai import Task
-from typing import List, Optional
+from pydantic import BaseModel
+from typing import Callable, List, Optional, Type
 
 from src.agents.profile_analyst.prompts import PROFILE_ANALYSIS_TASK_TEMPLATE
 from src.agents.path_generator.prompts import PATH_GENERATION_TASK_TEMPLATE
 from src.agents.risk_assessor.prompts import RISK_ASSESSMENT_TASK_TEMPLATE
 from src.agents.recommendation_synthesizer.prompts import SYNTHESIS_TASK_TEMPLATE
+from src.schemas.outputs.profile_analysis import ProfileAnalysisOutput
+from src.schemas.outputs.mobility_paths import MobilityPathsOutput
+from src.schemas.outputs.risk_assessment import RiskAssessmentOutput
+from src.schemas.outputs.final_recommendation import FinalRecommendation
 
 
 def create_profile_analysis_task(
     agent,
     user_profile: dict,
-    rag_context: dict = None
+    rag_context: dict = None,
+    eligibility: str = "",
+    callback: Optional[Callable] = None
 ) -> Task:
     """
     Creates the Profile Analysis task.
@@ -26,24 +34,24 @@ def create_profile_analysis_task(
     if rag_context:
         description += f"\n\n## Additional Context:\n{rag_context.get('profile_context', '')}"
     
+    description += _eligibility_section(eligibility)
+    
+    description += _json_output_instructions(ProfileAnalysisOutput)
+    
     return Task(
         description=description,
         agent=agent,
-        expected_output="""
-        A structured profile analysis containing:
-        1. Profile strengths (list)
-        2. Profile weaknesses (list)
-        3. Eligible visa categories (list with explanations)
-        4. Recommended regions (list with reasoning)
-        5. Critical observations and recommendations
-        """
+        callback=callback,
+        expected_output=_json_expected_output(ProfileAnalysisOutput)
     )
 
 
 def create_path_generation_task(
     agent,
     user_profile: dict,
-    context: List[Task] = None
+    context: List[Task] = None,
+    eligibility: str = "",
+    callback: Optional[Callable] = None
 ) -> Task:
     """
     Creates the Path Generation task.
@@ -66,25 +74,23 @@ def create_path_generation_task(
     
     Use the profile analysis output to ensure paths are realistic for this user's situation.
     """
+    description += _eligibility_section(eligibility)
+    description += _json_output_instructions(MobilityPathsOutput)
     
     return Task(
         description=description,
         agent=agent,
         context=context,
-        expected_output="""
-        2-3 detailed mobility paths, each containing:
-        1. Path structure (origin → steps → destination)
-        2. Step-by-step breakdown with visa types and timelines
-        3. Why this path suits the user
-        4. Path characteristics (difficulty, timeline, cost)
-        """
+        callback=callback,
+        expected_output=_json_expected_output(MobilityPathsOutput)
     )
 
 
 def create_risk_assessment_task(
     agent,
     user_profile: dict,
-    context: List[Task] = None
+    context: List[Task] = None,
+    callback: Optional[Callable] = None
 ) -> Task:
     """
     Creates the Risk Assessment task.
@@ -103,27 +109,24 @@ def create_risk_assessment_task(
     7. Overall go/no-go recommendation
     
     Be thorough but fair. Identify real risks without being unnecessarily pessimistic.
+    Use the same path_id values as the Path Generator.
     """
+    description += _json_output_instructions(RiskAssessmentOutput)
     
     return Task(
         description=description,
         agent=agent,
         context=context,
-        expected_output="""
-        A comprehensive risk assessment for each path containing:
-        1. Risk score and breakdown
-        2. Identified risks with severity ratings
-        3. Blockers and mitigation strategies
-        4. Approval probability with confidence factors
-        5. Overall recommendation (Recommended/Proceed with Caution/Not Recommended)
-        """
+        callback=callback,
+        expected_output=_json_expected_output(RiskAssessmentOutput)
     )
 
 
 def create_synthesis_task(
     agent,
     rag_context: dict = None,
-    context: List[Task] = None
+    context: List[Task] = None,
+    callback: Optional[Callable] = None
 ) -> Task:
     """
     Creates the Synthesis task.
@@ -150,26 +153,55 @@ def create_synthesis_task(
     8. Important disclaimers
     
     Make your output clear, trustworthy, and actionable. This is what the user will see.
+    Use the same path_id values as the Path Generator.
     """
+    description += _json_output_instructions(FinalRecommendation)
     
     return Task(
         description=description,
         agent=agent,
         context=context,
-        expected_output="""
-        A complete recommendation package containing:
-        1. Executive summary
-        2. Ranked paths table
-        3. Primary recommendation with full justification
-        4. Alternatives and trade-offs
-        5. Strengths and concerns breakdown
-        6. Numbered action items
-        7. Formatted citations
-        8. Disclaimers
-        """
+        callback=callback,
+        expected_output=_json_expected_output(FinalRecommendation)
     )
 
 
+def _eligibility_section(eligibility: str) -> str:
+    """Pre-screened visa list from the eligibility engine, if any"""
+    if not eligibility:
+        return ""
+    return f"""
+    
+    ## Pre-screened Visa Eligibility (deterministic requirement checks):
+    {eligibility}
+    
+    Only consider the visas listed above; address the gaps of borderline ones.
+    Do not propose screened-out visas.
+    """
+
+
+def _json_output_instructions(schema: Type[BaseModel]) -> str:
+    """Output format section appended to every task description"""
+    example = (schema.model_config.get("json_schema_extra") or {}).get("example", {})
+    required = schema.model_json_schema().get("required", [])
+    
+    return f"""
+    
+    ## Output Format:
+    Respond with ONLY a single JSON object matching the `{schema.__name__}` schema.
+    Do not wrap it in markdown and do not add any text before or after it.
+    Required top-level fields: {', '.join(required)}
+    
+    Example:
+    {json.dumps(example, indent=2, default=str)}
+    """
+
+
+def _json_expected_output(schema: Type[BaseModel]) -> str:
+    """Expected output string for a JSON-producing task"""
+    return f"A single valid JSON object matching the {schema.__name__} schema, with no surrounding text."
+
+
 def _format_profile(user_profile: dict) -> str:
     """Format user profile for task description"""
     sections = []
@@ -1,3 +1,13 @@
 # RAG module
-from src.rag.retriever import RAGRetriever
-from src.rag.vector_store import VectorStore
+# Exports resolve lazily so lightweight submodules (citation_extractor)
+# import without pulling in the embedding model stack.
+
+
+def __getattr__(name):
+    if name == "RAGRetriever":
+        from src.rag.retriever import RAGRetriever
+        return RAGRetriever
+    if name == "VectorStore":
+        from src.rag.vector_store import VectorStore
+        return VectorStore
+    raise AttributeError(f"module 'src.rag' has no attribute {name!r}")
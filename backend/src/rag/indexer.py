@@ -1,13 +1,15 @@
 """
 Document Indexer - Index documents into the vector store
 """
-import json
-import os
 from pathlib import Path
 from typing import List, Dict
 import hashlib
 
-from src.rag.vector_store import get_vector_store
+from src.rag.vector_store import PARTITIONED_NAMESPACES, get_vector_store
+from src.services.country_registry import get_country_registry
+from src.services.knowledge_model import Country, VisaType
+from src.services.knowledge_snapshot import KnowledgeSnapshot, build_snapshot, get_knowledge_snapshot
+from src.core.config import settings
 from src.core.logging import logger
 
 
@@ -17,13 +19,15 @@ class DocumentIndexer:
     Handles JSON and Markdown files.
     """
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, snapshot: KnowledgeSnapshot = None):
         self.vector_store = get_vector_store()
-        self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
+        if snapshot is None:
+            snapshot = build_snapshot(Path(data_dir)) if data_dir else get_knowledge_snapshot()
+        self.snapshot = snapshot
     
     def index_all(self):
         """Index all documents from the data directory"""
-        logger.info("Starting full document indexing...")
+        logger.info(f"Starting full document indexing (corpus {self.snapshot.version})...")
         
         # Index country data
         self.index_countries()
@@ -34,37 +38,105 @@ class DocumentIndexer:
         # Index financial thresholds
         self.index_financial_data()
         
+        # Split the (now country-tagged) namespaces into per-country partitions
+        if settings.VECTOR_PARTITION_BY_COUNTRY:
+            self.build_partitions()
+        
         logger.info("Document indexing complete")
     
+    def build_partitions(self) -> Dict[str, int]:
+        """
+        (Re)build the per-country partitions of the country-tagged namespaces
+        from their global collections. Run after a full index so chunks
+        indexed before partitioning existed carry their ``country`` tag.
+        """
+        return {
+            namespace: self.vector_store.rebuild_partitions(namespace)
+            for namespace in PARTITIONED_NAMESPACES
+        }
+    
+    def index_changes(self, previous: KnowledgeSnapshot) -> Dict[str, int]:
+        """
+        Re-index only the documents that differ from a previous snapshot.
+        
+        Documents are compared by ID, text and metadata (ignoring the corpus
+        version); new or changed ones are upserted and vanished ones deleted.
+        """
+        old_documents = DocumentIndexer(snapshot=previous).build_documents()
+        new_documents = self.build_documents()
+        
+        upserted = deleted = 0
+        for namespace in set(old_documents) | set(new_documents):
+            old_by_id = {d['id']: d for d in old_documents.get(namespace, [])}
+            new_by_id = {d['id']: d for d in new_documents.get(namespace, [])}
+            
+            changed = [
+                doc for doc_id, doc in new_by_id.items()
+                if doc_id not in old_by_id or self._fingerprint(doc) != self._fingerprint(old_by_id[doc_id])
+            ]
+            removed = [doc_id for doc_id in old_by_id if doc_id not in new_by_id]
+            
+            if changed:
+                upserted += self.vector_store.upsert_documents(changed, namespace=namespace)
+            if removed:
+                deleted += self.vector_store.delete_documents(removed, namespace=namespace)
+        
+        logger.info(
+            f"Incremental index {previous.version} → {self.snapshot.version}: "
+            f"{upserted} upserted, {deleted} deleted"
+        )
+        return {"upserted": upserted, "deleted": deleted}
+    
+    def build_documents(self) -> Dict[str, List[Dict]]:
+        """All documents for the snapshot, grouped by namespace"""
+        return {
+            "policies": self._country_documents() + self._policy_documents(),
+            "financial": self._financial_documents()
+        }
+    
     def index_countries(self):
         """Index country JSON files"""
-        countries_dir = Path(self.data_dir) / "countries"
-        
-        if not countries_dir.exists():
-            logger.warning(f"Countries directory not found: {countries_dir}")
+        documents = self._country_documents()
+        if documents:
+            self.vector_store.upsert_documents(documents, namespace="policies")
+            logger.info(f"Indexed {len(documents)} country documents")
+    
+    def index_policies(self):
+        """Index markdown policy documents"""
+        documents = self._policy_documents()
+        if documents:
+            self.vector_store.upsert_documents(documents, namespace="policies")
+            logger.info(f"Indexed {len(documents)} policy document chunks")
+    
+    def index_financial_data(self):
+        """Index financial thresholds"""
+        documents = self._financial_documents()
+        if not documents:
+            logger.warning("Financial data not found in knowledge snapshot")
             return
         
+        self.vector_store.upsert_documents(documents, namespace="financial")
+        logger.info(f"Indexed {len(documents)} financial documents")
+    
+    def _country_documents(self) -> List[Dict]:
+        """Visa and overview documents for every country"""
         documents = []
         
-        for json_file in countries_dir.glob("*.json"):
-            with open(json_file, 'r', encoding='utf-8') as f:
-                country_data = json.load(f)
-            
+        for country_name, country_data in self.snapshot.countries.items():
             # Create document for each visa type
-            country_name = json_file.stem
-            
-            for visa_type in country_data.get('visa_types', []):
+            for visa_type in country_data.visa_types:
                 doc_text = self._format_visa_document(country_name, visa_type)
-                doc_id = self._generate_id(f"{country_name}_{visa_type['type']}")
+                doc_id = self._generate_id(f"{country_name}_{visa_type.type}")
                 
                 documents.append({
                     'id': doc_id,
                     'text': doc_text,
                     'metadata': {
                         'country': country_name,
-                        'visa_type': visa_type['type'],
+                        'visa_type': visa_type.type,
                         'source': 'country_data',
-                        'title': f"{country_name.title()} - {visa_type['name']}"
+                        'title': f"{country_name.title()} - {visa_type.name}",
+                        'corpus_version': self.snapshot.version
                     }
                 })
             
@@ -76,63 +148,51 @@ class DocumentIndexer:
                 'metadata': {
                     'country': country_name,
                     'source': 'country_overview',
-                    'title': f"{country_name.title()} Immigration Overview"
+                    'title': f"{country_name.title()} Immigration Overview",
+                    'corpus_version': self.snapshot.version
                 }
             })
         
-        if documents:
-            self.vector_store.upsert_documents(documents, namespace="policies")
-            logger.info(f"Indexed {len(documents)} country documents")
+        return documents
     
-    def index_policies(self):
-        """Index markdown policy documents"""
-        policies_dir = Path(self.data_dir) / "policies"
-        
-        if not policies_dir.exists():
-            logger.warning(f"Policies directory not found: {policies_dir}")
-            return
-        
+    def _policy_documents(self) -> List[Dict]:
+        """Chunked policy markdown documents"""
         documents = []
+        registry = get_country_registry(self.snapshot)
         
-        for md_file in policies_dir.glob("*.md"):
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+        for policy_name, content in self.snapshot.policies.items():
             # Split into chunks if too long
             chunks = self._chunk_text(content, max_length=1000)
+            # Country-specific documents are named "<country key>_<programme>"
+            country = registry.key(policy_name.split('_')[0])
             
             for i, chunk in enumerate(chunks):
-                doc_id = self._generate_id(f"{md_file.stem}_{i}")
+                doc_id = self._generate_id(f"{policy_name}_{i}")
+                metadata = {
+                    'source': 'policy_document',
+                    'title': policy_name.replace('_', ' ').title(),
+                    'chunk_index': i,
+                    'corpus_version': self.snapshot.version
+                }
+                if country:
+                    metadata['country'] = country
                 
                 documents.append({
                     'id': doc_id,
                     'text': chunk,
-                    'metadata': {
-                        'source': 'policy_document',
-                        'title': md_file.stem.replace('_', ' ').title(),
-                        'chunk_index': i
-                    }
+                    'metadata': metadata
                 })
         
-        if documents:
-            self.vector_store.upsert_documents(documents, namespace="policies")
-            logger.info(f"Indexed {len(documents)} policy document chunks")
+        return documents
     
-    def index_financial_data(self):
-        """Index financial thresholds"""
-        financial_file = Path(self.data_dir) / "financial_thresholds.json"
-        
-        if not financial_file.exists():
-            logger.warning(f"Financial data not found: {financial_file}")
-            return
-        
-        with open(financial_file, 'r', encoding='utf-8') as f:
-            financial_data = json.load(f)
-        
+    def _financial_documents(self) -> List[Dict]:
+        """Financial threshold documents per country"""
         documents = []
         
-        for country, thresholds in financial_data.items():
-            doc_text = self._format_financial_document(country, thresholds)
+        for country, data in self.snapshot.countries.items():
+            if not data.thresholds:
+                continue
+            doc_text = self._format_financial_document(country, data.thresholds_dict())
             doc_id = self._generate_id(f"financial_{country}")
             
             documents.append({
@@ -141,37 +201,41 @@ class DocumentIndexer:
                 'metadata': {
                     'country': country,
                     'source': 'financial_thresholds',
-                    'title': f"{country.title()} Financial Requirements"
+                    'title': f"{country.title()} Financial Requirements",
+                    'corpus_version': self.snapshot.version
                 }
             })
         
-        if documents:
-            self.vector_store.upsert_documents(documents, namespace="financial")
-            logger.info(f"Indexed {len(documents)} financial documents")
+        return documents
     
-    def _format_visa_document(self, country: str, visa_type: Dict) -> str:
+    def _fingerprint(self, document: Dict) -> tuple:
+        """Comparable content of a document, ignoring the corpus version"""
+        metadata = {k: v for k, v in document.get('metadata', {}).items() if k != 'corpus_version'}
+        return document['text'], sorted(metadata.items())
+    
+    def _format_visa_document(self, country: str, visa_type: VisaType) -> str:
         """Format visa type data as searchable document"""
         parts = [
             f"Country: {country.title()}",
-            f"Visa Type: {visa_type.get('name', visa_type['type'])}",
-            f"Description: {visa_type.get('description', '')}",
-            f"Requirements: {', '.join(visa_type.get('requirements', []))}",
-            f"Processing Time: {visa_type.get('processing_time', 'Varies')}",
-            f"Duration: {visa_type.get('duration', 'Varies')}",
-            f"Path to PR: {visa_type.get('path_to_pr', 'Unknown')}"
+            f"Visa Type: {visa_type.name}",
+            f"Description: {visa_type.description or ''}",
+            f"Requirements: {', '.join(visa_type.requirements)}",
+            f"Processing Time: {visa_type.processing_time or 'Varies'}",
+            f"Duration: {visa_type.duration or 'Varies'}",
+            f"Path to PR: {visa_type.path_to_pr or 'Unknown'}"
         ]
         return "\n".join(parts)
     
-    def _format_country_overview(self, country: str, data: Dict) -> str:
+    def _format_country_overview(self, country: str, data: Country) -> str:
         """Format country overview as searchable document"""
         parts = [
             f"Country: {country.title()}",
-            f"Immigration Friendliness: {data.get('immigration_friendliness', 'Unknown')}/10",
-            f"Fintech Readiness: {data.get('fintech_readiness', 'Unknown')}/10",
-            f"Official Language: {data.get('language', 'Unknown')}",
-            f"Skill Demand Areas: {', '.join(data.get('skill_demand', []))}",
-            f"Stepping Stone Potential: {data.get('stepping_stone_potential', 'Unknown')}",
-            f"Notes: {data.get('notes', '')}"
+            f"Immigration Friendliness: {data.immigration_friendliness}/10",
+            f"Fintech Readiness: {data.fintech_readiness}/10",
+            f"Official Language: {data.language or 'Unknown'}",
+            f"Skill Demand Areas: {', '.join(data.skill_demand)}",
+            f"Stepping Stone Potential: {data.stepping_stone_potential}",
+            f"Notes: {data.notes}"
         ]
         return "\n".join(parts)
     
@@ -211,3 +275,8 @@ class DocumentIndexer:
     def _generate_id(self, base: str) -> str:
         """Generate a unique document ID"""
         return hashlib.md5(base.encode()).hexdigest()[:16]
+
+
+if __name__ == "__main__":
+    # Full re-index (and partition build): python -m src.rag.indexer
+    DocumentIndexer().index_all()
@@ -4,6 +4,7 @@ RAG Retriever - Main interface for retrieving relevant context
 from typing import List, Dict, Optional
 
 from src.rag.vector_store import get_vector_store
+from src.services.country_registry import get_country_registry
 from src.core.logging import logger
 
 
@@ -70,14 +71,17 @@ class RAGRetriever:
         if visa_type:
             query += f" {visa_type}"
         
-        # Filter by country if metadata supports it
-        filter_dict = {"country": country.lower()} if country else None
+        # Documents are partitioned by the country's knowledge file key ("uk", "usa");
+        # a country outside the corpus has no documents
+        key = get_country_registry().key(country)
+        if not key:
+            return self._format_results([], "country_context")
         
         results = self.vector_store.query(
             query_text=query,
             top_k=top_k,
             namespace="policies",
-            filter_dict=filter_dict
+            countries=[key]
         )
         
         return self._format_results(results, "country_context")
@@ -101,10 +105,15 @@ class RAGRetriever:
         if intermediate_countries:
             query += f" via {', '.join(intermediate_countries)}"
         
+        # Fan out over the path's countries in the corpus (origins often are not)
+        registry = get_country_registry()
+        keys = [key for key in map(registry.key, countries) if key]
+        
         results = self.vector_store.query(
             query_text=query,
             top_k=top_k,
-            namespace="policies"
+            namespace="policies",
+            countries=keys or None
         )
         
         return self._format_results(results, "path_context")
@@ -118,11 +127,15 @@ class RAGRetriever:
         Retrieve financial threshold information.
         """
         query = f"{country} {visa_type} financial requirements savings income proof"
+        key = get_country_registry().key(country)
+        if not key:
+            return self._format_results([], "financial_context")
         
         results = self.vector_store.query(
             query_text=query,
             top_k=3,
-            namespace="financial"
+            namespace="financial",
+            countries=[key]
         )
         
         return self._format_results(results, "financial_context")
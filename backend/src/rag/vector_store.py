@@ -1,9 +1,22 @@
 """
 Vector Store - ChromaDB integration for document storage and retrieval
 Free, local vector database - no API keys needed!
+
+Country-tagged namespaces ("policies", "financial") are partitioned: every
+document is stored in the namespace's global collection and again in a
+small per-country collection ("policies__canada"). Country-scoped queries
+search only the matching partitions, so their cost tracks the size of one
+country's documents instead of the whole corpus.
+
+Partitions are built by an explicit index step (``rebuild_partitions``,
+run by ``DocumentIndexer.index_all``); until a namespace has them, writes
+go to the global collection only and country queries use a ``where``
+filter on it.
 """
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Optional
 import os
+import re
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
@@ -12,6 +25,17 @@ from src.core.config import settings
 from src.core.logging import logger
 from src.rag.embeddings import get_embedding_generator
 
+# Namespaces whose documents carry a ``country`` metadata key
+PARTITIONED_NAMESPACES = ("policies", "financial")
+PARTITION_SEPARATOR = "__"
+PARTITION_COPY_BATCH = 1000
+
+
+def partition_name(namespace: str, country: str) -> str:
+    """Collection name of a country partition ("policies", "uk" → "policies__uk")"""
+    slug = re.sub(r"[^a-z0-9]+", "-", country.lower()).strip("-")
+    return f"{namespace}{PARTITION_SEPARATOR}{slug}"
+
 
 class VectorStore:
     """
@@ -37,6 +61,11 @@ class VectorStore:
         self.collections = {}
         self._ensure_collections_exist()
         
+        # namespace → country key → partition collection
+        self.partitions: Dict[str, Dict] = {}
+        if settings.VECTOR_PARTITION_BY_COUNTRY:
+            self._load_partitions()
+        
         logger.info(f"VectorStore (ChromaDB) initialized at: {persist_dir}")
     
     def _ensure_collections_exist(self):
@@ -50,6 +79,103 @@ class VectorStore:
             )
             logger.info(f"Collection '{name}' ready")
     
+    def _load_partitions(self):
+        """Pick up the country partitions built by a previous index run"""
+        for collection in self.client.list_collections():
+            metadata = collection.metadata or {}
+            namespace = metadata.get("partition_of")
+            if namespace in PARTITIONED_NAMESPACES and metadata.get("country"):
+                self.partitions.setdefault(namespace, {})[metadata["country"]] = collection
+        
+        for namespace in PARTITIONED_NAMESPACES:
+            if self.partitions.get(namespace):
+                logger.info(f"Collection '{namespace}' has {len(self.partitions[namespace])} country partitions")
+            elif self.collections[namespace].count():
+                logger.warning(f"Collection '{namespace}' is not partitioned yet; re-index to build its partitions")
+    
+    def _is_partitioned(self, namespace: str) -> bool:
+        """Whether the namespace's partitions have been built (and are kept in sync)"""
+        return (
+            settings.VECTOR_PARTITION_BY_COUNTRY
+            and namespace in PARTITIONED_NAMESPACES
+            and bool(self.partitions.get(namespace))
+        )
+    
+    def _partition(self, namespace: str, country: str):
+        """The country's partition collection, created on first use"""
+        partitions = self.partitions.setdefault(namespace, {})
+        if country not in partitions:
+            partitions[country] = self.client.get_or_create_collection(
+                name=partition_name(namespace, country),
+                metadata={"hnsw:space": "cosine", "partition_of": namespace, "country": country}
+            )
+        return partitions[country]
+    
+    def _countries_of(self, collection, ids: List[str]) -> Dict[str, str]:
+        """Stored country key of each (existing, tagged) document ID"""
+        existing = collection.get(ids=ids, include=["metadatas"])
+        return {
+            doc_id: metadata["country"]
+            for doc_id, metadata in zip(existing["ids"], existing["metadatas"] or [])
+            if metadata and metadata.get("country")
+        }
+    
+    def _upsert_partitions(
+        self,
+        namespace: str,
+        ids: List[str],
+        embeddings: List,
+        documents_text: List[str],
+        metadatas: List[Dict],
+        previous: Dict[str, str]
+    ):
+        """Mirror upserted documents into their country partitions"""
+        moved: Dict[str, List[str]] = {}
+        grouped: Dict[str, List[int]] = {}
+        for i, (doc_id, metadata) in enumerate(zip(ids, metadatas)):
+            country = metadata.get("country")
+            if previous.get(doc_id) and previous[doc_id] != country:
+                moved.setdefault(previous[doc_id], []).append(doc_id)
+            if country:
+                grouped.setdefault(country, []).append(i)
+        
+        for country, stale_ids in moved.items():
+            if country in self.partitions.get(namespace, {}):
+                self.partitions[namespace][country].delete(ids=stale_ids)
+        for country, rows in grouped.items():
+            self._partition(namespace, country).upsert(
+                ids=[ids[i] for i in rows],
+                embeddings=[embeddings[i] for i in rows],
+                documents=[documents_text[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows]
+            )
+    
+    def rebuild_partitions(self, namespace: str) -> int:
+        """
+        Re-create a namespace's country partitions from its global collection,
+        reusing the stored embeddings. Returns the number of documents copied.
+        """
+        for country in list(self.partitions.get(namespace, {})):
+            self.client.delete_collection(partition_name(namespace, country))
+        self.partitions[namespace] = {}
+        
+        collection = self.collections[namespace]
+        copied = 0
+        for offset in range(0, collection.count(), PARTITION_COPY_BATCH):
+            batch = collection.get(
+                limit=PARTITION_COPY_BATCH,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"]
+            )
+            metadatas = [metadata or {} for metadata in batch["metadatas"]]
+            self._upsert_partitions(
+                namespace, batch["ids"], list(batch["embeddings"]), batch["documents"], metadatas, {}
+            )
+            copied += sum(1 for metadata in metadatas if metadata.get("country"))
+        
+        logger.info(f"Partitioned {copied} documents of '{namespace}' into {len(self.partitions[namespace])} countries")
+        return copied
+    
     def upsert_documents(
         self, 
         documents: List[Dict],
@@ -84,6 +210,9 @@ class VectorStore:
             documents_text.append(doc['text'][:10000])  # ChromaDB has larger limits
             metadatas.append(doc.get('metadata', {}))
         
+        partitioned = self._is_partitioned(namespace) and bool(ids)
+        previous = self._countries_of(collection, ids) if partitioned else {}
+        
         # Upsert to collection
         collection.upsert(
             ids=ids,
@@ -91,6 +220,8 @@ class VectorStore:
             documents=documents_text,
             metadatas=metadatas
         )
+        if partitioned:
+            self._upsert_partitions(namespace, ids, embeddings, documents_text, metadatas, previous)
         
         logger.info(f"Upserted {len(documents)} documents to collection '{namespace}'")
         return len(documents)
@@ -100,7 +231,8 @@ class VectorStore:
         query_text: str,
         top_k: int = 5,
         namespace: str = "default",
-        filter_dict: Optional[Dict] = None
+        filter_dict: Optional[Dict] = None,
+        countries: Optional[Iterable[str]] = None
     ) -> List[Dict]:
         """
         Query the vector store for similar documents.
@@ -110,6 +242,9 @@ class VectorStore:
             top_k: Number of results to return
             namespace: Collection to search in
             filter_dict: Optional metadata filters
+            countries: Optional country keys ("uk", "canada") to restrict the
+                search to; each country's partition is searched and the
+                results merged by score
             
         Returns:
             List of matching documents with scores
@@ -118,14 +253,51 @@ class VectorStore:
             logger.warning(f"Collection '{namespace}' not found, returning empty results")
             return []
         
-        collection = self.collections[namespace]
-        
         # Generate query embedding
         query_embedding = self.embedding_generator.embed_query(query_text)
         
-        # Build where filter if provided
-        where = filter_dict if filter_dict else None
+        targets = list(dict.fromkeys(countries or []))
+        if not targets:
+            return self._search(self.collections[namespace], query_embedding, top_k, filter_dict)
+        if len(targets) == 1:
+            return self._search_country(namespace, targets[0], query_embedding, top_k, filter_dict)
         
+        # Fan out over the partitions, keep the best top_k overall
+        pool = _get_fanout_pool()
+        per_country = pool.map(
+            lambda country: self._search_country(namespace, country, query_embedding, top_k, filter_dict),
+            targets
+        )
+        merged = [result for results in per_country for result in results]
+        merged.sort(key=lambda result: result['score'], reverse=True)
+        return merged[:top_k]
+    
+    def _search_country(
+        self,
+        namespace: str,
+        country: str,
+        query_embedding: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict]
+    ) -> List[Dict]:
+        """Search one country: its partition, or the filtered global collection when unpartitioned"""
+        if self._is_partitioned(namespace):
+            partition = self.partitions[namespace].get(country)
+            return self._search(partition, query_embedding, top_k, filter_dict) if partition else []
+        
+        where = {"country": country}
+        if filter_dict:
+            where = {"$and": [where, filter_dict]}
+        return self._search(self.collections[namespace], query_embedding, top_k, where)
+    
+    def _search(
+        self,
+        collection,
+        query_embedding: List[float],
+        top_k: int,
+        where: Optional[Dict]
+    ) -> List[Dict]:
+        """Nearest documents of one collection as {id, text, metadata, score}"""
         try:
             count = collection.count()
             if count == 0:
@@ -134,7 +306,7 @@ class VectorStore:
             results = collection.query(
                 query_embeddings=[query_embedding],
                 n_results=min(top_k, count),
-                where=where,
+                where=where or None,
                 include=["documents", "metadatas", "distances"]
             )
             
@@ -159,8 +331,29 @@ class VectorStore:
             logger.error(f"Query failed: {e}")
             return []
     
+    def delete_documents(self, ids: List[str], namespace: str = "default") -> int:
+        """Delete documents by ID from a collection"""
+        if not ids or namespace not in self.collections:
+            return 0
+        
+        collection = self.collections[namespace]
+        if self._is_partitioned(namespace):
+            by_country: Dict[str, List[str]] = {}
+            for doc_id, country in self._countries_of(collection, ids).items():
+                by_country.setdefault(country, []).append(doc_id)
+            for country, country_ids in by_country.items():
+                if country in self.partitions.get(namespace, {}):
+                    self.partitions[namespace][country].delete(ids=country_ids)
+        
+        collection.delete(ids=ids)
+        logger.info(f"Deleted {len(ids)} documents from collection '{namespace}'")
+        return len(ids)
+    
     def delete_namespace(self, namespace: str):
-        """Delete a collection"""
+        """Delete a collection (and its country partitions)"""
+        if self._is_partitioned(namespace):
+            for country in list(self.partitions.pop(namespace, {})):
+                self.delete_namespace(partition_name(namespace, country))
         try:
             self.client.delete_collection(namespace)
             if namespace in self.collections:
@@ -174,9 +367,28 @@ class VectorStore:
         stats = {}
         for name, collection in self.collections.items():
             stats[name] = {"count": collection.count()}
+        for name, partitions in self.partitions.items():
+            if name in stats:
+                stats[name]["partitions"] = {
+                    country: partition.count() for country, partition in sorted(partitions.items())
+                }
         return stats
 
 
+# Shared pool for multi-country fan-out queries
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_fanout_pool() -> ThreadPoolExecutor:
+    global _fanout_pool
+    if _fanout_pool is None:
+        _fanout_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.VECTOR_FANOUT_WORKERS),
+            thread_name_prefix="vector-fanout"
+        )
+    return _fanout_pool
+
+
 # Singleton instance
 _vector_store: Optional[VectorStore] = None
 
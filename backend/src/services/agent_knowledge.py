@@ -0,0 +1,538 @@
+"""
+Agent Knowledge - In-memory indexes behind the CrewAI agent tools
+
+Built once per knowledge snapshot from ``data/countries/*.json``,
+``skill_demand.json``, ``financial_thresholds.json``, ``visa_types.json`` and
+the policy documents, so a tool call is a few dictionary lookups instead of
+an LLM iteration spent re-deriving the same facts. Policy excerpts come from
+the vector store when the RAG stack is installed, otherwise from a keyword
+index over the policy sections.
+
+Every query returns a small JSON-able dict; the tools serialize it compactly.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.services.country_registry import get_country_registry
+from src.services.knowledge_model import Country, VisaType
+from src.services.knowledge_snapshot import KnowledgeSnapshot, get_knowledge_snapshot
+from src.services.path_graph_service import get_path_graph
+from src.services.visa_normalizer import LOCAL_CURRENCY, SYMBOL_CURRENCY, fee_usd, processing_months
+from src.rag.citation_extractor import CitationExtractor
+from src.core.logging import logger
+
+# Degree keywords → skill_demand.json education_mapping level
+EDUCATION_KEYWORDS = [
+    ("phd", ("phd", "ph.d", "doctorate", "doctoral")),
+    ("masters", ("master", "msc", "m.sc", "mba", "m.tech", "mtech", "ms ", "ma ")),
+    ("bachelors", ("bachelor", "bsc", "b.sc", "btech", "b.tech", "b.e", "undergraduate", "degree")),
+    ("diploma", ("diploma", "associate", "certificate")),
+]
+
+# Words in a visa's type/name → visa_types.json category
+VISA_CATEGORY_WORDS = [
+    ("student_visa", {"student", "study", "f1"}),
+    ("digital_nomad_visa", {"nomad", "d7", "freelance", "remote"}),
+    ("entrepreneur_visa", {"startup", "entrepass", "entrepreneur", "innovator"}),
+    ("investor_visa", {"golden", "investor", "investment"}),
+    ("intracompany_transfer", {"l1", "intracompany", "transfer"}),
+    ("talent_visa", {"talent", "o1", "hsp", "highly", "potential", "tech"}),
+    ("skilled_immigration", {"express", "pnp", "independent", "nominated", "189", "190"}),
+    ("work_visa", set()),
+]
+
+DEMAND_RANK = {"Very High": 4, "High": 3, "Medium": 2, "Low": 1}
+
+POLICY_CHANGE_TERMS = ("change", "update", "new ", "recent", "reform", "2024", "2025", "2026", "increase", "cap")
+
+MAX_EXCERPT_CHARS = 400
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+class AgentKnowledgeBase:
+    """
+    Lookup indexes over one knowledge snapshot.
+    """
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self.version = snapshot.version
+        self.countries: Dict[str, Country] = snapshot.countries
+        reference = snapshot.reference
+        skill_demand = reference.get("skill_demand", {})
+        self.occupations: Dict[str, Dict] = skill_demand.get("in_demand_occupations", {})
+        self.assessment_bodies: Dict[str, Dict] = skill_demand.get("skill_assessment_bodies", {})
+        self.education_mapping: Dict[str, Dict] = skill_demand.get("education_mapping", {})
+        self.health_tiers: Dict[str, Dict] = snapshot.financial_thresholds.get("financial_health_scoring", {})
+        self.currency_rates: Dict[str, float] = snapshot.currency_rates
+        self.visa_categories: Dict[str, Dict] = reference.get("visa_types", {}).get("visa_categories", {})
+
+        self.registry = get_country_registry(snapshot)
+        self.occupation_aliases = self._index_occupation_aliases()
+        self.visa_index = self._index_visas()
+        self.policy_sections = self._index_policy_sections(snapshot.policies)
+
+        logger.info(
+            f"Agent knowledge indexed: {len(self.countries)} countries, "
+            f"{len(self.occupation_aliases)} occupation aliases, "
+            f"{sum(len(v) for v in self.visa_index.values())} visas, "
+            f"{len(self.policy_sections)} policy sections"
+        )
+
+    # ------------------------------------------------------------------
+    # Index construction
+    # ------------------------------------------------------------------
+
+    def _index_occupation_aliases(self) -> Dict[str, str]:
+        """Occupation key, title and aliases (lowercase) → occupation key"""
+        aliases = {}
+        for key, occupation in self.occupations.items():
+            for alias in [key.replace("_", " "), occupation.get("title", "")] + occupation.get("aliases", []):
+                if alias:
+                    aliases[alias.lower()] = key
+        return aliases
+
+    def _index_visas(self) -> Dict[str, List[Tuple[set, VisaType]]]:
+        """Country → [(words of type and name, visa)]"""
+        return {
+            key: [
+                (set(_words(visa.type.replace("_", " ") + " " + visa.name)), visa)
+                for visa in data.visa_types
+            ]
+            for key, data in self.countries.items()
+        }
+
+    def _index_policy_sections(self, policies: Dict[str, str]) -> List[Dict]:
+        """Split policy markdown into (country, heading, text) sections"""
+        sections = []
+        for name, text in policies.items():
+            country = self.registry.key(name.split("_")[0])
+            heading = name.replace("_", " ").title()
+            body: List[str] = []
+            for line in text.splitlines() + ["# end"]:
+                if line.startswith("#"):
+                    if body and "".join(body).strip():
+                        sections.append({
+                            "country": country,
+                            "source": name,
+                            "heading": heading,
+                            "text": "\n".join(body).strip(),
+                        })
+                    heading, body = line.lstrip("# ").strip(), []
+                else:
+                    body.append(line)
+        return sections
+
+    # ------------------------------------------------------------------
+    # Resolution helpers
+    # ------------------------------------------------------------------
+
+    def resolve_country(self, text: str) -> Optional[str]:
+        """Country file stem for a name, ISO code or stem (also found inside longer text)"""
+        record = self.registry.resolve(text)
+        if record is not None:
+            return record.key
+        found = self.countries_in(text)
+        return found[0] if found else None
+
+    def countries_in(self, text: str) -> List[str]:
+        """Countries in the knowledge base mentioned in free text, in order of first mention"""
+        return [record.key for record in self.registry.find_in_text(text) if record.key]
+
+    def match_occupations(self, text: str) -> List[str]:
+        """Occupations whose title or aliases appear in free text"""
+        lowered = (text or "").lower()
+        words = set(_words(lowered))
+        matches = []
+        for alias, key in self.occupation_aliases.items():
+            alias_words = _words(alias)
+            if alias in lowered or (alias_words and set(alias_words) <= words):
+                if key not in matches:
+                    matches.append(key)
+        return matches
+
+    def find_visas(self, country: str, visa_type: str = "") -> List[VisaType]:
+        """Visas of a country best matching a type or name, all of them if nothing matches"""
+        entries = self.visa_index.get(country, [])
+        wanted = set(_words((visa_type or "").replace("_", " "))) - {"visa"}
+        if not wanted:
+            return [visa for _, visa in entries]
+        scored = [(len(words & wanted), visa) for words, visa in entries]
+        best = max((score for score, _ in scored), default=0)
+        if best == 0:
+            return [visa for _, visa in entries]
+        return [visa for score, visa in scored if score == best]
+
+    def visa_category(self, visa: VisaType) -> Dict:
+        """The visa_types.json category a visa belongs to (work visa by default)"""
+        words = set(_words(visa.type.replace("_", " ") + " " + visa.name))
+        name = next(name for name, markers in VISA_CATEGORY_WORDS if not markers or markers & words)
+        category = self.visa_categories.get(name, {})
+        return {"category": name, "typicalDuration": category.get("typical_duration"), "pathToPr": category.get("path_to_pr")}
+
+    def to_usd(self, text: str) -> Optional[float]:
+        """First amount in a money string, converted to USD"""
+        match = re.search(r"(\d[\d,]*(?:\.\d+)?)\s*(k|m)?\b", text or "", re.IGNORECASE)
+        if not match:
+            return None
+        amount = float(match.group(1).replace(",", ""))
+        amount *= {"k": 1_000, "m": 1_000_000}.get((match.group(2) or "").lower(), 1)
+
+        upper = text.upper()
+        currency = next((iso for iso in self.currency_rates if iso in upper), None)
+        if currency is None:
+            currency = next((iso for symbol, iso in SYMBOL_CURRENCY.items() if symbol in text), None)
+        if currency is None:
+            # "$" and bare amounts: the local dollar of a country named alongside, else USD
+            key = self.resolve_country(text) if "$" in text else None
+            currency = LOCAL_CURRENCY.get(self.countries[key].code, "USD") if key else "USD"
+        return round(amount * self.currency_rates.get(currency, 1.0), 2)
+
+    def _countries_for_region(self, region: str) -> List[str]:
+        """Countries for a country name/code, a region ("Europe") or everything"""
+        lowered = (region or "").strip().lower()
+        if not lowered or lowered in ("global", "all", "any", "worldwide"):
+            return list(self.countries)
+        countries = self.countries_in(region)
+        if countries:
+            return countries
+        in_region = [
+            key for key, data in self.countries.items()
+            if lowered in data.region.lower()
+            or any(lowered in label.lower() for label in data.unlocks_regions)
+        ]
+        return in_region or list(self.countries)
+
+    # ------------------------------------------------------------------
+    # Tool queries
+    # ------------------------------------------------------------------
+
+    def education_recognition(self, education: str) -> Dict:
+        lowered = f" {(education or '').lower()} "
+        level = next(
+            (level for level, keywords in EDUCATION_KEYWORDS if any(k in lowered for k in keywords)),
+            None
+        )
+        mapping = self.education_mapping.get(level, {})
+        return {
+            "level": level or "unknown",
+            "points": {k: v for k, v in mapping.items() if k.endswith("_points")},
+            "advantage": mapping.get("general_advantage"),
+            "credentialAssessment": {
+                country: bodies.get("general") or next(iter(bodies.values()), None)
+                for country, bodies in self.assessment_bodies.items()
+            }
+        }
+
+    def skill_demand(self, skills: str, target_region: str) -> Dict:
+        countries = self._countries_for_region(target_region)
+        occupations = self.match_occupations(skills)
+        skill_words = set(_words(skills))
+
+        by_occupation = {}
+        for key in occupations:
+            occupation = self.occupations[key]
+            demand = occupation.get("demand_by_country", {})
+            by_occupation[occupation.get("title", key)] = {
+                "globalDemand": occupation.get("global_demand"),
+                "byCountry": {c: demand[c] for c in countries if c in demand}
+            }
+
+        listed = {
+            key: [d for d in self.countries[key].skill_demand if set(_words(d)) & skill_words]
+            for key in countries
+        }
+        return {
+            "countries": countries,
+            "occupations": by_occupation,
+            "countryDemandLists": {k: v for k, v in listed.items() if v},
+            "matched": bool(by_occupation) or any(listed.values())
+        }
+
+    def visa_requirements(self, country: str, visa_type: str) -> Dict:
+        key = self.resolve_country(country)
+        if key is None:
+            return {"error": f"Unknown country '{country}'", "knownCountries": sorted(self.countries)}
+        visas = self.find_visas(key, visa_type)
+        return {
+            "country": self.countries[key].name,
+            "visas": [
+                {
+                    "type": visa.type,
+                    "name": visa.name,
+                    "requirements": list(visa.requirements),
+                    "processingTime": visa.processing_time,
+                    "processingMonths": processing_months(visa),
+                    "applicationFee": visa.application_fee,
+                    "applicationFeeUsd": fee_usd(visa),
+                    "financialRequirement": visa.financial_requirement,
+                    "pathToPr": visa.path_to_pr,
+                    "familyAllowed": visa.family_allowed,
+                    "category": self.visa_category(visa),
+                }
+                for visa in visas
+            ],
+            "thresholds": self.countries[key].thresholds_dict(),
+            "policyExcerpts": self.policy_excerpts(key, f"{visa_type} requirements", limit=2)
+        }
+
+    def stepping_stones(self, origin: str, destination: str) -> Dict:
+        key = self.resolve_country(destination)
+        if key is None:
+            return {"error": f"Unknown destination '{destination}'", "knownCountries": sorted(self.countries)}
+        graph = get_path_graph()
+        code = self.countries[key].code
+        origin_code = self.registry.code(origin) or (origin or "").upper()
+
+        routes = graph.candidate_routes(code, origin_code)[:3]
+        return {
+            "destination": self.countries[key].name,
+            "steppingStones": [s for s in graph.get_stepping_stones(code, limit=4) if s["countryCode"] != origin_code][:3],
+            "routes": [" → ".join(graph.nodes[c].name for c in route) for route in routes]
+        }
+
+    def country_compatibility(self, profile_summary: str, country: str) -> Dict:
+        key = self.resolve_country(country)
+        if key is None:
+            return {"error": f"Unknown country '{country}'", "knownCountries": sorted(self.countries)}
+        data = self.countries[key]
+
+        demand = []
+        for occupation in self.match_occupations(profile_summary):
+            entry = self.occupations[occupation].get("demand_by_country", {}).get(key)
+            if entry:
+                demand.append({"occupation": self.occupations[occupation].get("title"), **entry})
+        best_demand = max((DEMAND_RANK.get(d.get("demand"), 0) for d in demand), default=0)
+        friendliness = data.immigration_friendliness
+        fit = "strong" if best_demand >= 3 and friendliness >= 7 else "moderate" if best_demand >= 2 or friendliness >= 7 else "weak"
+
+        return {
+            "country": data.name,
+            "fit": fit,
+            "skillDemand": demand,
+            "education": self.education_recognition(profile_summary)["level"],
+            "immigrationFriendliness": friendliness,
+            "processingSpeed": data.processing_speed,
+            "language": data.language,
+            "costOfLiving": data.cost_of_living,
+            "visaOptions": [v.name for v in data.visa_types],
+            "notes": data.notes
+        }
+
+    def rejection_patterns(self, country: str, visa_type: str) -> Dict:
+        key = self.resolve_country(country)
+        if key is None:
+            return {"error": f"Unknown country '{country}'", "knownCountries": sorted(self.countries)}
+        visas = self.find_visas(key, visa_type)
+        return {
+            "country": self.countries[key].name,
+            "visas": [
+                {
+                    "name": visa.name,
+                    "commonRejectionReasons": list(visa.common_rejection_reasons),
+                    "tips": list(visa.tips)
+                }
+                for visa in visas
+            ],
+            "policyExcerpts": self.policy_excerpts(key, f"{visa_type} common issues rejection", limit=2)
+        }
+
+    def financial_adequacy(self, required_amount: str, user_savings: str, user_income: str) -> Dict:
+        required = self.to_usd(required_amount)
+        source = None
+        if required is None:
+            # No figure given - look the requirement up from a "country visa" description
+            required, source = self._threshold_usd(required_amount)
+        savings = self.to_usd(user_savings) or 0.0
+        income = self.to_usd(user_income) or 0.0
+
+        if not required:
+            return {"error": "Could not determine the required amount", "savingsUsd": savings, "incomeUsd": income}
+
+        coverage = savings / required
+        tier = next(
+            (name for name, tier in sorted(self.health_tiers.items(), key=lambda t: -t[1].get("income_multiplier", 0))
+             if coverage >= tier.get("income_multiplier", 0)),
+            "at_risk"
+        )
+        return {
+            "requiredUsd": required,
+            "requirementSource": source,
+            "savingsUsd": savings,
+            "incomeUsd": income,
+            "coverageRatio": round(coverage, 2),
+            "gapUsd": round(max(0.0, required - savings), 2),
+            "monthsToCloseGap": round((required - savings) / (income * 0.2 / 12), 1) if savings < required and income else None,
+            "tier": tier,
+            "assessment": self.health_tiers.get(tier, {}).get("description")
+        }
+
+    def _threshold_usd(self, text: str) -> Tuple[Optional[float], Optional[str]]:
+        """Listed amount for the visa described in text ("canada express entry"), preferring totals"""
+        key = self.resolve_country(text)
+        if key is None or not self.countries[key].thresholds:
+            return None, None
+        wanted = set(_words(text))
+        visas = self.countries[key].thresholds
+        visa_key = max(visas, key=lambda v: len(set(_words(v.replace("_", " "))) & wanted))
+        amounts = list(visas[visa_key].amounts.items())
+        if not amounts:
+            return None, None
+        # e.g. job seeker "total_6_months" rather than "monthly_required"; else the base (single) amount
+        name, money = next(((n, m) for n, m in amounts if "total" in n), amounts[0])
+        return round(money.usd(self.currency_rates), 2), f"{key}.{visa_key}.{name}"
+
+    def policy_changes(self, country: str) -> Dict:
+        key = self.resolve_country(country)
+        if key is None:
+            return {"error": f"Unknown country '{country}'", "knownCountries": sorted(self.countries)}
+        sections = [
+            s for s in self.policy_sections
+            if s["country"] == key and any(term in (s["heading"] + " " + s["text"]).lower() for term in POLICY_CHANGE_TERMS)
+        ]
+        return {
+            "country": self.countries[key].name,
+            "notes": self.countries[key].notes,
+            "recentPolicy": [
+                {"source": s["source"], "section": s["heading"], "excerpt": s["text"][:MAX_EXCERPT_CHARS]}
+                for s in sections[:3]
+            ],
+            "policyExcerpts": self.policy_excerpts(key, "recent policy changes updates", limit=2),
+            "disclaimer": "Knowledge base snapshot; verify against official sources for changes after it was compiled"
+        }
+
+    def document_checklist(self, country: str, visa_type: str) -> Dict:
+        key = self.resolve_country(country)
+        if key is None:
+            return {"error": f"Unknown country '{country}'", "knownCountries": sorted(self.countries)}
+        visa = self.find_visas(key, visa_type)[0]
+        bodies = self.assessment_bodies.get(key, {})
+
+        checklist = [{"item": "Valid passport", "priority": "high"}]
+        checklist += [{"item": requirement, "priority": "high"} for requirement in visa.requirements]
+        if visa.financial_requirement:
+            checklist.append({"item": f"Proof of funds: {visa.financial_requirement}", "priority": "high"})
+        if bodies:
+            checklist.append({"item": f"Credential assessment ({', '.join(bodies.values())})", "priority": "medium"})
+        if visa.family_allowed:
+            checklist.append({"item": "Marriage/birth certificates for accompanying family", "priority": "medium"})
+        checklist.append({"item": f"Application fee: {visa.application_fee or 'see official site'}", "priority": "low"})
+        return {"country": self.countries[key].name, "visa": visa.name, "checklist": checklist}
+
+    def action_timeline(self, path_details: str, user_situation: str) -> Dict:
+        countries = self.countries_in(path_details) or self.countries_in(user_situation)
+        if not countries:
+            return {"error": "No known country found in the path details", "knownCountries": sorted(self.countries)}
+
+        steps, month = [], 0.0
+        for key in countries:
+            visa = self.find_visas(key, path_details)[0]
+            name = self.countries[key].name
+            requirements = " ".join(visa.requirements).lower()
+
+            prep = 1.0
+            if any(term in requirements for term in ("ielts", "language", "toefl", "jlpt")):
+                prep += 1
+            if any(term in requirements for term in ("assessment", "eca", "recognition")):
+                prep += 1
+            steps.append({
+                "startMonth": round(month),
+                "endMonth": round(month + prep),
+                "action": f"Prepare {visa.name} application",
+                "details": list(visa.requirements[:4])
+            })
+            month += prep
+
+            processing = processing_months(visa)["max"]
+            steps.append({
+                "startMonth": round(month),
+                "endMonth": round(month + processing),
+                "action": f"Apply and await decision ({visa.processing_time or 'varies'})",
+                "details": [f"Fee: {visa.application_fee or 'see official site'}"]
+            })
+            month += processing
+
+        return {"countries": [self.countries[k].name for k in countries], "totalMonths": round(month), "steps": steps}
+
+    def format_citations(self, raw_citations: str) -> Dict:
+        try:
+            parsed = json.loads(raw_citations)
+        except (TypeError, ValueError):
+            parsed = None
+        if isinstance(parsed, list) and all(isinstance(c, dict) for c in parsed):
+            return {"citations": CitationExtractor.format_for_ui(parsed)}
+
+        citations = []
+        for i, line in enumerate(l.strip(" -*\t") for l in (raw_citations or "").splitlines()):
+            if not line:
+                continue
+            country = self.resolve_country(line)
+            source = next((s["source"] for s in self.policy_sections if s["source"].replace("_", " ") in line.lower()), None)
+            citations.append({
+                "id": f"cite_{i + 1}",
+                "title": line,
+                "source": "policy_document" if source else "country_data",
+                "country": country or "General",
+                "snippet": "",
+                "relevance_score": 0.8 if source or country else 0.5
+            })
+        return {"citations": CitationExtractor.format_for_ui(citations)}
+
+    # ------------------------------------------------------------------
+    # Policy excerpts
+    # ------------------------------------------------------------------
+
+    def policy_excerpts(self, country: str, query: str, limit: int = 2) -> List[Dict]:
+        """Vector-store matches when available, else keyword-ranked policy sections"""
+        results = _vector_excerpts(country, query, limit)
+        if results is not None:
+            return results
+
+        wanted = set(_words(query))
+        ranked = sorted(
+            (s for s in self.policy_sections if s["country"] == country),
+            key=lambda s: -len(wanted & set(_words(s["heading"] + " " + s["text"])))
+        )
+        return [
+            {"source": s["source"], "section": s["heading"], "excerpt": s["text"][:MAX_EXCERPT_CHARS]}
+            for s in ranked[:limit]
+        ]
+
+
+# The RAG stack (sentence-transformers, chromadb) is optional
+_retriever_unavailable = False
+
+def _vector_excerpts(country: str, query: str, limit: int) -> Optional[List[Dict]]:
+    global _retriever_unavailable
+    if _retriever_unavailable:
+        return None
+    try:
+        from src.rag.retriever import get_retriever
+        context = get_retriever().retrieve_for_country(country, visa_type=query, top_k=limit)
+    except ImportError as e:
+        logger.info(f"Vector store unavailable for agent tools ({e}); using keyword policy index")
+        _retriever_unavailable = True
+        return None
+    except Exception as e:
+        logger.warning(f"Vector query failed for agent tools: {e}")
+        return None
+    return [
+        {"source": c.get("source"), "section": c.get("title"), "excerpt": (c.get("snippet") or "")[:MAX_EXCERPT_CHARS]}
+        for c in context.get("citations", [])
+    ] or None
+
+
+# Singleton instance
+_agent_knowledge: Optional[AgentKnowledgeBase] = None
+
+def get_agent_knowledge() -> AgentKnowledgeBase:
+    """Get or build the agent knowledge base for the current snapshot"""
+    global _agent_knowledge
+    if _agent_knowledge is None:
+        _agent_knowledge = AgentKnowledgeBase(get_knowledge_snapshot())
+    return _agent_knowledge
@@ -6,7 +6,11 @@ import httpx
 from typing import Dict, List, Optional
 from src.core.config import settings
 from src.core.logging import logger
+from src.services.country_registry import get_country_registry
 from src.services.document_loader import get_document_loader
+from src.services.rate_limiter import get_llm_governor
+from src.services.llm_resilience import get_llm_resilience
+from src.services.model_router import get_model_router
 
 # Try to import RAG retriever
 try:
@@ -26,7 +30,7 @@ class ChatService:
     def __init__(self):
         self.api_key = settings.GROQ_API_KEY
         self.base_url = settings.GROQ_BASE_URL
-        self.model = settings.GROQ_MODEL
+        self.model = get_model_router().primary("chat")
         
         # Try Gemini as fallback if configured
         self.gemini_api_key = getattr(settings, 'GEMINI_API_KEY', None)
@@ -39,9 +43,6 @@ class ChatService:
             "Content-Type": "application/json"
         }
         
-        # Initialize document loader for context
-        self.doc_loader = get_document_loader()
-        
         # Initialize RAG retriever if available
         self.retriever = get_retriever() if RAG_AVAILABLE else None
         
@@ -50,30 +51,46 @@ class ChatService:
         
         logger.info(f"ChatService initialized with model: {self.model}")
     
+    @property
+    def doc_loader(self):
+        """Current document loader (replaced when knowledge files are hot-reloaded)"""
+        return get_document_loader()
+    
     def _call_groq_api(
         self, 
         messages: List[Dict], 
         max_tokens: int = 2000, 
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        route: str = "chat"
     ) -> str:
-        """Make a direct HTTP call to Groq API."""
+        """Make a direct HTTP call to Groq API, on the model routed for ``route``."""
         payload = {
-            "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
         
-        try:
+        def send() -> Dict:
+            governor = get_llm_governor()
+            estimated_tokens = governor.acquire_for_messages(messages, max_tokens)
+            result = get_model_router().send(route, post)
+            governor.record_usage(estimated_tokens, result.get("usage", {}).get("total_tokens"))
+            return result
+        
+        def post(model: str) -> Dict:
             with httpx.Client(timeout=60.0) as client:
                 response = client.post(
                     f"{self.base_url}/chat/completions",
                     headers=self.headers,
-                    json=payload
+                    json={**payload, "model": model}
                 )
                 response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+                return response.json()
+        
+        try:
+            # Chat replies are short and interactive: hedge slow calls
+            result = get_llm_resilience().call(send, operation="chat", hedge=True)
+            return result["choices"][0]["message"]["content"]
         except Exception as e:
             logger.error(f"Groq API call failed: {e}")
             raise
@@ -114,36 +131,12 @@ class ChatService:
         
         # Fallback to document loader if RAG not available or failed
         if not context_parts:
-            # Get all policy documents as context
-            all_policies = self.doc_loader.get_all_policies()
-            
-            # Simple keyword matching to find relevant sections
-            query_lower = query.lower()
-            for policy_name, policy_content in all_policies.items():
-                if any(keyword in query_lower for keyword in ['h1b', 'h-1b', 'usa', 'us', 'america', 'united states']):
-                    if 'usa' in policy_name.lower() or 'h1b' in policy_name.lower():
-                        context_parts.append(f"## USA H-1B Policy\n{policy_content[:3000]}")
-                        break
-                        
-                if any(keyword in query_lower for keyword in ['express entry', 'canada', 'canadian', 'ca']):
-                    if 'canada' in policy_name.lower():
-                        context_parts.append(f"## Canada Express Entry\n{policy_content[:3000]}")
-                        break
-                        
-                if any(keyword in query_lower for keyword in ['blue card', 'germany', 'german', 'de']):
-                    if 'germany' in policy_name.lower():
-                        context_parts.append(f"## Germany Blue Card\n{policy_content[:3000]}")
-                        break
-                        
-                if any(keyword in query_lower for keyword in ['uk', 'britain', 'british', 'england', 'skilled worker']):
-                    if 'uk' in policy_name.lower():
-                        context_parts.append(f"## UK Skilled Worker Visa\n{policy_content[:3000]}")
-                        break
-                        
-                if any(keyword in query_lower for keyword in ['australia', 'australian', 'au']):
-                    if 'australia' in policy_name.lower():
-                        context_parts.append(f"## Australia Skilled Migration\n{policy_content[:3000]}")
-                        break
+            # Policy documents of the countries mentioned in the query
+            for code in self._detect_countries(query) + list(countries or []):
+                for policy_name, policy_content in self.doc_loader.get_country_policies(code).items():
+                    context_parts.append(f"## {policy_name.replace('_', ' ').title()}\n{policy_content[:3000]}")
+                if context_parts:
+                    break
             
             # If still no context, add general stepping stone strategies
             if not context_parts and 'stepping_stone' in self.doc_loader._policy_cache:
@@ -156,27 +149,7 @@ class ChatService:
     
     def _detect_countries(self, text: str) -> List[str]:
         """Detect country mentions in text."""
-        country_keywords = {
-            "US": ["usa", "us", "america", "united states", "h1b", "h-1b"],
-            "CA": ["canada", "canadian", "express entry"],
-            "DE": ["germany", "german", "blue card"],
-            "GB": ["uk", "britain", "british", "england", "united kingdom"],
-            "AU": ["australia", "australian"],
-            "AE": ["uae", "dubai", "emirates"],
-            "SG": ["singapore"],
-            "NL": ["netherlands", "dutch", "holland"],
-            "PT": ["portugal", "portuguese"],
-            "JP": ["japan", "japanese"],
-        }
-        
-        text_lower = text.lower()
-        detected = []
-        
-        for code, keywords in country_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                detected.append(code)
-        
-        return detected
+        return [record.iso2 for record in get_country_registry().find_in_text(text)]
     
     def get_system_prompt(self) -> str:
         """Get the system prompt for the chat assistant."""
@@ -0,0 +1,229 @@
+"""
+Country Registry - One canonical lookup for country codes, names and keys
+
+Routes, agents and services receive countries in every form: ISO codes
+from the frontend ("GB"), names from LLM output ("United Kingdom", "UK"),
+demonyms from the profile form ("Indian"), and file stems from the
+knowledge base ("uk"). The registry maps all of these (ISO2, ISO3, names,
+common aliases, demonyms, visa-programme names and the knowledge file
+stem) to one ``CountryRecord`` through a single precomputed dict, so every
+caller agrees on which country is meant.
+
+Demonyms double as language names ("English", "German"), so free-text
+detection (``find_in_text``) only matches country names, aliases and
+programme names; demonyms resolve only as whole identifiers ("Indian" in
+a nationality field).
+
+Countries in the knowledge snapshot carry their file ``key``; other
+countries (typical origins) resolve to a record with ``key=None``.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services.knowledge_model import Country
+from src.services.knowledge_snapshot import KnowledgeSnapshot, get_knowledge_snapshot
+
+
+# (ISO2, ISO3, name, aliases, demonyms)
+ISO_COUNTRIES: List[Tuple[str, str, str, Tuple[str, ...], Tuple[str, ...]]] = [
+    ("AE", "ARE", "United Arab Emirates", ("uae", "emirates", "dubai", "abu dhabi"), ("emirati",)),
+    ("AT", "AUT", "Austria", (), ("austrian",)),
+    ("AU", "AUS", "Australia", (), ("australian", "aussie")),
+    ("BD", "BGD", "Bangladesh", (), ("bangladeshi",)),
+    ("BE", "BEL", "Belgium", (), ("belgian",)),
+    ("BR", "BRA", "Brazil", ("brasil",), ("brazilian",)),
+    ("CA", "CAN", "Canada", (), ("canadian",)),
+    ("CH", "CHE", "Switzerland", (), ("swiss",)),
+    ("CN", "CHN", "China", ("prc",), ("chinese",)),
+    ("DE", "DEU", "Germany", ("deutschland",), ("german",)),
+    ("DK", "DNK", "Denmark", (), ("danish",)),
+    ("EG", "EGY", "Egypt", (), ("egyptian",)),
+    ("ES", "ESP", "Spain", (), ("spanish", "spaniard")),
+    ("FI", "FIN", "Finland", (), ("finnish",)),
+    ("FR", "FRA", "France", (), ("french",)),
+    ("GB", "GBR", "United Kingdom", ("uk", "britain", "great britain", "england", "scotland", "wales"),
+     ("british", "briton", "english", "scottish", "welsh")),
+    ("GH", "GHA", "Ghana", (), ("ghanaian",)),
+    ("ID", "IDN", "Indonesia", (), ("indonesian",)),
+    ("IE", "IRL", "Ireland", (), ("irish",)),
+    ("IN", "IND", "India", ("bharat",), ("indian",)),
+    ("IT", "ITA", "Italy", (), ("italian",)),
+    ("JP", "JPN", "Japan", ("nippon",), ("japanese",)),
+    ("KE", "KEN", "Kenya", (), ("kenyan",)),
+    ("KR", "KOR", "South Korea", ("korea", "republic of korea"), ("korean", "south korean")),
+    ("LK", "LKA", "Sri Lanka", (), ("sri lankan",)),
+    ("MX", "MEX", "Mexico", (), ("mexican",)),
+    ("MY", "MYS", "Malaysia", (), ("malaysian",)),
+    ("NG", "NGA", "Nigeria", (), ("nigerian",)),
+    ("NL", "NLD", "Netherlands", ("the netherlands", "holland"), ("dutch",)),
+    ("NO", "NOR", "Norway", (), ("norwegian",)),
+    ("NP", "NPL", "Nepal", (), ("nepali", "nepalese")),
+    ("NZ", "NZL", "New Zealand", (), ("new zealander",)),
+    ("PH", "PHL", "Philippines", ("the philippines",), ("filipino", "filipina", "philippine")),
+    ("PK", "PAK", "Pakistan", (), ("pakistani",)),
+    ("PL", "POL", "Poland", (), ("polish",)),
+    ("PT", "PRT", "Portugal", (), ("portuguese",)),
+    ("QA", "QAT", "Qatar", (), ("qatari",)),
+    ("RU", "RUS", "Russia", ("russian federation",), ("russian",)),
+    ("SA", "SAU", "Saudi Arabia", ("ksa",), ("saudi",)),
+    ("SE", "SWE", "Sweden", (), ("swedish", "swede")),
+    ("SG", "SGP", "Singapore", (), ("singaporean",)),
+    ("TR", "TUR", "Turkey", ("turkiye",), ("turkish",)),
+    ("UA", "UKR", "Ukraine", (), ("ukrainian",)),
+    ("US", "USA", "United States", ("usa", "america", "united states of america"), ("american",)),
+    ("VN", "VNM", "Vietnam", ("viet nam",), ("vietnamese",)),
+    ("ZA", "ZAF", "South Africa", (), ("south african",)),
+]
+
+# Visa programme names that identify a country in free text
+PROGRAM_ALIASES = {
+    "express entry": "CA",
+    "h1b": "US",
+    "h 1b": "US",
+    "green card": "US",
+    "blue card": "DE",
+}
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+
+
+def _normalize(text: str) -> str:
+    """Lookup form of a name: lowercase words, dots dropped ("U.S.A." → "usa")"""
+    return " ".join(_TOKEN.findall((text or "").replace(".", ""))).lower()
+
+
+class CountryRecord:
+    """A country's identifiers; ``key`` is its knowledge file stem, if any."""
+
+    __slots__ = ("iso2", "iso3", "name", "key", "demonyms")
+
+    def __init__(
+        self,
+        iso2: str,
+        iso3: Optional[str],
+        name: str,
+        key: Optional[str] = None,
+        demonyms: Tuple[str, ...] = ()
+    ):
+        self.iso2 = iso2
+        self.iso3 = iso3
+        self.name = name
+        self.key = key
+        self.demonyms = demonyms
+
+    def __repr__(self) -> str:
+        return f"<CountryRecord {self.iso2}>"
+
+
+class CountryRegistry:
+    """
+    Alias → CountryRecord lookup for the ISO table plus the countries of a
+    knowledge snapshot.
+    """
+
+    def __init__(self, countries: Dict[str, Country], version: str = ""):
+        self.version = version
+        self.records: Dict[str, CountryRecord] = {}
+        self._aliases: Dict[str, CountryRecord] = {}
+        # Aliases find_in_text matches: everything except demonyms
+        self._text_aliases: Dict[str, CountryRecord] = {}
+        # Bare ISO codes ("in", "can") are also English words; free text only trusts them uppercase
+        self._code_aliases = set()
+
+        corpus = {country.code: (stem, country) for stem, country in countries.items()}
+        for iso2, iso3, name, aliases, demonyms in ISO_COUNTRIES:
+            stem, country = corpus.pop(iso2, (None, None))
+            record = CountryRecord(iso2, iso3, country.name if country else name, stem, demonyms)
+            self._add(record, (name,) + aliases)
+        for stem, country in corpus.values():
+            self._add(CountryRecord(country.code, None, country.name, stem), ())
+        for alias, iso2 in PROGRAM_ALIASES.items():
+            self._aliases.setdefault(alias, self.records[iso2])
+            self._text_aliases.setdefault(alias, self.records[iso2])
+
+        self._max_words = max(len(alias.split()) for alias in self._text_aliases)
+
+    def _add(self, record: CountryRecord, names: Tuple[str, ...]):
+        self.records[record.iso2] = record
+        names += (record.name,) + ((record.key, record.key.replace("_", " ")) if record.key else ())
+        for name in names:
+            self._aliases[_normalize(name)] = record
+            self._text_aliases[_normalize(name)] = record
+        for demonym in record.demonyms:
+            self._aliases.setdefault(_normalize(demonym), record)
+        for code in (record.iso2, record.iso3):
+            if code:
+                alias = code.lower()
+                self._aliases.setdefault(alias, record)
+                if self._aliases[alias] is record and alias not in map(_normalize, names):
+                    self._text_aliases.setdefault(alias, record)
+                    self._code_aliases.add(alias)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, text: str) -> bool:
+        return self.resolve(text) is not None
+
+    def resolve(self, text: str) -> Optional[CountryRecord]:
+        """Record for an ISO2/ISO3 code, name, alias, demonym or file stem"""
+        if not text:
+            return None
+        record = self._aliases.get(text.strip().lower())
+        return record if record is not None else self._aliases.get(_normalize(text))
+
+    def code(self, text: str) -> Optional[str]:
+        """ISO2 code for any country identifier, None if unknown"""
+        record = self.resolve(text)
+        return record.iso2 if record else None
+
+    def key(self, text: str) -> Optional[str]:
+        """Knowledge file stem for any country identifier, None if not in the corpus"""
+        record = self.resolve(text)
+        return record.key if record else None
+
+    def name(self, text: str) -> str:
+        """Display name for any country identifier (the input itself if unknown)"""
+        record = self.resolve(text)
+        return record.name if record else text
+
+    def codes(self, texts: Iterable[str]) -> List[str]:
+        """ISO2 codes for several identifiers, in order, unknown ones dropped"""
+        codes = []
+        for text in texts or []:
+            code = self.code(text)
+            if code and code not in codes:
+                codes.append(code)
+        return codes
+
+    def find_in_text(self, text: str) -> List[CountryRecord]:
+        """Countries named in free text, in order of first mention (demonyms ignored)"""
+        tokens = _TOKEN.findall((text or "").replace(".", ""))
+        found: List[CountryRecord] = []
+        i = 0
+        while i < len(tokens):
+            for size in range(min(self._max_words, len(tokens) - i), 0, -1):
+                words = tokens[i:i + size]
+                alias = " ".join(words).lower()
+                record = self._text_aliases.get(alias)
+                if record is None or (alias in self._code_aliases and not words[0].isupper()):
+                    continue
+                if record not in found:
+                    found.append(record)
+                i += size - 1
+                break
+            i += 1
+        return found
+
+
+# Singleton instance
+_country_registry: Optional[CountryRegistry] = None
+
+
+def get_country_registry(snapshot: KnowledgeSnapshot = None) -> CountryRegistry:
+    """Get the registry for a snapshot (the current one by default), building it once per version"""
+    global _country_registry
+    snapshot = snapshot or get_knowledge_snapshot()
+    if _country_registry is None or _country_registry.version != snapshot.version:
+        _country_registry = CountryRegistry(snapshot.countries, snapshot.version)
+    return _country_registry
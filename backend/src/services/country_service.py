@@ -1,12 +1,13 @@
 """
 Country Service - Handles country data operations
 """
-import json
 from pathlib import Path
-from typing import Dict, List, Optional
-from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from src.core.constants import SUPPORTED_COUNTRIES
+from src.services.country_registry import get_country_registry
+from src.services.knowledge_model import Country, VisaType
+from src.services.knowledge_snapshot import KnowledgeSnapshot, build_snapshot, get_knowledge_snapshot
+from src.services.visa_catalog import VisaCatalog
 from src.core.logging import logger
 
 
@@ -15,66 +16,83 @@ class CountryService:
     Service for accessing and managing country immigration data.
     """
     
-    def __init__(self, data_dir: str = None):
-        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent.parent / "data"
-        self._countries_cache: Dict = {}
-        self._load_countries()
-    
-    def _load_countries(self):
-        """Load all country data from JSON files"""
-        countries_dir = self.data_dir / "countries"
-        
-        if not countries_dir.exists():
-            logger.warning(f"Countries directory not found: {countries_dir}")
-            return
+    def __init__(self, data_dir: str = None, snapshot: KnowledgeSnapshot = None):
+        # A custom data_dir compiles its own snapshot; the default shares the process-wide one
+        if snapshot is None:
+            snapshot = build_snapshot(Path(data_dir)) if data_dir else get_knowledge_snapshot()
+        self.snapshot = snapshot
+        self._countries_cache: Dict[str, Country] = self.snapshot.countries
+        self.registry = get_country_registry(self.snapshot)
+        self._stepping_stone_index: Dict[str, List[Dict]] = {}
+        self._currency_rates: Dict[str, float] = dict(self.snapshot.currency_rates)
+        self._build_stepping_stone_index()
+        self.visa_catalog = VisaCatalog(self._countries_cache)
         
-        for json_file in countries_dir.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    country_data = json.load(f)
-                    country_code = json_file.stem.lower()
-                    self._countries_cache[country_code] = country_data
-                    logger.debug(f"Loaded country data: {country_code}")
-            except Exception as e:
-                logger.error(f"Error loading {json_file}: {e}")
+        logger.info(f"Loaded {len(self._countries_cache)} countries, {len(self.visa_catalog)} visa types")
+    
+    def _build_stepping_stone_index(self):
+        """Precompute stepping stone candidates for every destination"""
+        potential_rank = {"High": 3, "Medium": 2, "Low": 1}
         
-        logger.info(f"Loaded {len(self._countries_cache)} countries")
+        for destination, destination_data in self._countries_cache.items():
+            destination_region = destination_data.region
+            stepping_stones = []
+            
+            for code, data in self._countries_cache.items():
+                if code == destination:
+                    continue
+                
+                unlocks = data.unlocks_regions
+                potential = data.stepping_stone_potential
+                
+                if destination_region in unlocks or potential in ["Medium", "High"]:
+                    stepping_stones.append({
+                        "code": code,
+                        "name": data.name,
+                        "potential": potential,
+                        "unlocks": list(unlocks),
+                        "why_useful": f"Can help build experience/savings before {destination.title()}"
+                    })
+            
+            self._stepping_stone_index[destination] = sorted(
+                stepping_stones,
+                key=lambda x: potential_rank.get(x["potential"], 0),
+                reverse=True
+            )
     
-    def get_country(self, country_code: str) -> Optional[Dict]:
-        """Get data for a specific country"""
-        return self._countries_cache.get(country_code.lower())
+    def get_country(self, country_code: str) -> Optional[Country]:
+        """Get data for a country by file key, ISO code, name or alias"""
+        key = self.registry.key(country_code)
+        return self._countries_cache.get(key) if key else None
     
     def get_all_countries(self) -> List[Dict]:
         """Get all countries with summary info"""
         return [
             {
                 "code": code,
-                "name": data.get("name", code.title()),
-                "immigration_friendliness": data.get("immigration_friendliness", 5),
-                "fintech_readiness": data.get("fintech_readiness", 5),
-                "visa_types_count": len(data.get("visa_types", []))
+                "name": data.name,
+                "immigration_friendliness": data.immigration_friendliness,
+                "fintech_readiness": data.fintech_readiness,
+                "visa_types_count": len(data.visa_types)
             }
             for code, data in self._countries_cache.items()
         ]
     
-    def get_visa_types(self, country_code: str) -> List[Dict]:
+    def get_visa_types(self, country_code: str) -> Tuple[VisaType, ...]:
         """Get all visa types for a country"""
         country = self.get_country(country_code)
         if country:
-            return country.get("visa_types", [])
-        return []
+            return country.visa_types
+        return ()
     
     def get_visa_type(
         self, 
         country_code: str, 
         visa_type: str
-    ) -> Optional[Dict]:
+    ) -> Optional[VisaType]:
         """Get specific visa type for a country"""
-        visa_types = self.get_visa_types(country_code)
-        for visa in visa_types:
-            if visa.get("type") == visa_type:
-                return visa
-        return None
+        country = self.get_country(country_code)
+        return country.visa(visa_type) if country else None
     
     def search_countries(
         self,
@@ -87,23 +105,23 @@ class CountryService:
         
         for code, data in self._countries_cache.items():
             # Filter by immigration score
-            if data.get("immigration_friendliness", 0) < min_immigration_score:
+            if data.immigration_friendliness < min_immigration_score:
                 continue
             
             # Filter by skill demand
             if skill_areas:
-                country_skills = data.get("skill_demand", [])
-                if not any(skill.lower() in [s.lower() for s in country_skills] for skill in skill_areas):
+                country_skills = [s.lower() for s in data.skill_demand]
+                if not any(skill.lower() in country_skills for skill in skill_areas):
                     continue
             
             # Filter by stepping stone potential
             if stepping_stone:
-                if data.get("stepping_stone_potential", "Low") == "Low":
+                if data.stepping_stone_potential == "Low":
                     continue
             
             results.append({
                 "code": code,
-                **data
+                **data.to_dict()
             })
         
         return sorted(
@@ -112,52 +130,26 @@ class CountryService:
             reverse=True
         )
     
+    def search_visas(self, **filters) -> List[Dict]:
+        """Search visa types across all countries (see VisaCatalog.search)"""
+        return self.visa_catalog.search(**filters)
+    
     def get_financial_thresholds(self, country_code: str) -> Dict:
         """Get financial requirements for a country"""
-        thresholds_file = self.data_dir / "financial_thresholds.json"
-        
-        if not thresholds_file.exists():
-            return {}
-        
-        try:
-            with open(thresholds_file, 'r', encoding='utf-8') as f:
-                all_thresholds = json.load(f)
-                return all_thresholds.get(country_code.lower(), {})
-        except Exception as e:
-            logger.error(f"Error loading financial thresholds: {e}")
-            return {}
+        country = self.get_country(country_code)
+        return country.thresholds_dict() if country else {}
     
     def get_stepping_stone_countries(self, destination: str) -> List[Dict]:
         """Find countries that can serve as stepping stones to a destination"""
-        destination_data = self.get_country(destination)
-        if not destination_data:
-            return []
-        
-        # Find countries that unlock the destination region
-        destination_region = destination_data.get("region", "")
-        
-        stepping_stones = []
-        for code, data in self._countries_cache.items():
-            if code == destination.lower():
-                continue
-                
-            unlocks = data.get("unlocks_regions", [])
-            potential = data.get("stepping_stone_potential", "Low")
-            
-            if destination_region in unlocks or potential in ["Medium", "High"]:
-                stepping_stones.append({
-                    "code": code,
-                    "name": data.get("name", code.title()),
-                    "potential": potential,
-                    "unlocks": unlocks,
-                    "why_useful": f"Can help build experience/savings before {destination.title()}"
-                })
-        
-        return sorted(
-            stepping_stones,
-            key=lambda x: {"High": 3, "Medium": 2, "Low": 1}.get(x["potential"], 0),
-            reverse=True
-        )
+        return list(self._stepping_stone_index.get(self.registry.key(destination), []))
+    
+    def get_all_country_data(self) -> List[Country]:
+        """Get the full data of every loaded country"""
+        return list(self._countries_cache.values())
+    
+    def get_currency_rates(self) -> Dict[str, float]:
+        """Get currency → USD conversion rates"""
+        return dict(self._currency_rates)
     
     def compare_countries(self, country_codes: List[str]) -> Dict:
         """Compare multiple countries side by side"""
@@ -178,13 +170,13 @@ class CountryService:
             if country:
                 comparison["countries"].append({
                     "code": code,
-                    "name": country.get("name", code.title())
+                    "name": country.name
                 })
                 
                 for metric in metrics:
                     if metric not in comparison["metrics"]:
                         comparison["metrics"][metric] = {}
-                    comparison["metrics"][metric][code] = country.get(metric, "N/A")
+                    comparison["metrics"][metric][code] = getattr(country, metric) or "N/A"
         
         return comparison
 
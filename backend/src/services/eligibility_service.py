@@ -0,0 +1,433 @@
+"""
+Eligibility Service - Deterministic pre-filter over every visa in the corpus
+
+Each visa's machine-checkable requirements (education level, years of
+experience, English band, age limit, salary and income minimums) are
+compiled once from the requirement text in ``data/countries/*.json``, and
+proof-of-funds thresholds from ``financial_thresholds.json``, into numeric
+constraint columns. A profile (or a batch of profiles) is then checked
+against every visa in one vectorized pass.
+
+Each check is pass, borderline (close to the threshold, or the profile does
+not say) or fail; a visa's status is its worst check. Only eligible and
+borderline visas are handed to the LLM, which cuts the prompt and keeps it
+from reasoning about visas the profile cannot get. Requirements that cannot
+be checked from a profile (job offers, nominations, points tests) are
+listed as manual checks.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.services.country_registry import get_country_registry
+from src.services.knowledge_model import Country, FinancialThreshold, VisaType
+from src.services.knowledge_snapshot import KnowledgeSnapshot, get_knowledge_snapshot
+from src.services.sensitivity_service import EDUCATION_ORDER
+from src.services.visa_normalizer import LOCAL_CURRENCY, SYMBOL_CURRENCY
+from src.core.logging import logger
+
+
+ELIGIBLE, BORDERLINE, INELIGIBLE = 0, 1, 2
+STATUS_LABELS = ["eligible", "borderline", "ineligible"]
+
+# English requirements expressed as an IELTS band
+CLB_TO_IELTS = {4: 4.0, 5: 5.0, 6: 5.5, 7: 6.0, 8: 6.5, 9: 7.0, 10: 7.5}
+CEFR_TO_IELTS = {"a2": 3.0, "b1": 4.0, "b2": 5.5, "c1": 7.0, "c2": 8.5}
+PROFICIENCY_TO_IELTS = {"native": 8.5, "fluent": 7.5, "advanced": 7.0, "intermediate": 5.5, "basic": 4.0}
+
+EDUCATION_ALIASES = [
+    ("phd", ("phd", "doctor")),
+    ("masters", ("master", "mba", "msc")),
+    ("bachelors", ("bachelor", "bsc", "btech", "degree")),
+    ("high_school", ("high_school", "high school", "diploma", "secondary")),
+]
+
+# How far below a threshold still counts as borderline
+EXPERIENCE_MARGIN_YEARS = 1.0
+IELTS_MARGIN_BANDS = 0.5
+AGE_MARGIN_YEARS = 1.0
+AMOUNT_MARGIN_RATIO = 0.15
+
+# Constraint columns, in evaluation order
+CONSTRAINTS = ("education", "experience", "english", "age", "salary", "income", "funds")
+
+_AMOUNT = re.compile(
+    r"(?P<currency>[€£$¥]|\b(?:AED|AUD|CAD|EUR|GBP|JPY|SGD|USD)\s?)"
+    r"(?P<amount>\d[\d,]*(?:\.\d+)?)(?P<scale>\s*[km]\b)?"
+    r"(?:\s*/\s*(?P<per>month|year))?",
+    re.IGNORECASE
+)
+_ALT_YEARS = re.compile(r"\bor\s+(\d+)\+?\s*years?", re.IGNORECASE)
+_DEGREE = re.compile(r"bachelor|degree|university|higher education", re.IGNORECASE)
+_NOT_DEGREE = re.compile(r"admission|acceptance|graduated|enrol", re.IGNORECASE)
+
+
+class VisaConstraints:
+    """Numeric constraints compiled from one visa's requirements (NaN = none)."""
+
+    __slots__ = ("country", "code", "visa_type", "name", "details", "values", "manual")
+
+    def __init__(self, country: str, code: str, visa: VisaType):
+        self.country = country
+        self.code = code
+        self.visa_type = visa.type
+        self.name = visa.name
+        # Context passed to the LLM alongside the eligibility verdict
+        self.details = {"processing_time": visa.processing_time, "path_to_pr": visa.path_to_pr}
+        self.values: Dict[str, float] = {}
+        self.manual: List[str] = []
+
+
+class EligibilityEngine:
+    """
+    Compiled eligibility rules for every visa in a knowledge snapshot.
+    """
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self.version = snapshot.version
+        self.rates = snapshot.currency_rates
+
+        self.registry = get_country_registry(snapshot)
+
+        self.visas: List[VisaConstraints] = []
+        self.country_names: Dict[str, str] = {}
+        for stem, country in sorted(snapshot.countries.items()):
+            self.country_names[country.code] = country.name
+            for visa in country.visa_types:
+                self.visas.append(self._compile(country, visa))
+
+        # One column per constraint, one row per visa
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.array([v.values.get(name, np.nan) for v in self.visas], dtype=float)
+            for name in CONSTRAINTS + ("education_alt_years", "salary_alt_years")
+        }
+        logger.info(f"Eligibility engine compiled {len(self.visas)} visas across {len(self.country_names)} countries")
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile(self, country: Country, visa: VisaType) -> VisaConstraints:
+        code = country.code
+        compiled = VisaConstraints(country.name, code, visa)
+        values = compiled.values
+
+        funds = self._funds_threshold(country.threshold_for(visa.type))
+        if funds is not None:
+            values["funds"] = funds
+
+        for requirement in visa.requirements:
+            lowered = requirement.lower()
+            amounts = self._amounts(requirement, code)
+            alt_years = _ALT_YEARS.search(requirement)
+
+            if lowered.startswith("one of") or "points based on" in lowered:
+                compiled.manual.append(requirement)
+            elif "salary" in lowered and amounts:
+                values["salary"] = min(amounts)
+                if alt_years:
+                    values["salary_alt_years"] = float(alt_years.group(1))
+            elif "income" in lowered and amounts:
+                values["income"] = min(amounts)
+            elif _DEGREE.search(requirement) and not _NOT_DEGREE.search(requirement):
+                values["education"] = float(EDUCATION_ORDER.index("bachelors"))
+                if alt_years:
+                    values["education_alt_years"] = float(alt_years.group(1))
+            elif (match := re.search(r"(\d+)\+?\s*years?\b", lowered)) and " or " not in lowered and (
+                "experience" in lowered or "employment with" in lowered
+            ):
+                values["experience"] = float(match.group(1))
+            elif (english := self._english_band(lowered)) is not None:
+                values["english"] = english
+            elif match := re.search(r"under (\d+) years", lowered):
+                values["age"] = float(match.group(1)) - 1
+            elif "funds" in lowered and "funds" in values:
+                continue
+            else:
+                compiled.manual.append(requirement)
+        return compiled
+
+    def _amounts(self, text: str, code: str) -> List[float]:
+        """Yearly USD value of every money amount in a requirement"""
+        amounts = []
+        for match in _AMOUNT.finditer(text):
+            symbol = match.group("currency").strip()
+            currency = SYMBOL_CURRENCY.get(symbol, LOCAL_CURRENCY.get(code, "USD") if symbol == "$" else symbol.upper())
+            amount = float(match.group("amount").replace(",", ""))
+            amount *= {"k": 1_000, "m": 1_000_000}.get((match.group("scale") or "").strip().lower(), 1)
+            if (match.group("per") or "").lower() == "month":
+                amount *= 12
+            amounts.append(amount * self.rates.get(currency, 1.0))
+        return amounts
+
+    def _funds_threshold(self, entry: Optional[FinancialThreshold]) -> Optional[float]:
+        """Proof-of-funds requirement in USD from financial_thresholds.json"""
+        if entry is None:
+            return None
+        amounts = {
+            key: money.usd(self.rates)
+            for key, money in entry.amounts.items()
+            if not any(word in key for word in ("salary", "investment", "property", "minimum", "surcharge", "points"))
+        }
+        if not amounts:
+            return None
+        for preferred in ("total", "single"):
+            matches = [amount for key, amount in amounts.items() if preferred in key]
+            if matches:
+                return round(matches[0], 2)
+        # e.g. yearly tuition plus living costs, or a monthly allowance over months_required
+        yearly = sum(amount for key, amount in amounts.items() if "monthly" not in key)
+        monthly = [amount for key, amount in amounts.items() if "monthly" in key]
+        months = entry.months_required or 12
+        return round(yearly + (min(monthly) * months if monthly else 0.0), 2)
+
+    @staticmethod
+    def _english_band(lowered: str) -> Optional[float]:
+        if match := re.search(r"clb\s*(\d+)", lowered):
+            return CLB_TO_IELTS.get(int(match.group(1)))
+        if match := re.search(r"ielts[^\d]*(\d(?:\.\d)?)", lowered):
+            return float(match.group(1))
+        if "english" in lowered:
+            if match := re.search(r"\b(a2|b1|b2|c1|c2)\b", lowered):
+                return CEFR_TO_IELTS[match.group(1)]
+            if "competent" in lowered:
+                return 6.0
+        return None
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def evaluate_batch(self, profiles: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Check every visa against every profile in one vectorized pass.
+
+        Returns:
+            Dict with "status" (visas x profiles, 0 eligible / 1 borderline /
+            2 ineligible) and one status grid per constraint
+        """
+        values = {
+            name: np.array([column[name] for column in map(profile_values, profiles)], dtype=float)[None, :]
+            for name in ("education", "experience", "english", "age", "income", "savings")
+        }
+        cols = {name: column[:, None] for name, column in self.columns.items()}
+
+        experience_alt_education = _at_least(values["experience"], cols["education_alt_years"], EXPERIENCE_MARGIN_YEARS, absent=INELIGIBLE)
+        experience_alt_salary = _at_least(values["experience"], cols["salary_alt_years"], EXPERIENCE_MARGIN_YEARS, absent=INELIGIBLE)
+
+        checks = {
+            "education": np.minimum(_at_least(values["education"], cols["education"], 0.0), experience_alt_education),
+            "experience": _at_least(values["experience"], cols["experience"], EXPERIENCE_MARGIN_YEARS),
+            "english": _at_least(values["english"], cols["english"], IELTS_MARGIN_BANDS),
+            "age": _at_least(-values["age"], -cols["age"], AGE_MARGIN_YEARS),
+            # Salary minimums apply to the job offer, so a lower current income is only borderline
+            "salary": np.minimum(
+                np.minimum(_at_least(values["income"], cols["salary"], 0.0), BORDERLINE),
+                experience_alt_salary
+            ),
+            "income": _at_least(values["income"], cols["income"], cols["income"] * AMOUNT_MARGIN_RATIO),
+            "funds": _at_least(values["savings"], cols["funds"], cols["funds"] * AMOUNT_MARGIN_RATIO),
+        }
+        status = np.zeros((len(self.visas), len(profiles)), dtype=np.int8)
+        for grid in checks.values():
+            np.maximum(status, grid, out=status)
+        return {"status": status, **checks}
+
+    def evaluate(self, profile: Dict, countries: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Eligibility of one profile for every visa (or those in ``countries``).
+
+        Returns:
+            {"eligible": [...], "borderline": [...], "ineligible": [...],
+             "evaluatedVisas": n} with unmet checks and manual checks per visa
+        """
+        grids = self.evaluate_batch([profile])
+        wanted = self.resolve_countries(countries) if countries else None
+        actual = profile_values(profile)
+
+        result = {label: [] for label in STATUS_LABELS}
+        for row, visa in enumerate(self.visas):
+            if wanted is not None and visa.code not in wanted:
+                continue
+            status = int(grids["status"][row, 0])
+            result[STATUS_LABELS[status]].append({
+                "country": visa.country,
+                "countryCode": visa.code,
+                "visaType": visa.visa_type,
+                "visaName": visa.name,
+                "processingTime": visa.details["processing_time"],
+                "pathToPr": visa.details["path_to_pr"],
+                "status": STATUS_LABELS[status],
+                "unmet": [
+                    {
+                        "check": name,
+                        "status": STATUS_LABELS[int(grids[name][row, 0])],
+                        "required": _describe(name, visa.values),
+                        "actual": _describe_actual(name, actual)
+                    }
+                    for name in CONSTRAINTS if grids[name][row, 0] != ELIGIBLE
+                ],
+                "manualChecks": visa.manual
+            })
+        result["evaluatedVisas"] = sum(len(result[label]) for label in STATUS_LABELS)
+        return result
+
+    def resolve_countries(self, countries: Iterable[str]) -> set:
+        """ISO codes of known countries for country codes, names or file stems"""
+        return {code for code in self.registry.codes(countries) if code in self.country_names}
+
+    # ------------------------------------------------------------------
+    # LLM context
+    # ------------------------------------------------------------------
+
+    def filter_country_data(self, country_data: List[Dict], profile: Dict) -> List[Dict]:
+        """
+        Replace each country's visa list with the visas the profile is
+        eligible or borderline for, and name the ones screened out.
+        """
+        codes = [entry.get("code") for entry in country_data if entry.get("code")]
+        evaluation = self.evaluate(profile, codes)
+        by_country: Dict[str, List[Dict]] = {}
+        for visa in evaluation["eligible"] + evaluation["borderline"]:
+            by_country.setdefault(visa["countryCode"], []).append({
+                "type": visa["visaType"],
+                "name": visa["visaName"],
+                "processing_time": visa["processingTime"],
+                "path_to_pr": visa["pathToPr"],
+                "eligibility": visa["status"],
+                "gaps": [_gap_text(check) for check in visa["unmet"]]
+            })
+        screened_out: Dict[str, List[str]] = {}
+        for visa in evaluation["ineligible"]:
+            screened_out.setdefault(visa["countryCode"], []).append(visa["visaName"])
+
+        filtered = []
+        for entry in country_data:
+            code = (entry.get("code") or "").upper()
+            if code not in self.country_names:
+                filtered.append(entry)
+                continue
+            filtered.append({
+                **entry,
+                "visa_types": by_country.get(code, []),
+                "screened_out_visas": screened_out.get(code, [])
+            })
+        return filtered
+
+    def prompt_summary(self, profile: Dict, countries: Iterable[str]) -> str:
+        """Pre-screened visa list for agent task descriptions"""
+        evaluation = self.evaluate(profile, countries)
+        lines = []
+        for visa in evaluation["eligible"] + evaluation["borderline"]:
+            gaps = "; ".join(_gap_text(check) for check in visa["unmet"])
+            lines.append(
+                f"- {visa['country']}: {visa['visaName']} ({visa['visaType']}) - {visa['status']}"
+                + (f" ({gaps})" if gaps else "")
+            )
+        if evaluation["ineligible"]:
+            lines.append(
+                "Screened out (hard requirements not met): "
+                + ", ".join(f"{v['country']} {v['visaName']}" for v in evaluation["ineligible"])
+            )
+        return "\n".join(lines) or "No visas in the knowledge base for the target countries."
+
+
+def _at_least(value: np.ndarray, minimum: np.ndarray, margin, absent: int = ELIGIBLE) -> np.ndarray:
+    """
+    Status grid for value >= minimum: eligible, borderline within margin (or
+    when the profile value is unknown), else ineligible. Rows without a
+    minimum get ``absent``.
+    """
+    status = np.where(value >= minimum, ELIGIBLE, np.where(value >= minimum - margin, BORDERLINE, INELIGIBLE))
+    status = np.where(np.isnan(value), BORDERLINE, status)
+    return np.where(np.isnan(minimum), absent, status).astype(np.int8)
+
+
+def profile_values(profile: Dict) -> Dict[str, float]:
+    """Numeric profile attributes the constraints are checked against (NaN = unknown)"""
+    education = profile.get("education") or {}
+    work = profile.get("workExperience") or {}
+    financial = profile.get("financial") or {}
+
+    level = str(education.get("level") or education.get("degree") or "").lower()
+    rank = next(
+        (EDUCATION_ORDER.index(name) for name, words in EDUCATION_ALIASES if any(w in level for w in words)),
+        np.nan
+    )
+    return {
+        "education": rank,
+        "experience": _number(work.get("yearsOfExperience")),
+        "english": _english_level(profile.get("languages") or []),
+        "age": _number(profile.get("age")),
+        "income": _number(financial.get("annualIncomeUsd")),
+        "savings": _number(financial.get("savingsUsd")),
+    }
+
+
+def _number(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _english_level(languages: List) -> float:
+    """IELTS band from a test score, or estimated from self-reported proficiency"""
+    for entry in languages:
+        if isinstance(entry, dict):
+            if str(entry.get("language", "")).lower() != "english":
+                continue
+            if entry.get("ieltsScore") is not None:
+                return _number(entry["ieltsScore"])
+            proficiency = str(entry.get("proficiency", "")).lower()
+        elif "english" in str(entry).lower():
+            proficiency = str(entry).lower()
+        else:
+            continue
+        return next((band for word, band in PROFICIENCY_TO_IELTS.items() if word in proficiency), np.nan)
+    return np.nan
+
+
+def _describe(check: str, values: Dict[str, float]) -> Optional[str]:
+    """Human-readable requirement for a check"""
+    if check == "education":
+        alt = values.get("education_alt_years")
+        return "Bachelor's degree" + (f" or {alt:g}+ years experience" if alt else "")
+    if check == "salary":
+        alt = values.get("salary_alt_years")
+        return f"Job offer paying ${values['salary']:,.0f}/yr" + (f" or {alt:g}+ years experience" if alt else "")
+    if check not in values:
+        return None
+    return {
+        "experience": f"{values.get('experience', 0):g}+ years experience",
+        "english": f"IELTS {values.get('english', 0):g}",
+        "age": f"Age {values.get('age', 0):g} or under",
+        "income": f"Income ${values.get('income', 0):,.0f}/yr",
+        "funds": f"Funds ${values.get('funds', 0):,.0f}",
+    }[check]
+
+
+def _describe_actual(check: str, actual: Dict[str, float]) -> Optional[str]:
+    key = {"salary": "income", "funds": "savings"}.get(check, check)
+    value = actual.get(key)
+    if value is None or np.isnan(value):
+        return None
+    if check == "education":
+        return EDUCATION_ORDER[int(value)]
+    return f"${value:,.0f}" if key in ("income", "savings") else f"{value:g}"
+
+
+def _gap_text(check: Dict) -> str:
+    return f"needs {check['required']}, profile has {check['actual'] or 'unknown'}"
+
+
+# Singleton instance
+_eligibility_engine: Optional[EligibilityEngine] = None
+
+def get_eligibility_engine() -> EligibilityEngine:
+    """Get or compile the eligibility engine for the current snapshot"""
+    global _eligibility_engine
+    if _eligibility_engine is None:
+        _eligibility_engine = EligibilityEngine(get_knowledge_snapshot())
+    return _eligibility_engine
@@ -0,0 +1,125 @@
+"""
+Explore Session Store - Bounded, TTL-evicting store for /explore/quick results
+
+Responses are kept as zlib-compressed JSON bytes in a SQLite database (WAL
+mode), so every worker process on the host sees the same sessions and the
+API's memory does not grow with traffic. Entries expire after a TTL, and the
+store is trimmed to a maximum number of sessions, oldest first.
+"""
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.core.config import settings
+from src.core.logging import logger
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+# Run the eviction sweep every N writes rather than on each one
+EVICT_EVERY_WRITES = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS explore_sessions (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_explore_sessions_expires ON explore_sessions (expires_at);
+CREATE INDEX IF NOT EXISTS idx_explore_sessions_created ON explore_sessions (created_at);
+"""
+
+
+class ExploreSessionStore:
+    """
+    SQLite-backed session store shared by all worker processes.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float, max_entries: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+        logger.info(f"Explore session store at {self.path} (ttl {ttl_seconds:.0f}s, max {max_entries})")
+
+    def put(self, session_id: str, body: bytes):
+        """Store serialized response bytes for a session"""
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO explore_sessions (id, created_at, expires_at, body) VALUES (?, ?, ?, ?)",
+            (session_id, now, now + self.ttl_seconds, zlib.compress(body, 6))
+        )
+
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % EVICT_EVERY_WRITES == 0
+        if sweep:
+            self.evict()
+
+    def get(self, session_id: str) -> Optional[bytes]:
+        """Serialized response bytes for a session, or None if unknown or expired"""
+        row = self._connection().execute(
+            "SELECT body FROM explore_sessions WHERE id = ? AND expires_at > ?",
+            (session_id, time.time())
+        ).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def evict(self) -> int:
+        """Drop expired sessions, then the oldest beyond max_entries"""
+        connection = self._connection()
+        expired = connection.execute(
+            "DELETE FROM explore_sessions WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        overflow = connection.execute(
+            "DELETE FROM explore_sessions WHERE id IN ("
+            "SELECT id FROM explore_sessions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        if expired or overflow:
+            logger.debug(f"Evicted {expired} expired and {overflow} overflow explore sessions")
+        return expired + overflow
+
+    def stats(self) -> Dict:
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM explore_sessions"
+        ).fetchone()
+        return {
+            "sessions": count,
+            "storedBytes": size,
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not thread-safe)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+# Singleton instance
+_explore_session_store = None
+
+def get_explore_session_store() -> ExploreSessionStore:
+    """Get or create the explore session store singleton"""
+    global _explore_session_store
+    if _explore_session_store is None:
+        path = Path(settings.EXPLORE_SESSION_DB)
+        _explore_session_store = ExploreSessionStore(
+            path if path.is_absolute() else BACKEND_DIR / path,
+            ttl_seconds=settings.EXPLORE_SESSION_TTL_SECONDS,
+            max_entries=settings.EXPLORE_SESSION_MAX_ENTRIES
+        )
+    return _explore_session_store
@@ -0,0 +1,363 @@
+"""
+Knowledge Model - Immutable, slotted domain objects for the country corpus
+
+Every ``data/countries/*.json`` file and its entries in
+``financial_thresholds.json`` are validated once, when the knowledge
+snapshot is compiled or loaded, and turned into ``Country``, ``VisaType``
+and ``FinancialThreshold`` objects. ``snapshot.countries`` holds these, so
+CountryService, DocumentLoader, DocumentIndexer and the agent, eligibility
+and path services all share one copy of the corpus per worker.
+
+Objects use ``__slots__`` instead of per-instance dicts, repeated labels
+(codes, regions, visa types, skills, currencies) are interned, lists are
+stored as tuples and nested dicts as read-only mappings. A malformed file
+raises ValueError at load time instead of a KeyError in the middle of a
+request. ``to_dict()`` gives back the source JSON shape for API responses
+and for pickling the snapshot.
+"""
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.services.visa_normalizer import normalize_visa
+from src.core.logging import logger
+
+
+STEPPING_STONE_POTENTIALS = ("Low", "Medium", "High")
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed JSON: dicts → mappings, lists → tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(k): _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dicts and lists again (inverse of _freeze)"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _mapping(data: Any, where: str) -> Mapping:
+    if not isinstance(data, dict):
+        raise ValueError(f"{where}: expected an object, got {type(data).__name__}")
+    return data
+
+
+def _text(data: Mapping, key: str, where: str, required: bool = False) -> Optional[str]:
+    value = data.get(key)
+    if value is None:
+        if required:
+            raise ValueError(f"{where}: missing '{key}'")
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise ValueError(f"{where}: '{key}' must be a non-empty string")
+    return value
+
+
+def _score(data: Mapping, key: str, where: str) -> float:
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 10:
+        raise ValueError(f"{where}: '{key}' must be a number from 0 to 10, got {value!r}")
+    return value
+
+
+def _flag(data: Mapping, key: str, where: str) -> Optional[bool]:
+    value = data.get(key)
+    if value is not None and not isinstance(value, bool):
+        raise ValueError(f"{where}: '{key}' must be true or false, got {value!r}")
+    return value
+
+
+def _strings(data: Mapping, key: str, where: str, intern: bool = False) -> Tuple[str, ...]:
+    value = data.get(key) or []
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{where}: '{key}' must be a list of strings")
+    return tuple(sys.intern(v) for v in value) if intern else tuple(value)
+
+
+class _Frozen:
+    """Slotted object whose attributes cannot be reassigned after __init__"""
+
+    __slots__ = ()
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        label = getattr(self, "code", None) or getattr(self, "type", None) or getattr(self, "visa_key", "")
+        return f"<{type(self).__name__} {label}>"
+
+
+class Money(_Frozen):
+    """An amount in a currency, optionally per "year" or "month"."""
+
+    __slots__ = ("amount", "currency", "per")
+
+    def __init__(self, amount: float, currency: str, per: Optional[str] = None):
+        self._set(amount=amount, currency=sys.intern(currency), per=_intern(per))
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str) -> "Money":
+        data = _mapping(data, where)
+        amount = data.get("amount")
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)) or amount < 0:
+            raise ValueError(f"{where}: 'amount' must be a non-negative number, got {amount!r}")
+        return cls(amount, _text(data, "currency", where) or "USD", _text(data, "per", where))
+
+    def usd(self, rates: Mapping[str, float]) -> float:
+        return self.amount * rates.get(self.currency, 1.0)
+
+    def to_dict(self) -> Dict:
+        money = {"amount": self.amount, "currency": self.currency}
+        if self.per:
+            money["per"] = self.per
+        return money
+
+
+class FinancialThreshold(_Frozen):
+    """
+    Listed money requirements of one visa from financial_thresholds.json.
+
+    Attributes:
+        visa_key: Entry key, a visa type or "<visa type>_<variant>"
+        amounts: Name ("single", "monthly_required", ...) → Money
+        months_required: Months a monthly amount must cover, if given
+        notes: Free-text notes
+        extra: Any other listed fields (read-only)
+    """
+
+    __slots__ = ("visa_key", "amounts", "months_required", "notes", "extra")
+
+    def __init__(
+        self,
+        visa_key: str,
+        amounts: Mapping[str, Money],
+        months_required: Optional[int] = None,
+        notes: Optional[str] = None,
+        extra: Mapping[str, Any] = _EMPTY
+    ):
+        self._set(
+            visa_key=sys.intern(visa_key),
+            amounts=MappingProxyType(dict(amounts)),
+            months_required=months_required,
+            notes=notes,
+            extra=extra
+        )
+
+    @classmethod
+    def from_dict(cls, visa_key: str, data: Any, where: str) -> "FinancialThreshold":
+        where = f"{where}.{visa_key}"
+        data = _mapping(data, where)
+        months = data.get("months_required")
+        if months is not None and (isinstance(months, bool) or not isinstance(months, int) or months <= 0):
+            raise ValueError(f"{where}: 'months_required' must be a positive integer, got {months!r}")
+        amounts, extra = {}, {}
+        for key, value in data.items():
+            if key in ("notes", "months_required"):
+                continue
+            if isinstance(value, dict) and "amount" in value:
+                amounts[sys.intern(key)] = Money.from_dict(value, f"{where}.{key}")
+            else:
+                extra[sys.intern(key)] = _freeze(value)
+        return cls(visa_key, amounts, months, _text(data, "notes", where), MappingProxyType(extra))
+
+    def to_dict(self) -> Dict:
+        entry = {name: money.to_dict() for name, money in self.amounts.items()}
+        entry.update(_thaw(self.extra))
+        if self.months_required is not None:
+            entry["months_required"] = self.months_required
+        if self.notes is not None:
+            entry["notes"] = self.notes
+        return entry
+
+
+class VisaType(_Frozen):
+    """
+    One visa of a country. Optional text fields are None when the data
+    does not give them; ``normalized`` holds the parsed month and money
+    ranges (see visa_normalizer).
+    """
+
+    __slots__ = (
+        "type", "name", "description", "requirements", "processing_time", "duration",
+        "path_to_pr", "application_fee", "financial_requirement", "work_permitted",
+        "employer_tied", "family_allowed", "spouse_work_rights", "work_hours_limit",
+        "tips", "common_rejection_reasons", "normalized",
+    )
+
+    TEXT_FIELDS = (
+        "description", "processing_time", "duration", "path_to_pr", "application_fee",
+        "financial_requirement", "spouse_work_rights", "work_hours_limit",
+    )
+    FLAG_FIELDS = ("work_permitted", "employer_tied", "family_allowed")
+    LIST_FIELDS = ("requirements", "tips", "common_rejection_reasons")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str, country_code: str, rates: Mapping[str, float]) -> "VisaType":
+        data = _mapping(data, where)
+        visa_type = _text(data, "type", where, required=True)
+        where = f"{where}[{visa_type}]"
+        fields = {
+            "type": sys.intern(visa_type),
+            "name": _text(data, "name", where, required=True),
+        }
+        fields.update({key: _text(data, key, where) for key in cls.TEXT_FIELDS})
+        fields.update({key: _flag(data, key, where) for key in cls.FLAG_FIELDS})
+        fields.update({key: _strings(data, key, where) for key in cls.LIST_FIELDS})
+        # Parsed at snapshot build; a pickled snapshot carries it already
+        normalized = data.get("normalized") or normalize_visa(data, country_code, dict(rates))
+        fields["normalized"] = _freeze(normalized)
+        return cls(**fields)
+
+    def to_dict(self) -> Dict:
+        visa = {name: getattr(self, name) for name in ("type", "name") + self.TEXT_FIELDS + self.FLAG_FIELDS}
+        visa.update({name: list(getattr(self, name)) for name in self.LIST_FIELDS})
+        visa["normalized"] = _thaw(self.normalized)
+        return {key: value for key, value in visa.items() if value is not None}
+
+
+class Country(_Frozen):
+    """
+    One country file: scores, labels, visa types (in the data's priority
+    order) and financial thresholds keyed by visa entry.
+    """
+
+    __slots__ = (
+        "stem", "code", "name", "region", "immigration_friendliness", "fintech_readiness",
+        "processing_speed", "language", "english_proficiency", "cost_of_living",
+        "stepping_stone_potential", "unlocks_regions", "skill_demand", "notes",
+        "visa_types", "thresholds",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(
+        cls,
+        stem: str,
+        data: Any,
+        thresholds: Optional[Mapping] = None,
+        rates: Optional[Mapping[str, float]] = None
+    ) -> "Country":
+        where = f"countries/{stem}"
+        data = _mapping(data, where)
+        code = _text(data, "code", where, required=True).upper()
+        if len(code) != 2 or not code.isalpha():
+            raise ValueError(f"{where}: 'code' must be a two-letter ISO code, got {code!r}")
+        potential = data.get("stepping_stone_potential", "Low")
+        if potential not in STEPPING_STONE_POTENTIALS:
+            raise ValueError(f"{where}: 'stepping_stone_potential' must be one of {STEPPING_STONE_POTENTIALS}")
+
+        visas = data.get("visa_types")
+        if not isinstance(visas, list) or not visas:
+            raise ValueError(f"{where}: 'visa_types' must be a non-empty list")
+        visa_types = tuple(
+            VisaType.from_dict(visa, f"{where}.visa_types", code, rates or {}) for visa in visas
+        )
+
+        threshold_entries = _mapping(thresholds or {}, f"financial_thresholds/{stem}")
+        return cls(
+            stem=sys.intern(stem),
+            code=sys.intern(code),
+            name=_text(data, "name", where, required=True),
+            region=sys.intern(_text(data, "region", where, required=True)),
+            immigration_friendliness=_score(data, "immigration_friendliness", where),
+            fintech_readiness=_score(data, "fintech_readiness", where),
+            processing_speed=_score(data, "processing_speed", where),
+            language=_intern(_text(data, "language", where) or ""),
+            english_proficiency=_intern(_text(data, "english_proficiency", where)),
+            cost_of_living=_intern(_text(data, "cost_of_living", where) or ""),
+            stepping_stone_potential=sys.intern(potential),
+            unlocks_regions=_strings(data, "unlocks_regions", where, intern=True),
+            skill_demand=_strings(data, "skill_demand", where, intern=True),
+            notes=_text(data, "notes", where) or "",
+            visa_types=visa_types,
+            thresholds=MappingProxyType({
+                sys.intern(key): FinancialThreshold.from_dict(key, entry, f"financial_thresholds/{stem}")
+                for key, entry in threshold_entries.items()
+            }),
+        )
+
+    def visa(self, visa_type: str) -> Optional[VisaType]:
+        """The visa with this type key, if any"""
+        return next((visa for visa in self.visa_types if visa.type == visa_type), None)
+
+    def threshold_for(self, visa_type: str) -> Optional[FinancialThreshold]:
+        """Financial threshold entry of a visa type ("<type>" or "<type>_<variant>")"""
+        entry = self.thresholds.get(visa_type)
+        if entry is not None:
+            return entry
+        prefix = f"{visa_type}_"
+        return next((t for key, t in self.thresholds.items() if key.startswith(prefix)), None)
+
+    def thresholds_dict(self) -> Dict[str, Dict]:
+        return {key: threshold.to_dict() for key, threshold in self.thresholds.items()}
+
+    def to_dict(self) -> Dict:
+        """The country in its source JSON shape (without thresholds)"""
+        country = {
+            "name": self.name,
+            "code": self.code,
+            "region": self.region,
+            "immigration_friendliness": self.immigration_friendliness,
+            "fintech_readiness": self.fintech_readiness,
+            "processing_speed": self.processing_speed,
+            "language": self.language,
+            "english_proficiency": self.english_proficiency,
+            "cost_of_living": self.cost_of_living,
+            "stepping_stone_potential": self.stepping_stone_potential,
+            "unlocks_regions": list(self.unlocks_regions),
+            "skill_demand": list(self.skill_demand),
+            "notes": self.notes,
+            "visa_types": [visa.to_dict() for visa in self.visa_types],
+        }
+        return {key: value for key, value in country.items() if value is not None}
+
+
+def load_countries(
+    countries: Mapping[str, Any],
+    financial_thresholds: Mapping,
+    rates: Mapping[str, float]
+) -> Dict[str, Country]:
+    """
+    Country objects keyed by file stem. Already-built Country objects pass
+    through; a file that fails validation is logged and left out, like a
+    file that is not valid JSON.
+    """
+    threshold_countries = financial_thresholds.get("countries", {})
+    loaded = {}
+    for stem, data in countries.items():
+        if isinstance(data, Country):
+            loaded[stem] = data
+            continue
+        try:
+            loaded[sys.intern(stem)] = Country.from_dict(stem, data, threshold_countries.get(stem), rates)
+        except ValueError as e:
+            logger.error(f"❌ Invalid country data, skipping {stem}: {e}")
+    return loaded
@@ -0,0 +1,263 @@
+"""
+Knowledge Reloader - Hot reload of policy and country data without restart
+
+Watches ``data/`` for changes to the knowledge files. On a change it
+compiles a new snapshot, builds fresh CountryService, DocumentLoader and
+PathGraph instances from it off the event loop, then swaps the singletons
+(copy-on-write): requests already holding the old objects finish against a
+complete old corpus, new requests get a complete new one. Only documents
+that actually changed are re-indexed into the vector store.
+
+With several uvicorn workers, only one of them (the holder of an
+exclusive lock on ``data/.knowledge.lock``) rebuilds, saves and
+re-indexes. The others wait for the saved snapshot file to change and
+adopt it as-is; a follower takes over the lock if the leader exits.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import src.services.agent_knowledge as agent_knowledge_module
+import src.services.country_service as country_service_module
+import src.services.document_loader as document_loader_module
+import src.services.eligibility_service as eligibility_module
+import src.services.knowledge_snapshot as knowledge_snapshot_module
+import src.services.path_graph_service as path_graph_module
+import src.services.points_service as points_module
+import src.services.sensitivity_service as sensitivity_module
+from src.services.country_service import CountryService
+from src.services.document_loader import DocumentLoader
+from src.services.eligibility_service import EligibilityEngine
+from src.services.knowledge_snapshot import (
+    DEFAULT_DATA_DIR,
+    build_snapshot,
+    get_knowledge_snapshot,
+    is_fresh,
+    load_snapshot,
+    save_snapshot,
+    SNAPSHOT_FILENAME,
+)
+from src.services.path_graph_service import build_path_graph
+from src.services.points_service import PointsCalculator
+from src.core.config import settings
+from src.core.logging import logger
+
+# watchfiles ships with uvicorn[standard]; fall back to polling without it
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+KNOWLEDGE_SUFFIXES = (".json", ".md")
+LEADER_LOCK_FILENAME = ".knowledge.lock"
+
+
+class KnowledgeReloader:
+    """
+    Rebuilds and atomically swaps the knowledge-backed services.
+    """
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self.reload_count = 0
+        self.last_reload: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._leader_file = None
+        self._adopted_mtime: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_file is not None
+
+    def _try_lead(self) -> bool:
+        """Take the leader lock if no other worker holds it (non-blocking)"""
+        if self._leader_file is not None:
+            return True
+        lock_file = open(self.data_dir / LEADER_LOCK_FILENAME, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self._leader_file = lock_file
+        logger.info(f"👑 Worker {os.getpid()} leads knowledge reloads")
+        return True
+
+    def _release_lead(self):
+        if self._leader_file is not None:
+            self._leader_file.close()  # Closing the file releases the lock
+            self._leader_file = None
+
+    def sync(self) -> Dict:
+        """
+        React to a change under data/: the leader rebuilds from source, the
+        other workers adopt the snapshot the leader saved.
+        """
+        if self._try_lead():
+            return self.reload()
+        return self.adopt_saved()
+
+    def reload(self, force: bool = False) -> Dict:
+        """
+        Rebuild from the knowledge files if they changed on disk, save the
+        snapshot for the other workers and re-index what changed.
+
+        Everything is built before anything is swapped, so a failure while
+        compiling leaves the current corpus in place.
+        """
+        with self._lock:
+            current = get_knowledge_snapshot()
+            if not force and is_fresh(current, self.data_dir):
+                return {"reloaded": False, "version": current.version}
+
+            snapshot = build_snapshot(self.data_dir)
+            self._swap(snapshot)
+
+            try:
+                save_snapshot(snapshot, self.data_dir / SNAPSHOT_FILENAME)
+            except OSError as e:
+                logger.warning(f"Could not save knowledge snapshot: {e}")
+
+            indexed = self._reindex(current, snapshot) if snapshot.version != current.version else None
+            return self._record(current, snapshot, indexed)
+
+    def adopt_saved(self) -> Dict:
+        """Swap in the leader's saved snapshot if it is newer and matches the files on disk"""
+        with self._lock:
+            current = get_knowledge_snapshot()
+            path = self.data_dir / SNAPSHOT_FILENAME
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                return {"reloaded": False, "version": current.version}
+            if mtime == self._adopted_mtime:
+                return {"reloaded": False, "version": current.version}
+
+            snapshot = load_snapshot(path)
+            # Not fresh yet: the leader is still rebuilding and will save again
+            if snapshot is None or snapshot.version == current.version or not is_fresh(snapshot, self.data_dir):
+                return {"reloaded": False, "version": current.version}
+
+            self._adopted_mtime = mtime
+            self._swap(snapshot)
+            return self._record(current, snapshot, None)
+
+    def _swap(self, snapshot):
+        """Build the knowledge-backed services for a snapshot, then swap them in"""
+        country_service = CountryService(snapshot=snapshot)
+        document_loader = DocumentLoader(snapshot=snapshot)
+        path_graph = build_path_graph(country_service)
+        eligibility_engine = EligibilityEngine(snapshot)
+        points_calculator = PointsCalculator(snapshot)
+
+        # Each assignment is atomic; every object is internally consistent
+        knowledge_snapshot_module._knowledge_snapshot = snapshot
+        country_service_module._country_service = country_service
+        document_loader_module._document_loader = document_loader
+        path_graph_module._path_graph = path_graph
+        sensitivity_module._sensitivity_service = None
+        agent_knowledge_module._agent_knowledge = None
+        eligibility_module._eligibility_engine = eligibility_engine
+        points_module._points_calculator = points_calculator
+
+    def _record(self, current, snapshot, indexed: Optional[Dict[str, int]]) -> Dict:
+        self.reload_count += 1
+        self.last_reload = {
+            "reloaded": True,
+            "previousVersion": current.version,
+            "version": snapshot.version,
+            "indexed": indexed,
+            "leader": self.is_leader,
+            "reloadedAt": datetime.now().isoformat()
+        }
+        logger.info(
+            f"🔄 Knowledge {'reloaded' if self.is_leader else 'adopted'}: {current.version} → {snapshot.version}"
+        )
+        return self.last_reload
+
+    def _reindex(self, previous, snapshot) -> Optional[Dict[str, int]]:
+        """Re-index changed documents; skipped when the RAG stack is unavailable"""
+        try:
+            from src.rag.indexer import DocumentIndexer
+        except ImportError as e:
+            logger.debug(f"Skipping re-index, RAG not available: {e}")
+            return None
+
+        try:
+            return DocumentIndexer(snapshot=snapshot).index_changes(previous)
+        except Exception as e:
+            logger.error(f"Incremental re-index failed: {e}")
+            return None
+
+    def start(self):
+        """Start watching for changes on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stop_event = asyncio.Event()
+        self._try_lead()
+        self._task = asyncio.get_running_loop().create_task(self._watch())
+        logger.info(
+            f"👀 Watching {self.data_dir} for knowledge changes "
+            f"({'leader' if self.is_leader else 'follower'})"
+        )
+
+    async def stop(self):
+        """Stop the watcher task"""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        try:
+            # awatch notices the stop event within its poll interval
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        self._task = None
+        self._release_lead()
+
+    async def _watch(self):
+        """Sync on file changes (watchfiles) or by polling the manifest"""
+        if awatch is not None:
+            async for _ in awatch(
+                self.data_dir,
+                # Source files for the leader, the saved snapshot for followers
+                watch_filter=lambda change, path: path.endswith(KNOWLEDGE_SUFFIXES + (SNAPSHOT_FILENAME,)),
+                debounce=settings.KNOWLEDGE_RELOAD_DEBOUNCE_MS,
+                stop_event=self._stop_event
+            ):
+                await self._reload_in_thread()
+        else:
+            while not self._stop_event.is_set():
+                await asyncio.sleep(settings.KNOWLEDGE_POLL_SECONDS)
+                await self._reload_in_thread()
+
+    async def _reload_in_thread(self):
+        """Run a sync without blocking request handling"""
+        try:
+            await asyncio.to_thread(self.sync)
+        except Exception as e:
+            logger.error(f"Knowledge reload failed, keeping current corpus: {e}")
+
+
+# Singleton instance
+_knowledge_reloader = None
+
+def get_knowledge_reloader() -> KnowledgeReloader:
+    """Get or create the knowledge reloader singleton"""
+    global _knowledge_reloader
+    if _knowledge_reloader is None:
+        _knowledge_reloader = KnowledgeReloader()
+    return _knowledge_reloader
@@ -0,0 +1,244 @@
+"""
+Knowledge Snapshot - Precompiled, versioned snapshot of the knowledge files
+
+Compiles ``data/countries/*.json``, ``data/policies/*.md`` and the top-level
+``data/*.json`` reference files into a single pickle with a content hash.
+Free-form visa fields (processing time, fees, proof of funds) are parsed
+into numeric ranges at this stage (see ``visa_normalizer``), and country
+files are validated into immutable ``Country`` objects (see
+``knowledge_model``).
+DocumentLoader, CountryService and DocumentIndexer all read from the same
+snapshot instead of globbing and parsing the files themselves, and the
+content hash doubles as a corpus version for cache keys.
+
+Build it ahead of deployment with:
+
+    python -m src.services.knowledge_snapshot
+
+At startup the snapshot is reused only if every source file still has the
+size and mtime recorded in its manifest; otherwise it is rebuilt from source.
+
+The file is a one-line JSON header followed by the pickled payload. The
+header carries the payload's SHA-256 (an HMAC keyed with
+``KNOWLEDGE_SNAPSHOT_KEY`` when that is set), which is checked before
+anything is unpickled; with a key, a writable ``data/`` directory is not
+enough to get code executed through a forged snapshot.
+"""
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.services.knowledge_model import Country, load_countries
+from src.core.config import settings
+from src.core.logging import logger
+
+
+SNAPSHOT_FORMAT = 3
+SNAPSHOT_FILENAME = "knowledge.snapshot"
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+class KnowledgeSnapshot:
+    """
+    Immutable view of all knowledge files.
+
+    Attributes:
+        version: Content hash of every source file (16 hex chars)
+        built_at: ISO timestamp of compilation
+        countries: Country objects keyed by file stem ("canada", "uk", ...)
+        policies: Policy markdown keyed by file stem
+        reference: Top-level JSON files keyed by stem
+            ("financial_thresholds", "skill_demand", "visa_types")
+        manifest: Relative path → (size, mtime_ns) of every source file
+    """
+
+    __slots__ = ("version", "built_at", "countries", "policies", "reference", "manifest")
+
+    def __init__(
+        self,
+        version: str,
+        built_at: str,
+        countries: Dict[str, Dict],
+        policies: Dict[str, str],
+        reference: Dict[str, Dict],
+        manifest: Dict[str, Tuple[int, int]]
+    ):
+        self.version = version
+        self.built_at = built_at
+        self.policies = policies
+        self.reference = reference
+        self.manifest = manifest
+        # Plain dicts (from JSON or a pickle) are validated into Country objects
+        self.countries: Dict[str, Country] = load_countries(
+            countries, self.financial_thresholds, self.currency_rates
+        )
+
+    @property
+    def financial_thresholds(self) -> Dict:
+        return self.reference.get("financial_thresholds", {})
+
+    @property
+    def currency_rates(self) -> Dict[str, float]:
+        return self.financial_thresholds.get("currency_conversion_usd", {})
+
+    def to_dict(self) -> Dict:
+        """Plain-builtin state, countries in their source JSON shape"""
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["countries"] = {stem: country.to_dict() for stem, country in self.countries.items()}
+        return state
+
+
+def _source_files(data_dir: Path):
+    """All knowledge source files, in a stable order"""
+    files = sorted((data_dir / "countries").glob("*.json"))
+    files += sorted((data_dir / "policies").glob("*.md"))
+    files += sorted(data_dir.glob("*.json"))
+    return files
+
+
+def _manifest(data_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """Stat every source file (cheap staleness check, no reads)"""
+    manifest = {}
+    for path in _source_files(data_dir):
+        stat = path.stat()
+        manifest[path.relative_to(data_dir).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return manifest
+
+
+def build_snapshot(data_dir: Path = DEFAULT_DATA_DIR) -> KnowledgeSnapshot:
+    """Compile all knowledge files under data_dir into a snapshot"""
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    countries: Dict[str, Dict] = {}
+    policies: Dict[str, str] = {}
+    reference: Dict[str, Dict] = {}
+
+    for path in _source_files(data_dir):
+        raw = path.read_bytes()
+        relative = path.relative_to(data_dir).as_posix()
+        digest.update(relative.encode("utf-8"))
+        digest.update(raw)
+
+        try:
+            if path.suffix == ".md":
+                policies[path.stem] = raw.decode("utf-8")
+            elif path.parent.name == "countries":
+                countries[path.stem.lower()] = json.loads(raw)
+            else:
+                reference[path.stem] = json.loads(raw)
+        except Exception as e:
+            logger.error(f"Error compiling {relative}: {e}")
+
+    snapshot = KnowledgeSnapshot(
+        version=digest.hexdigest()[:16],
+        built_at=datetime.now().isoformat(),
+        countries=countries,
+        policies=policies,
+        reference=reference,
+        manifest=_manifest(data_dir)
+    )
+    logger.info(
+        f"Compiled knowledge snapshot {snapshot.version}: "
+        f"{len(snapshot.countries)} countries, {len(policies)} policies, {len(reference)} reference files"
+    )
+    return snapshot
+
+
+def _payload_digest(payload: bytes) -> str:
+    """HMAC-SHA256 of a snapshot payload, or plain SHA-256 without a key"""
+    key = settings.KNOWLEDGE_SNAPSHOT_KEY.encode("utf-8")
+    if key:
+        return hmac.new(key, payload, hashlib.sha256).hexdigest()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def save_snapshot(snapshot: KnowledgeSnapshot, path: Path):
+    """Write a snapshot atomically (unique temp file in the same directory, then rename)"""
+    path = Path(path)
+    # Plain builtins only, so the file loads regardless of how this module was imported
+    payload = pickle.dumps(snapshot.to_dict(), protocol=pickle.HIGHEST_PROTOCOL)
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "version": snapshot.version,
+        "digest": _payload_digest(payload),
+    }).encode("utf-8")
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write(header + b"\n" + payload)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: Path) -> Optional[KnowledgeSnapshot]:
+    """Load a snapshot file; None if missing, incompatible or failing its digest check"""
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+
+    try:
+        raw = path.read_bytes()
+        header_line, _, payload = raw.partition(b"\n")
+        header = json.loads(header_line)
+        if header.get("format") != SNAPSHOT_FORMAT:
+            return None
+        if not hmac.compare_digest(str(header.get("digest", "")), _payload_digest(payload)):
+            logger.warning(f"Knowledge snapshot {path} failed its digest check, ignoring it")
+            return None
+        return KnowledgeSnapshot(**pickle.loads(payload))
+    except Exception as e:
+        logger.warning(f"Could not load knowledge snapshot {path}: {e}")
+        return None
+
+
+def is_fresh(snapshot: KnowledgeSnapshot, data_dir: Path = DEFAULT_DATA_DIR) -> bool:
+    """Whether no source file was added, removed or modified since the snapshot"""
+    return snapshot.manifest == _manifest(Path(data_dir))
+
+
+def load_or_build_snapshot(data_dir: Path = DEFAULT_DATA_DIR) -> KnowledgeSnapshot:
+    """Reuse the compiled snapshot if it is fresh, otherwise rebuild and save it"""
+    data_dir = Path(data_dir)
+    snapshot_path = data_dir / SNAPSHOT_FILENAME
+
+    snapshot = load_snapshot(snapshot_path)
+    if snapshot is not None and is_fresh(snapshot, data_dir):
+        logger.info(f"Loaded knowledge snapshot {snapshot.version}")
+        return snapshot
+
+    snapshot = build_snapshot(data_dir)
+    try:
+        save_snapshot(snapshot, snapshot_path)
+    except OSError as e:
+        # Read-only deployments still work, they just compile per process
+        logger.warning(f"Could not save knowledge snapshot: {e}")
+    return snapshot
+
+
+# Singleton instance
+_knowledge_snapshot: Optional[KnowledgeSnapshot] = None
+
+
+def get_knowledge_snapshot() -> KnowledgeSnapshot:
+    """Get or load the shared knowledge snapshot"""
+    global _knowledge_snapshot
+    if _knowledge_snapshot is None:
+        _knowledge_snapshot = load_or_build_snapshot()
+    return _knowledge_snapshot
+
+
+if __name__ == "__main__":
+    compiled = build_snapshot()
+    save_snapshot(compiled, DEFAULT_DATA_DIR / SNAPSHOT_FILENAME)
+    print(f"Wrote {DEFAULT_DATA_DIR / SNAPSHOT_FILENAME} (version {compiled.version})")
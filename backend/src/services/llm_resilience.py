@@ -0,0 +1,456 @@
+"""
+LLM Resilience - Retries, hedging and a circuit breaker for Groq calls
+
+Every direct Groq call from LLMService and ChatService goes through
+``LLMResilience.call``:
+
+- Transient failures (429, 5xx, timeouts, connection errors) are retried
+  with jittered exponential backoff via tenacity. A ``Retry-After`` header
+  from Groq overrides the backoff; if it asks for longer than we are
+  willing to wait, the call fails immediately instead.
+- Short interactive calls may be hedged: if the first request has not
+  answered by the operation's observed p95 latency, a second identical
+  request is fired and whichever answers first wins.
+- A circuit breaker opens after repeated upstream failures (or a high error
+  rate over a sliding window) and fails fast with CircuitOpenError, so
+  callers switch to the deterministic path-graph fallback instead of
+  queueing behind a degraded API. After a cooldown one probe request is
+  let through to decide whether to close again.
+
+Latency percentiles and error rates per operation are tracked against the
+configured SLOs and exposed on ``/health/metrics``.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+import httpx
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from src.core.config import settings
+from src.core.logging import logger
+
+T = TypeVar("T")
+
+# Upstream status codes worth retrying
+TRANSIENT_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+LATENCY_WINDOW = 200
+HEDGE_WORKERS = 8
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Groq while the circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on an HTTP error, if any"""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error is an upstream hiccup rather than a bad request"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+class LatencyTracker:
+    """
+    Sliding window of call latencies and outcomes for one operation.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds: Optional[float], ok: bool):
+        self.calls += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(seconds)
+        else:
+            self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of recent successful latencies"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def stats(self) -> Dict:
+        p50, p95, p99 = (self.percentile(q) for q in (50, 95, 99))
+        error_rate = self.error_rate
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "errorRate": round(error_rate, 4),
+            "latencySeconds": {
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p95": round(p95, 3) if p95 is not None else None,
+                "p99": round(p99, 3) if p99 is not None else None
+            },
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+            "slo": {
+                "p95TargetSeconds": settings.LLM_SLO_P95_SECONDS,
+                "errorRateTarget": settings.LLM_SLO_ERROR_RATE,
+                "met": (p95 is None or p95 <= settings.LLM_SLO_P95_SECONDS)
+                and error_rate <= settings.LLM_SLO_ERROR_RATE
+            }
+        }
+
+
+class CircuitBreaker:
+    """
+    Closed → open → half-open breaker over upstream call outcomes.
+
+    Opens after ``failure_threshold`` consecutive failures, or when the
+    error rate over the last ``window`` calls reaches ``error_rate`` (once
+    at least half the window has been observed). While open every call
+    fails fast; after ``cooldown`` seconds a single probe is allowed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, error_rate: float, window: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls would currently be rejected (probe slots count as open)"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight)
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected += 1
+            retry_after = max(1.0, self._opened_at + self.cooldown - now)
+        raise CircuitOpenError("Groq circuit breaker is open", retry_after=retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                logger.info("✅ Groq circuit breaker closed")
+            self._state = self.CLOSED
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Give back a half-open probe slot without recording an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            state = self._current_state(now)
+
+            failures = self._outcomes.count(False)
+            rate_tripped = (
+                len(self._outcomes) * 2 >= self._outcomes.maxlen
+                and failures / len(self._outcomes) >= self.error_rate
+            )
+            if state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold or rate_tripped:
+                if state != self.OPEN:
+                    self._times_opened += 1
+                    logger.warning(
+                        f"⚡ Groq circuit breaker opened "
+                        f"({self._consecutive_failures} consecutive failures, "
+                        f"{failures}/{len(self._outcomes)} recent calls failed)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = now
+                self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutiveFailures": self._consecutive_failures,
+                "recentErrorRate": round(self._outcomes.count(False) / len(self._outcomes), 4) if self._outcomes else 0.0,
+                "timesOpened": self._times_opened,
+                "rejected": self._rejected,
+                "retryAfterSeconds": round(max(0.0, self._opened_at + self.cooldown - now), 1) if state == self.OPEN else 0.0
+            }
+
+    def _current_state(self, now: float) -> str:
+        """Effective state, moving open → half-open once the cooldown passed (lock held)"""
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+        return self._state
+
+
+class LLMResilience:
+    """
+    Wraps single upstream attempts with breaker, retries and hedging.
+    """
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+
+    def call(self, send: Callable[[], T], operation: str, hedge: bool = False) -> T:
+        """
+        Run ``send`` (one complete HTTP attempt) resiliently.
+
+        Args:
+            send: Performs a single request and returns the parsed result;
+                must raise httpx errors for failed responses
+            operation: Name used for latency tracking ("chat", "analysis")
+            hedge: Fire a backup request after the operation's p95 latency
+
+        Raises:
+            CircuitOpenError: The breaker is open, use a fallback
+            The last upstream error once retries are exhausted
+        """
+        tracker = self._tracker(operation)
+        attempt = (lambda: self._hedged(send, tracker)) if hedge and settings.LLM_HEDGE_ENABLED else send
+
+        retrying = Retrying(
+            stop=stop_after_attempt(settings.LLM_RETRY_ATTEMPTS),
+            wait=self._backoff,
+            retry=retry_if_exception(self._should_retry),
+            before_sleep=self._log_retry,
+            reraise=True
+        )
+
+        started = time.monotonic()
+        try:
+            result = retrying(self._guarded, attempt)
+        except Exception:
+            with self._lock:
+                tracker.record(None, ok=False)
+            raise
+        with self._lock:
+            tracker.record(time.monotonic() - started, ok=True)
+        return result
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough samples exist"""
+        return self._hedge_delay(self._tracker(operation))
+
+    def stats(self) -> Dict:
+        """Breaker state and per-operation SLO metrics"""
+        with self._lock:
+            operations = {name: tracker.stats() for name, tracker in self._trackers.items()}
+        return {"circuitBreaker": self.breaker.stats(), "operations": operations}
+
+    def _guarded(self, attempt: Callable[[], T]) -> T:
+        """One attempt through the breaker; only upstream failures count against it"""
+        self.breaker.before_call()
+        try:
+            result = attempt()
+        except Exception as e:
+            if is_transient(e):
+                self.breaker.record_failure()
+            elif isinstance(e, httpx.HTTPStatusError):
+                # Groq answered; the request itself was bad
+                self.breaker.record_success()
+            else:
+                # e.g. shed by the rate governor - says nothing about Groq
+                self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _hedged(self, send: Callable[[], T], tracker: LatencyTracker) -> T:
+        """Run send, racing a second copy if the first is slower than p95"""
+        delay = self._hedge_delay(tracker)
+        primary = self._executor.submit(contextvars.copy_context().run, send)
+        if delay is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        backup = self._executor.submit(contextvars.copy_context().run, send)
+        with self._lock:
+            tracker.hedged += 1
+        logger.info(f"🏁 Hedging slow LLM call after {delay:.1f}s")
+
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            tracker.hedge_wins += 1
+                    # The loser finishes in the background; its result is dropped
+                    return future.result()
+                # Prefer reporting the primary's error over a shed backup
+                if error is None or future is primary:
+                    error = future.exception()
+        raise error
+
+    def _hedge_delay(self, tracker: LatencyTracker) -> Optional[float]:
+        with self._lock:
+            if len(tracker.latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+                return None
+            p95 = tracker.percentile(95)
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, p95)
+
+    def _tracker(self, operation: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(operation)
+            if tracker is None:
+                tracker = self._trackers[operation] = LatencyTracker()
+            return tracker
+
+    @staticmethod
+    def _should_retry(error: BaseException) -> bool:
+        if not is_transient(error):
+            return False
+        retry_after = retry_after_seconds(error)
+        return retry_after is None or retry_after <= settings.LLM_RETRY_MAX_WAIT_SECONDS
+
+    @staticmethod
+    def _backoff(retry_state) -> float:
+        """Retry-After when Groq sends one, otherwise full-jitter exponential backoff"""
+        error = retry_state.outcome.exception()
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return retry_after
+        return wait_random_exponential(
+            multiplier=settings.LLM_RETRY_BASE_SECONDS,
+            max=settings.LLM_RETRY_MAX_WAIT_SECONDS
+        )(retry_state)
+
+    @staticmethod
+    def _log_retry(retry_state):
+        error = retry_state.outcome.exception()
+        logger.warning(
+            f"🔁 Groq call failed ({error}), retry {retry_state.attempt_number}/"
+            f"{settings.LLM_RETRY_ATTEMPTS - 1} in {retry_state.next_action.sleep:.1f}s"
+        )
+
+
+_litellm_hook_installed = False
+
+
+def install_litellm_breaker_hook():
+    """
+    Feed LiteLLM (CrewAI) call outcomes into the circuit breaker.
+
+    CrewAI calls are not wrapped by LLMResilience, but their failures still
+    say Groq is degraded, so routes can skip the crew while the breaker is
+    open.
+    """
+    global _litellm_hook_installed
+    if _litellm_hook_installed:
+        return
+    try:
+        import litellm
+        from litellm.integrations.custom_logger import CustomLogger
+    except ImportError:
+        logger.debug("LiteLLM not installed, CrewAI calls do not feed the circuit breaker")
+        return
+
+    class CircuitBreakerCallback(CustomLogger):
+        def log_success_event(self, kwargs, response_obj, start_time, end_time):
+            get_llm_resilience().breaker.record_success()
+
+        def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+            error = kwargs.get("exception")
+            status = getattr(error, "status_code", None)
+            if status is None or status in TRANSIENT_STATUS_CODES:
+                get_llm_resilience().breaker.record_failure()
+
+    litellm.callbacks.append(CircuitBreakerCallback())
+    _litellm_hook_installed = True
+
+
+# Singleton instance
+_llm_resilience = None
+
+def get_llm_resilience() -> LLMResilience:
+    """Get or create the LLM resilience singleton"""
+    global _llm_resilience
+    if _llm_resilience is None:
+        _llm_resilience = LLMResilience(
+            CircuitBreaker(
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                error_rate=settings.CIRCUIT_ERROR_RATE,
+                window=settings.CIRCUIT_WINDOW,
+                cooldown=settings.CIRCUIT_COOLDOWN_SECONDS
+            )
+        )
+    return _llm_resilience
+
+
+def llm_degraded() -> bool:
+    """Whether Groq calls would currently fail fast (use deterministic fallbacks)"""
+    return get_llm_resilience().breaker.is_open
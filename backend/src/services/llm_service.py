@@ -7,6 +7,11 @@ import httpx
 from typing import Dict, List, Optional
 from src.core.config import settings
 from src.core.logging import logger
+from src.services.rate_limiter import get_llm_governor
+from src.services.llm_resilience import get_llm_resilience
+from src.services.model_router import get_model_router
+from src.services.eligibility_service import get_eligibility_engine
+from src.utils.single_flight import fingerprint, get_single_flight
 
 
 class LLMService:
@@ -18,7 +23,7 @@ class LLMService:
     def __init__(self):
         self.api_key = settings.GROQ_API_KEY
         self.base_url = settings.GROQ_BASE_URL
-        self.model = settings.GROQ_MODEL
+        self.model = get_model_router().primary("analysis")
         
         if not self.api_key:
             raise ValueError("GROQ_API_KEY is not set in environment variables")
@@ -29,27 +34,43 @@ class LLMService:
         }
         logger.info(f"LLMService initialized with Groq model: {self.model}")
     
-    def _call_groq_api(self, messages: List[Dict], max_tokens: int = 4000, temperature: float = 0.7) -> str:
+    def _call_groq_api(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        route: str = "analysis"
+    ) -> str:
         """
-        Make a direct HTTP call to Groq API.
+        Make a direct HTTP call to Groq API, on the model routed for ``route``.
         """
         payload = {
-            "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
             "response_format": {"type": "json_object"}
         }
         
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+        def send() -> Dict:
+            governor = get_llm_governor()
+            estimated_tokens = governor.acquire_for_messages(messages, max_tokens)
+            result = get_model_router().send(route, post)
+            governor.record_usage(estimated_tokens, result.get("usage", {}).get("total_tokens"))
+            return result
+        
+        def post(model: str) -> Dict:
+            with httpx.Client(timeout=120.0) as client:
+                response = client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json={**payload, "model": model}
+                )
+                response.raise_for_status()
+                return response.json()
+        
+        # Long JSON analyses are retried but never hedged (too costly to duplicate)
+        result = get_llm_resilience().call(send, operation="analysis")
+        return result["choices"][0]["message"]["content"]
     
     def analyze_profile(
         self, 
@@ -60,6 +81,22 @@ class LLMService:
         """
         Perform complete profile analysis using LLM.
         
+        Concurrent calls with identical inputs share one LLM request.
+        """
+        key = fingerprint(user_profile, policy_context, country_data)
+        return get_single_flight("llm.analyze_profile").do(
+            key, lambda notify: self._analyze_profile(user_profile, policy_context, country_data)
+        )
+    
+    def _analyze_profile(
+        self, 
+        user_profile: Dict, 
+        policy_context: str,
+        country_data: List[Dict]
+    ) -> Dict:
+        """
+        Perform complete profile analysis using LLM.
+        
         Args:
             user_profile: User's profile data
             policy_context: Retrieved policy documents as context
@@ -68,6 +105,8 @@ class LLMService:
         Returns:
             Complete analysis result matching frontend schema
         """
+        # Only visas the profile is eligible or borderline for go in the prompt
+        country_data = get_eligibility_engine().filter_country_data(country_data, user_profile)
         
         # Build the system prompt
         system_prompt = """You are an expert immigration consultant AI with deep knowledge of global visa policies. 
@@ -151,6 +190,8 @@ IMPORTANT:
 {policy_context}
 
 ## COUNTRY-SPECIFIC DATA:
+Visa lists are pre-screened against the profile: recommend only the visas listed
+(mind any "borderline" gaps); "screened_out_visas" fail a hard requirement.
 {json.dumps(country_data, indent=2)}
 
 Based on this information, provide a comprehensive immigration analysis with ranked pathways.
@@ -187,8 +228,25 @@ Return ONLY valid JSON matching the schema specified."""
     ) -> Dict:
         """
         Deep analysis using multi-step reasoning (CrewAI-style).
+        
+        Concurrent calls with identical inputs share one LLM request.
+        """
+        key = fingerprint(user_profile, policy_context, country_data)
+        return get_single_flight("llm.analyze_profile_deep").do(
+            key, lambda notify: self._analyze_profile_deep(user_profile, policy_context, country_data)
+        )
+    
+    def _analyze_profile_deep(
+        self, 
+        user_profile: Dict, 
+        policy_context: str,
+        country_data: List[Dict]
+    ) -> Dict:
+        """
+        Deep analysis using multi-step reasoning (CrewAI-style).
         This method simulates the multi-agent approach with enhanced prompts.
         """
+        country_data = get_eligibility_engine().filter_country_data(country_data, user_profile)
         
         # Enhanced system prompt for deep analysis
         system_prompt = """You are a team of 4 expert immigration consultants working together:
@@ -297,6 +355,8 @@ IMPORTANT GUIDELINES:
 {policy_context}
 
 ### COUNTRY-SPECIFIC DATA:
+Visa lists are pre-screened against the profile: recommend only the visas listed
+(mind any "borderline" gaps); "screened_out_visas" fail a hard requirement.
 {json.dumps(country_data, indent=2)}
 
 ---
@@ -318,7 +378,7 @@ Return ONLY valid JSON matching the schema specified."""
                 {"role": "user", "content": user_prompt}
             ]
             
-            result_text = self._call_groq_api(messages, max_tokens=6000, temperature=0.7)
+            result_text = self._call_groq_api(messages, max_tokens=6000, temperature=0.7, route="analysis.deep")
             logger.info("Deep analysis response received, parsing JSON...")
             
             result = json.loads(result_text)
@@ -0,0 +1,186 @@
+"""
+Model Router - Picks the Groq model for each agent stage and service call
+
+Extraction-style calls (profile parsing, structured-output repair) do not
+need the 70B model and run several times faster on a small one; the stages
+that reason over routes and risks stay on the large one. ``MODEL_ROUTES`` in
+Settings maps a route name ("profile_analyst", "chat", ...) to "large",
+"fast" or a literal model id.
+
+Groq rate limits are per model, so when one model answers 429 it is marked
+as cooling down until its Retry-After passes and routes that use it switch
+to the other model in the meantime.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from src.core.config import settings
+from src.core.logging import logger
+from src.services.llm_resilience import retry_after_seconds
+
+T = TypeVar("T")
+
+# Cooldown applied when a 429 carries no usable Retry-After
+DEFAULT_COOLDOWN_SECONDS = 10.0
+
+
+class ModelRouter:
+    """
+    Routing table from call type to model, with rate-limit fallback.
+    """
+
+    def __init__(self, routes: Dict[str, str], large: str, fast: str, fallback_enabled: bool = True):
+        self.large = large
+        self.fast = fast
+        self.fallback_enabled = fallback_enabled
+        self.routes = {route: self.resolve(model) for route, model in routes.items()}
+        self._limited_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+        self.fallbacks = 0
+
+    def resolve(self, model: str) -> str:
+        """Model id for a "large"/"fast" alias (literal ids pass through)"""
+        return {"large": self.large, "fast": self.fast}.get(model, model)
+
+    def primary(self, route: str) -> str:
+        """Configured model for a route; unknown routes get the large model"""
+        return self.routes.get(route, self.large)
+
+    def model_for(self, route: str) -> str:
+        """Model to use for a route right now, avoiding one that is cooling down"""
+        model = self.primary(route)
+        if not self.is_limited(model):
+            return model
+        fallback = self.fallback_for(model)
+        if fallback is None:
+            return model
+        with self._lock:
+            self.fallbacks += 1
+        logger.info(f"🔀 {route}: {model} is rate-limited, routing to {fallback}")
+        return fallback
+
+    def alternate(self, model: str) -> Optional[str]:
+        """The configured fallback for a model, or None if fallback is off"""
+        if not self.fallback_enabled:
+            return None
+        fallback = self.fast if model != self.fast else self.large
+        return fallback if fallback != model else None
+
+    def fallback_for(self, model: str) -> Optional[str]:
+        """The model to switch to now, or None if there is none or it is also limited"""
+        fallback = self.alternate(model)
+        if fallback is None or self.is_limited(fallback):
+            return None
+        return fallback
+
+    def is_limited(self, model: str) -> bool:
+        with self._lock:
+            return self._limited_until.get(model, 0.0) > time.monotonic()
+
+    def mark_rate_limited(self, model: str, retry_after: Optional[float] = None) -> Optional[str]:
+        """Record a 429 for a model; returns the model to switch to, if any"""
+        cooldown = retry_after if retry_after is not None else DEFAULT_COOLDOWN_SECONDS
+        with self._lock:
+            self.rate_limited += 1
+            self._limited_until[model] = max(
+                self._limited_until.get(model, 0.0), time.monotonic() + cooldown
+            )
+        logger.warning(f"⏳ {model} rate-limited for {cooldown:.1f}s")
+        return self.fallback_for(model)
+
+    def send(self, route: str, post: Callable[[str], T]) -> T:
+        """
+        Run ``post(model)`` with the routed model. A 429 marks that model as
+        cooling down and the request is re-sent at once on the fallback model
+        (without waiting out the Retry-After); other errors propagate.
+        """
+        model = self.model_for(route)
+        try:
+            return self._post(model, post)
+        except httpx.HTTPStatusError as e:
+            fallback = self.fallback_for(model) if e.response.status_code == 429 else None
+            if fallback is None:
+                raise
+        with self._lock:
+            self.fallbacks += 1
+        logger.info(f"🔀 {route}: retrying on {fallback}")
+        return self._post(fallback, post)
+
+    def _post(self, model: str, post: Callable[[str], T]) -> T:
+        try:
+            return post(model)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.mark_rate_limited(model, retry_after_seconds(e))
+            raise
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            limited = {
+                model: round(until - now, 1)
+                for model, until in self._limited_until.items()
+                if until > now
+            }
+            return {
+                "routes": dict(self.routes),
+                "rateLimited": limited,
+                "rateLimitEvents": self.rate_limited,
+                "fallbacks": self.fallbacks,
+                "fallbackEnabled": self.fallback_enabled
+            }
+
+
+_litellm_hook_installed = False
+
+
+def install_litellm_router_hook():
+    """
+    Mark models as rate-limited when a LiteLLM (CrewAI) call gets a 429, so
+    the next crew run routes its stages around them.
+    """
+    global _litellm_hook_installed
+    if _litellm_hook_installed:
+        return
+    try:
+        import litellm
+        from litellm.integrations.custom_logger import CustomLogger
+    except ImportError:
+        logger.debug("LiteLLM not installed, CrewAI 429s do not reach the model router")
+        return
+
+    class ModelRouterCallback(CustomLogger):
+        def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+            error = kwargs.get("exception")
+            if getattr(error, "status_code", None) != 429:
+                return
+            model = str(kwargs.get("model") or "").removeprefix("groq/")
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            try:
+                retry_after = float(headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+            get_model_router().mark_rate_limited(model, retry_after)
+
+    litellm.callbacks.append(ModelRouterCallback())
+    _litellm_hook_installed = True
+
+
+# Singleton instance
+_model_router = None
+
+def get_model_router() -> ModelRouter:
+    """Get or create the model router singleton"""
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter(
+            settings.MODEL_ROUTES,
+            large=settings.GROQ_MODEL,
+            fast=settings.GROQ_FAST_MODEL,
+            fallback_enabled=settings.MODEL_FALLBACK_ENABLED
+        )
+    return _model_router
@@ -0,0 +1,449 @@
+"""
+Path Graph Service - Precomputed country/visa transition graph
+
+Builds a directed graph of stepping-stone transitions once from
+``data/countries/*.json`` (``unlocks_regions``, ``stepping_stone_potential``
+and ``visa_types``), enumerates candidate multi-hop routes to every
+destination with a best-first search, and scores them per profile with
+``ScoringService.calculate_path_score``. This gives deterministic,
+data-driven paths for Explore without an LLM call.
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.services.country_registry import CountryRegistry
+from src.services.country_service import CountryService, get_country_service
+from src.services.knowledge_model import Country, VisaType
+from src.services.scoring_service import ScoringService
+from src.services.visa_normalizer import fee_usd, processing_months
+from src.core.logging import logger
+
+
+# What each ``unlocks_regions`` label opens up: a set of regions and/or ISO codes
+UNLOCK_TARGETS = {
+    "European Union": {"Europe"},
+    "Schengen Area": {"Europe"},
+    "North America": {"North America"},
+    "Asia": {"Asia"},
+    "Asia-Pacific": {"Asia-Pacific"},
+    "Middle East": {"Middle East"},
+    "Gateway to West": {"North America", "Europe", "Asia-Pacific"},
+    "Global mobility hub": {"North America", "Europe", "Asia-Pacific", "Asia"},
+    "Commonwealth connections": {"CA", "AU", "SG"},
+    "UK": {"GB"},
+}
+
+POTENTIAL_RANK = {"High": 3, "Medium": 2, "Low": 1}
+
+EDUCATION_POINTS = {"high_school": 10, "bachelors": 25, "masters": 35, "phd": 40}
+
+# English ability: self-reported proficiency, or an IELTS-style band when given
+PROFICIENCY_POINTS = {"native": 10, "fluent": 10, "advanced": 8, "intermediate": 5, "basic": 2}
+IELTS_BAND_POINTS = [(8.0, 10), (7.0, 8), (6.0, 5), (0.0, 2)]
+DEFAULT_LANGUAGE_POINTS = 5
+
+TIMELINE_YEARS = {"immediate": 1, "within_1_year": 1, "within_2_years": 2, "flexible": 5}
+
+# Years typically spent in a stepping-stone country before moving on
+STEPPING_STONE_YEARS = 2
+
+STUDY_VISA_MARKERS = ("student", "study", "f1")
+
+
+@dataclass(frozen=True)
+class TransitionEdge:
+    """A stepping-stone transition from one country to another"""
+    source: str
+    target: str
+    via: str
+    potential: int
+
+
+class PathGraph:
+    """
+    Country/visa transition graph with precomputed candidate routes.
+
+    Nodes are countries keyed by ISO code. An edge A → B exists when A has
+    Medium/High stepping-stone potential and one of A's ``unlocks_regions``
+    covers B's region (or B itself). Any country can also be entered
+    directly from the user's origin. Queries accept any identifier the
+    country registry knows ("GB", "UK", "British").
+    """
+
+    def __init__(
+        self,
+        countries: List[Country],
+        scoring_service: ScoringService,
+        registry: CountryRegistry,
+        max_steps: int = 3,
+        candidates_per_destination: int = 12
+    ):
+        self.scoring = scoring_service
+        self.registry = registry
+        self.max_steps = max_steps
+
+        self.nodes: Dict[str, Country] = {c.code: c for c in countries}
+        self.entry_visas: Dict[str, VisaType] = {
+            code: self._select_entry_visa(country) for code, country in self.nodes.items()
+        }
+        self.edges: Dict[str, List[TransitionEdge]] = {code: [] for code in self.nodes}
+        self.incoming: Dict[str, List[TransitionEdge]] = {code: [] for code in self.nodes}
+        self._build_edges()
+
+        self.routes: Dict[str, List[Tuple[str, ...]]] = {
+            code: self._best_first_routes(code, candidates_per_destination)
+            for code in self.nodes
+        }
+
+        logger.info(
+            f"PathGraph built: {len(self.nodes)} countries, "
+            f"{sum(len(e) for e in self.edges.values())} transitions"
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _build_edges(self):
+        """Create stepping-stone edges from unlocks_regions"""
+        for source, country in self.nodes.items():
+            potential = POTENTIAL_RANK[country.stepping_stone_potential]
+            if potential < POTENTIAL_RANK["Medium"]:
+                continue
+
+            for label in country.unlocks_regions:
+                targets = UNLOCK_TARGETS.get(label, set())
+                for target, target_country in self.nodes.items():
+                    if target == source:
+                        continue
+                    if target in targets or target_country.region in targets:
+                        if any(e.target == target for e in self.edges[source]):
+                            continue
+                        edge = TransitionEdge(source, target, label, potential)
+                        self.edges[source].append(edge)
+                        self.incoming[target].append(edge)
+
+    def _select_entry_visa(self, country: Country) -> VisaType:
+        """First work-permitted, non-study visa (data lists visas by priority)"""
+        for visa in country.visa_types:
+            if visa.work_permitted is not False and not any(
+                marker in visa.type for marker in STUDY_VISA_MARKERS
+            ):
+                return visa
+        return country.visa_types[0]
+
+    def _step_cost(self, code: str) -> float:
+        """Search cost of entering a country: harder countries cost more"""
+        friendliness = self.nodes[code].immigration_friendliness
+        return 20 + (10 - friendliness) * 5
+
+    def _best_first_routes(self, destination: str, k: int) -> List[Tuple[str, ...]]:
+        """
+        Enumerate the k cheapest routes ending at ``destination``.
+
+        Searches backwards over incoming edges with a priority queue, so
+        routes come out in cost order and longer detours are only expanded
+        once cheaper options are exhausted.
+        """
+        frontier = [(self._step_cost(destination), (destination,))]
+        routes = []
+
+        while frontier and len(routes) < k:
+            cost, route = heapq.heappop(frontier)
+            routes.append(route)
+
+            if len(route) >= self.max_steps:
+                continue
+            for edge in self.incoming[route[0]]:
+                if edge.source in route:
+                    continue
+                # Stronger stepping stones are cheaper to route through
+                edge_cost = self._step_cost(edge.source) - edge.potential * 5
+                heapq.heappush(frontier, (cost + edge_cost, (edge.source,) + route))
+
+        return routes
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def find_paths(
+        self,
+        destination: str,
+        user_profile: Dict,
+        origin: Optional[str] = None,
+        k: int = 3
+    ) -> List[Dict]:
+        """Score the precomputed routes to a destination for this profile"""
+        code = self.country_code(destination)
+        if code not in self.nodes:
+            return []
+
+        routes = self.candidate_routes(code, origin)
+        if not routes:
+            return []
+
+        # Score every candidate in one vectorized pass, then build the
+        # detailed breakdown only for the routes that are returned
+        match = self.profile_match(user_profile, code)
+        components = [self.route_components(route, user_profile, match) for route in routes]
+        batch = self.scoring.score_batch(**{
+            key: [c[key] for c in components] for key in components[0]
+        })
+        order = sorted(
+            range(len(routes)),
+            key=lambda i: (-batch["scores"][i], len(routes[i]))
+        )
+
+        paths = []
+        for i in order[:k]:
+            score, breakdown = self.scoring.calculate_path_score(**components[i])
+            paths.append(self._format_path(routes[i], score, breakdown, user_profile))
+        return paths
+
+    def find_paths_for_targets(
+        self,
+        target_countries: List[str],
+        user_profile: Dict,
+        origin: Optional[str] = None,
+        k: int = 3
+    ) -> List[Dict]:
+        """Best paths across several destinations, ranked together"""
+        paths = []
+        seen: Set[str] = set()
+        for destination in target_countries:
+            for path in self.find_paths(destination, user_profile, origin, k=k):
+                if path["id"] not in seen:
+                    seen.add(path["id"])
+                    paths.append(path)
+
+        paths.sort(key=lambda p: -p["overallScore"])
+        for i, path in enumerate(paths[:k]):
+            path["rank"] = i + 1
+            path["recommendation"] = "Recommended" if i == 0 else "Alternative option"
+        return paths[:k]
+
+    def get_stepping_stones(self, destination: str, limit: int = 3) -> List[Dict]:
+        """Countries with a transition edge into the destination"""
+        code = self.country_code(destination)
+        edges = sorted(
+            self.incoming.get(code, []),
+            key=lambda e: (-e.potential, -self.nodes[e.source].immigration_friendliness)
+        )
+        suggestions = []
+        for edge in edges[:limit]:
+            source = self.nodes[edge.source]
+            visa = self.entry_visas[edge.source]
+            suggestions.append({
+                "country": source.name,
+                "countryCode": edge.source,
+                "reason": source.notes,
+                "typicalDuration": visa.duration or f"{STEPPING_STONE_YEARS} years",
+                "benefits": [v.name for v in source.visa_types[:3]] + [f"Unlocks {edge.via}"],
+                "unlocks": [e.target for e in self.edges[edge.source]]
+            })
+        return suggestions
+
+    # ------------------------------------------------------------------
+    # Scoring and formatting
+    # ------------------------------------------------------------------
+
+    def candidate_routes(self, destination: str, origin: Optional[str] = None) -> List[Tuple[str, ...]]:
+        """Precomputed routes to a destination that avoid the origin country"""
+        origin_code = self.country_code(origin)
+        return [route for route in self.routes.get(self.country_code(destination), []) if origin_code not in route]
+
+    def country_code(self, country: Optional[str]) -> str:
+        """ISO code for a country identifier (upper-cased input if unknown)"""
+        return self.registry.code(country) or (country or "").upper()
+
+    def profile_match(self, user_profile: Dict, destination: str) -> float:
+        """0-100 profile fit for a destination (the same for every route to it)"""
+        return _profile_match(user_profile, destination)
+
+    def route_components(
+        self,
+        route: Tuple[str, ...],
+        user_profile: Dict,
+        profile_match: Optional[float] = None
+    ) -> Dict:
+        """
+        Score components of a route, as calculate_path_score arguments.
+        ``profile_match`` may be passed in when scoring many routes to the
+        same destination.
+        """
+        destination = self.nodes[route[-1]]
+        friendliness = [self.nodes[c].immigration_friendliness for c in route]
+
+        return {
+            "profile_match": profile_match if profile_match is not None else _profile_match(user_profile, route[-1]),
+            "financial_readiness": _financial_readiness(user_profile),
+            "skill_demand": _skill_demand(destination, user_profile),
+            "risk_score": 100 - sum(friendliness) / len(friendliness) * 10,
+            "timeline_fit": self._timeline_fit(route, user_profile),
+            "path_steps": len(route)
+        }
+
+    def route_totals(self, route: Tuple[str, ...]) -> Dict[str, Dict[str, float]]:
+        """
+        Month and USD fee ranges of a whole route: the years spent in each
+        stepping stone plus the destination's processing time, and the
+        application fees of every visa along the way.
+        """
+        final = processing_months(self.entry_visas[route[-1]])
+        stepping_months = (len(route) - 1) * STEPPING_STONE_YEARS * 12
+        fees = [fee_usd(self.entry_visas[code]) for code in route]
+        return {
+            "months": {"min": stepping_months + final["min"], "max": stepping_months + final["max"]},
+            "feesUsd": {"min": round(sum(f["min"] for f in fees)), "max": round(sum(f["max"] for f in fees))}
+        }
+
+    def _timeline_fit(self, route: Tuple[str, ...], user_profile: Dict) -> float:
+        """100 when the route fits the user's timeline, decreasing per year over"""
+        timeline = user_profile.get("goals", {}).get("timeline", "flexible")
+        target_years = TIMELINE_YEARS.get(timeline, 2)
+        estimated_years = self.route_totals(route)["months"]["max"] / 12
+        if estimated_years <= target_years:
+            return 100
+        return max(20, 100 - (estimated_years - target_years) * 25)
+
+    def _format_path(
+        self,
+        route: Tuple[str, ...],
+        score: int,
+        breakdown: Dict,
+        user_profile: Dict
+    ) -> Dict:
+        """Format a route in the frontend path schema"""
+        steps = []
+        for i, code in enumerate(route):
+            country = self.nodes[code]
+            visa = self.entry_visas[code]
+            is_final = i == len(route) - 1
+            steps.append({
+                "order": i + 1,
+                "country": country.name,
+                "countryCode": code,
+                "visaType": visa.name,
+                "duration": visa.duration or "Varies",
+                "purpose": (
+                    "Work authorization and settlement" if is_final
+                    else f"Build international experience and savings ({STEPPING_STONE_YEARS} years)"
+                ),
+                "requirements": list(visa.requirements[:4]),
+                "estimatedCost": round(fee_usd(visa)["min"]),
+                "currency": "USD"
+            })
+
+        names = [step["country"] for step in steps]
+        risk_score = 100 - breakdown["components"]["risk_level"]["raw_value"]
+        probability, _ = self.scoring.calculate_approval_probability(
+            path_score=score,
+            risk_score=risk_score,
+            has_blockers=False,
+            profile_strength=_profile_match(user_profile, route[-1])
+        )
+        stepping = len(route) > 1
+
+        return {
+            "id": "graph_" + "_".join(route).lower(),
+            "rank": 0,
+            "name": (
+                f"{' → '.join(names[:-1])} Springboard to {names[-1]}" if stepping
+                else f"Direct Path to {names[-1]}"
+            ),
+            "description": " → ".join(names),
+            "steps": steps,
+            "totalDuration": (
+                f"{(len(route) - 1) * STEPPING_STONE_YEARS}+ years" if stepping
+                else self.entry_visas[route[-1]].processing_time or "Varies"
+            ),
+            "totals": self.route_totals(route),
+            "overallScore": score,
+            "approvalProbability": round(probability * 100),
+            "riskLevel": _risk_label(risk_score),
+            "whyThisPath": breakdown["explanation"],
+            "recommendation": "",
+            "scoreBreakdown": breakdown
+        }
+
+
+def _profile_match(user_profile: Dict, destination: Optional[str] = None) -> float:
+    """
+    Education, experience and English fit on a 0-100 scale. Destinations
+    with a points test use the exact points against its competitive score.
+    """
+    if destination is not None:
+        # Imported here: points_service reaches this module through sensitivity_service
+        from src.services.points_service import get_points_calculator
+        match = get_points_calculator().profile_match(destination, user_profile)
+        if match is not None:
+            return match
+    education = user_profile.get("education", {}).get("level", "bachelors")
+    years = user_profile.get("workExperience", {}).get("yearsOfExperience", 0) or 0
+    return min(
+        100,
+        25 + EDUCATION_POINTS.get(education, 20) + min(years, 8) * 5 + _language_points(user_profile)
+    )
+
+
+def _language_points(user_profile: Dict) -> int:
+    """0-10 points for English, preferring a test band over self-reported level"""
+    for entry in user_profile.get("languages") or []:
+        if not isinstance(entry, dict) or entry.get("language", "").lower() != "english":
+            continue
+        band = entry.get("ieltsScore")
+        if band is not None:
+            return next(points for minimum, points in IELTS_BAND_POINTS if float(band) >= minimum)
+        return PROFICIENCY_POINTS.get(str(entry.get("proficiency", "")).lower(), DEFAULT_LANGUAGE_POINTS)
+    return DEFAULT_LANGUAGE_POINTS
+
+
+def _financial_readiness(user_profile: Dict) -> float:
+    """Savings on a 0-100 scale ($25k+ counts as fully ready)"""
+    savings = user_profile.get("financial", {}).get("savingsUsd", 0) or 0
+    return min(100, savings / 250)
+
+
+def _skill_demand(country: Country, user_profile: Dict) -> float:
+    """90 when the user's field or skills appear in the country's demand list"""
+    work = user_profile.get("workExperience", {})
+    terms = [work.get("title", ""), user_profile.get("education", {}).get("field", "")]
+    terms += work.get("skills", [])
+    terms = [t.lower() for t in terms if t]
+
+    demand = [d.lower() for d in country.skill_demand]
+    if any(term in d or d in term for term in terms for d in demand):
+        return 90
+    return 50
+
+
+def _risk_label(risk_score: float) -> str:
+    """Map a risk score to low/medium/high"""
+    if risk_score <= 30:
+        return "low"
+    if risk_score <= 60:
+        return "medium"
+    return "high"
+
+
+# Singleton instance
+_path_graph: Optional[PathGraph] = None
+
+
+def build_path_graph(country_service: CountryService) -> PathGraph:
+    """Build a path graph from a country service's data"""
+    return PathGraph(
+        countries=country_service.get_all_country_data(),
+        scoring_service=ScoringService(),
+        registry=country_service.registry
+    )
+
+
+def get_path_graph() -> PathGraph:
+    """Get or build the path graph singleton"""
+    global _path_graph
+    if _path_graph is None:
+        _path_graph = build_path_graph(get_country_service())
+    return _path_graph
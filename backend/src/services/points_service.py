@@ -0,0 +1,392 @@
+"""
+Points Service - Deterministic points tests (Canada CRS, Australia 189/190, UK Skilled Worker)
+
+The points tables from the policy documents (``canada_express_entry.md``,
+``australia_skilled_migration.md``, ``uk_skilled_worker.md``, completed with
+the official CRS grid where the document only gives maxima) are encoded as
+bracket tables. A batch of profiles is scored per system in one vectorized
+pass (``np.searchsorted`` over the bracket bounds), so exact points come
+back in microseconds instead of as an LLM estimate.
+
+Facts a profile cannot express (Canadian experience, nominations, job
+offers, partner skills...) are read from an optional ``pointsClaims`` dict
+on the profile; anything not claimed scores zero.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.eligibility_service import CEFR_TO_IELTS, CLB_TO_IELTS, profile_values
+from src.services.knowledge_snapshot import KnowledgeSnapshot, get_knowledge_snapshot
+from src.services.sensitivity_service import EDUCATION_ORDER
+from src.core.logging import logger
+
+
+class PointsTable:
+    """Bracket table: a value scores the points of the highest minimum it reaches (NaN scores 0)"""
+
+    __slots__ = ("bounds", "points")
+
+    def __init__(self, brackets: Iterable[Tuple[float, float]]):
+        brackets = list(brackets)
+        self.bounds = np.array([minimum for minimum, _ in brackets], dtype=float)
+        self.points = np.array([0] + [points for _, points in brackets], dtype=float)
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self.bounds, np.nan_to_num(values, nan=-np.inf), side="right")
+        return self.points[index]
+
+
+def _by_education(ranks: np.ndarray, points: List[float]) -> np.ndarray:
+    """Points per EDUCATION_ORDER rank (unknown education scores 0)"""
+    table = np.array(points, dtype=float)
+    return np.where(np.isnan(ranks), 0, table[np.nan_to_num(ranks).astype(int)])
+
+
+# ----------------------------------------------------------------------
+# Canada - Comprehensive Ranking System (single applicant)
+# ----------------------------------------------------------------------
+
+IELTS_TO_CLB = PointsTable((band, clb) for clb, band in sorted(CLB_TO_IELTS.items()))
+
+CRS_AGE = PointsTable([
+    (18, 99), (19, 105), (20, 110), (30, 105), (31, 99), (32, 94), (33, 88), (34, 83),
+    (35, 77), (36, 72), (37, 66), (38, 61), (39, 55), (40, 50), (41, 39), (42, 28),
+    (43, 17), (44, 6), (45, 0),
+])
+CRS_EDUCATION = [30, 120, 135, 150]
+# Per ability; the profile's overall band is applied to all four abilities
+CRS_LANGUAGE_PER_ABILITY = PointsTable([(4, 6), (6, 9), (7, 17), (8, 23), (9, 31), (10, 34)])
+CRS_CANADIAN_EXPERIENCE = PointsTable([(1, 40), (2, 53), (3, 64), (4, 72), (5, 80)])
+CRS_CANADIAN_EDUCATION = PointsTable([(1, 15), (3, 30)])
+
+# Skill transferability: points by (first factor tier, second factor tier)
+CRS_TRANSFERABILITY = np.array([[0, 0, 0], [0, 13, 25], [0, 25, 50]], dtype=float)
+CRS_EDUCATION_TIER = [0, 1, 2, 2]
+CRS_CLB_TIER = PointsTable([(7, 1), (9, 2)])
+CRS_CANADIAN_EXPERIENCE_TIER = PointsTable([(1, 1), (2, 2)])
+CRS_FOREIGN_EXPERIENCE_TIER = PointsTable([(1, 1), (3, 2)])
+CRS_TRANSFERABILITY_GROUP_CAP = 50
+CRS_TRANSFERABILITY_CAP = 100
+
+CRS_PROVINCIAL_NOMINATION = 600
+CRS_JOB_OFFER = {"senior": 200, "skilled": 50}
+CRS_SIBLING = 15
+FSW_MIN_CLB = 7
+
+# ----------------------------------------------------------------------
+# Australia - Skilled Independent (189) / Skilled Nominated (190)
+# ----------------------------------------------------------------------
+
+AU_AGE = PointsTable([(18, 25), (25, 30), (33, 25), (40, 15), (45, 0)])
+AU_ENGLISH = PointsTable([(7, 10), (8, 20)])
+AU_OVERSEAS_EXPERIENCE = PointsTable([(3, 5), (5, 10), (8, 15)])
+AU_AUSTRALIAN_EXPERIENCE = PointsTable([(1, 5), (3, 10), (5, 15), (8, 20)])
+AU_EXPERIENCE_CAP = 20
+AU_EDUCATION = [0, 15, 15, 20]
+AU_BONUS_CLAIMS = ("australianStudy", "specialistEducation", "regionalStudy", "communityLanguage", "professionalYear")
+AU_BONUS_POINTS = 5
+AU_NOMINATION = {"australia_189": 0, "australia_190": 5}
+AU_MAX_AGE = 45
+AU_MIN_IELTS = 6.0
+
+# ----------------------------------------------------------------------
+# UK - Skilled Worker
+# ----------------------------------------------------------------------
+
+UK_SALARY_GBP = PointsTable([(23580, 10), (26200, 20)])
+UK_MIN_IELTS = CEFR_TO_IELTS["b1"]
+UK_STEM_WORDS = ("science", "engineering", "technology", "computer", "software", "math", "physics", "chemistry", "biology", "data")
+
+# Optional profile["pointsClaims"] keys and their defaults
+CLAIM_DEFAULTS = {
+    "canadianExperienceYears": 0,
+    "canadianEducationYears": 0,
+    "provincialNomination": False,
+    "canadianJobOffer": "none",
+    "frenchClb": 0,
+    "siblingInCanada": False,
+    "australianExperienceYears": 0,
+    "australianStudy": False,
+    "specialistEducation": False,
+    "regionalStudy": False,
+    "communityLanguage": False,
+    "professionalYear": False,
+    "partnerPoints": 0,
+    "ukJobOffer": False,
+    "ukSalaryGbp": None,
+    "shortageOccupation": False,
+    "newEntrant": False,
+}
+
+# Destination country → points system feeding the path score's profile match
+DESTINATION_SYSTEMS = {"CA": "canada_crs", "AU": "australia_189", "GB": "uk_skilled_worker"}
+
+# Profile match ceiling when a hard requirement of the points test is not met
+BLOCKED_MATCH_CAP = 25.0
+
+
+class PointsSystem:
+    """One points test: its scoring function and thresholds."""
+
+    __slots__ = ("key", "name", "country_code", "max_points", "pass_mark", "competitive", "notes", "compute")
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        country_code: str,
+        max_points: int,
+        pass_mark: int,
+        competitive: int,
+        notes: List[str],
+        compute: Callable
+    ):
+        self.key = key
+        self.name = name
+        self.country_code = country_code
+        self.max_points = max_points
+        self.pass_mark = pass_mark
+        self.competitive = competitive
+        self.notes = notes
+        self.compute = compute
+
+
+class PointsCalculator:
+    """
+    Batch points calculator over every supported system.
+    """
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self.version = snapshot.version
+        self.gbp_rate = snapshot.currency_rates.get("GBP", 1.26)
+        self.systems: Dict[str, PointsSystem] = {
+            "canada_crs": PointsSystem(
+                "canada_crs", "Canada Express Entry (CRS)", "CA", 1200, 450, 550,
+                [
+                    "Single applicant, no spouse factors",
+                    "The overall English band is applied to all four abilities",
+                    "Work experience counts as foreign unless canadianExperienceYears is claimed",
+                    "Pass mark and competitive score are the typical general-draw cutoff range",
+                ],
+                self._canada_crs
+            ),
+            "australia_189": PointsSystem(
+                "australia_189", "Australia Skilled Independent (189)", "AU", 130, 65, 80,
+                ["Partner points (10 for a single applicant) count only when partnerPoints is claimed"],
+                self._australia
+            ),
+            "australia_190": PointsSystem(
+                "australia_190", "Australia Skilled Nominated (190)", "AU", 135, 65, 80,
+                [
+                    "Partner points (10 for a single applicant) count only when partnerPoints is claimed",
+                    "Includes 5 state nomination points",
+                ],
+                self._australia
+            ),
+            "uk_skilled_worker": PointsSystem(
+                "uk_skilled_worker", "UK Skilled Worker", "GB", 130, 70, 70,
+                [
+                    "A sponsored job offer at the required skill level counts only when ukJobOffer is claimed",
+                    "Salary is annual income converted to GBP unless ukSalaryGbp is claimed",
+                ],
+                self._uk_skilled_worker
+            ),
+        }
+        logger.info(f"Points calculator ready for {len(self.systems)} systems")
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def evaluate_batch(self, profiles: List[Dict], systems: Optional[Iterable[str]] = None) -> List[Dict[str, Dict]]:
+        """Points for every profile under each requested system (default: all)"""
+        keys = self.resolve_systems(systems)
+        columns = _columns(profiles)
+        scored = {key: self.systems[key].compute(key, columns) for key in keys}
+
+        results = []
+        for i in range(len(profiles)):
+            results.append({
+                key: self._result(self.systems[key], components, blockers, i)
+                for key, (components, blockers) in scored.items()
+            })
+        return results
+
+    def evaluate(self, profile: Dict, systems: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        return self.evaluate_batch([profile], systems)[0]
+
+    def resolve_systems(self, systems: Optional[Iterable[str]]) -> List[str]:
+        """System keys for names or country codes; raises ValueError on unknown ones"""
+        if not systems:
+            return list(self.systems)
+        keys = []
+        for name in systems:
+            lowered = str(name).strip().lower()
+            matches = [key for key, system in self.systems.items()
+                       if lowered in (key, system.country_code.lower())]
+            if not matches:
+                raise ValueError(f"Unknown points system: {name}")
+            keys.extend(key for key in matches if key not in keys)
+        return keys
+
+    def notes(self, systems: Iterable[str]) -> Dict[str, List[str]]:
+        """Standing assumptions of each system's scoring"""
+        return {key: self.systems[key].notes for key in systems}
+
+    def profile_match(self, country_code: str, profile: Dict) -> Optional[float]:
+        """
+        0-100 profile fit for a destination with a points test (None when it
+        has none): points relative to the competitive score, capped low when
+        a hard requirement of the test is not met.
+        """
+        key = DESTINATION_SYSTEMS.get((country_code or "").upper())
+        if key is None:
+            return None
+        result = self.evaluate(profile, [key])[key]
+        match = min(100.0, 100.0 * result["points"] / result["competitive"])
+        return min(match, BLOCKED_MATCH_CAP) if result["blockers"] else match
+
+    def prompt_summary(self, profile: Dict, countries: Iterable[str]) -> str:
+        """Exact points for the target countries' points tests, for agent task descriptions"""
+        codes = {str(c).upper() for c in countries or []}
+        keys = [key for key, system in self.systems.items() if system.country_code in codes]
+        if not keys:
+            return ""
+        lines = []
+        for key, result in self.evaluate(profile, keys).items():
+            lines.append(
+                f"- {result['name']}: {result['points']} points "
+                f"(pass mark {result['passMark']}, competitive {result['competitive']})"
+                + (f" - blocked: {'; '.join(result['blockers'])}" if result["blockers"] else "")
+            )
+        return "\n".join(lines)
+
+    def _result(self, system: PointsSystem, components: Dict[str, np.ndarray], blockers: Dict[str, np.ndarray], i: int) -> Dict:
+        breakdown = {name: int(points[i]) for name, points in components.items()}
+        total = sum(breakdown.values())
+        failed = [reason for reason, mask in blockers.items() if mask[i]]
+        return {
+            "system": system.key,
+            "name": system.name,
+            "countryCode": system.country_code,
+            "points": total,
+            "maxPoints": system.max_points,
+            "passMark": system.pass_mark,
+            "competitive": system.competitive,
+            "meetsPassMark": total >= system.pass_mark and not failed,
+            "blockers": failed,
+            "breakdown": breakdown
+        }
+
+    # ------------------------------------------------------------------
+    # Points systems (columns → component arrays, blocker masks)
+    # ------------------------------------------------------------------
+
+    def _canada_crs(self, key: str, c: Dict[str, np.ndarray]):
+        clb = IELTS_TO_CLB(c["english"])
+        education_tier = _by_education(c["education"], CRS_EDUCATION_TIER).astype(int)
+        clb_tier = CRS_CLB_TIER(clb).astype(int)
+        canadian_tier = CRS_CANADIAN_EXPERIENCE_TIER(c["canadianExperienceYears"]).astype(int)
+        foreign_tier = CRS_FOREIGN_EXPERIENCE_TIER(c["experience"]).astype(int)
+
+        education_combo = np.minimum(
+            CRS_TRANSFERABILITY_GROUP_CAP,
+            CRS_TRANSFERABILITY[education_tier, clb_tier] + CRS_TRANSFERABILITY[education_tier, canadian_tier]
+        )
+        foreign_combo = np.minimum(
+            CRS_TRANSFERABILITY_GROUP_CAP,
+            CRS_TRANSFERABILITY[foreign_tier, clb_tier] + CRS_TRANSFERABILITY[foreign_tier, canadian_tier]
+        )
+        french = np.where(c["frenchClb"] >= 7, np.where(clb >= 5, 50, 25), 0)
+
+        components = {
+            "age": CRS_AGE(c["age"]),
+            "education": _by_education(c["education"], CRS_EDUCATION),
+            "language": CRS_LANGUAGE_PER_ABILITY(clb) * 4,
+            "canadianExperience": CRS_CANADIAN_EXPERIENCE(c["canadianExperienceYears"]),
+            "skillTransferability": np.minimum(CRS_TRANSFERABILITY_CAP, education_combo + foreign_combo),
+            "provincialNomination": c["provincialNomination"] * CRS_PROVINCIAL_NOMINATION,
+            "jobOffer": c["canadianJobOffer"],
+            "canadianEducation": CRS_CANADIAN_EDUCATION(c["canadianEducationYears"]),
+            "frenchLanguage": french,
+            "sibling": c["siblingInCanada"] * CRS_SIBLING,
+        }
+        blockers = {
+            f"Federal Skilled Worker needs CLB {FSW_MIN_CLB} (IELTS {CLB_TO_IELTS[FSW_MIN_CLB]:g})": (clb < FSW_MIN_CLB) & ~np.isnan(c["english"]),
+        }
+        return components, blockers
+
+    def _australia(self, key: str, c: Dict[str, np.ndarray]):
+        experience = np.minimum(
+            AU_EXPERIENCE_CAP,
+            AU_OVERSEAS_EXPERIENCE(c["experience"]) + AU_AUSTRALIAN_EXPERIENCE(c["australianExperienceYears"])
+        )
+        components = {
+            "age": AU_AGE(c["age"]),
+            "english": AU_ENGLISH(c["english"]),
+            "experience": experience,
+            "education": _by_education(c["education"], AU_EDUCATION),
+            "bonuses": sum(c[claim] for claim in AU_BONUS_CLAIMS) * AU_BONUS_POINTS,
+            "partner": c["partnerPoints"],
+            "nomination": np.full(len(c["age"]), AU_NOMINATION[key], dtype=float),
+        }
+        blockers = {
+            f"Applicants must be under {AU_MAX_AGE}": c["age"] >= AU_MAX_AGE,
+            f"Competent English (IELTS {AU_MIN_IELTS:g}) is required": c["english"] < AU_MIN_IELTS,
+        }
+        return components, blockers
+
+    def _uk_skilled_worker(self, key: str, c: Dict[str, np.ndarray]):
+        job_offer = c["ukJobOffer"] > 0
+        salary_gbp = np.where(np.isnan(c["ukSalaryGbp"]), c["income"] / self.gbp_rate, c["ukSalaryGbp"])
+        phd = c["education"] == EDUCATION_ORDER.index("phd")
+
+        components = {
+            "jobOffer": job_offer * 20.0,
+            "skillLevel": job_offer * 20.0,
+            "english": (c["english"] >= UK_MIN_IELTS) * 10.0,
+            "salary": UK_SALARY_GBP(salary_gbp),
+            "phd": np.where(phd, np.where(c["stemField"] > 0, 20, 10), 0),
+            "shortageOccupation": c["shortageOccupation"] * 20,
+            "newEntrant": c["newEntrant"] * 20,
+        }
+        blockers = {
+            "A sponsored job offer is mandatory": ~job_offer,
+            f"English at B1 (IELTS {UK_MIN_IELTS:g}) is mandatory": c["english"] < UK_MIN_IELTS,
+        }
+        return components, blockers
+
+
+def _columns(profiles: List[Dict]) -> Dict[str, np.ndarray]:
+    """Profile attributes and points claims as one float column per name"""
+    values = [profile_values(profile) for profile in profiles]
+    claims = [{**CLAIM_DEFAULTS, **(profile.get("pointsClaims") or {})} for profile in profiles]
+
+    columns = {
+        name: np.array([v[name] for v in values], dtype=float)
+        for name in ("education", "experience", "english", "age", "income")
+    }
+    for name, default in CLAIM_DEFAULTS.items():
+        if name == "canadianJobOffer":
+            column = [CRS_JOB_OFFER.get(str(claim[name]).lower(), 0) for claim in claims]
+        else:
+            column = [np.nan if claim[name] is None else float(claim[name]) for claim in claims]
+        columns[name] = np.array(column, dtype=float)
+
+    columns["stemField"] = np.array([
+        float(any(word in str((profile.get("education") or {}).get("field", "")).lower() for word in UK_STEM_WORDS))
+        for profile in profiles
+    ])
+    return columns
+
+
+# Singleton instance
+_points_calculator: Optional[PointsCalculator] = None
+
+def get_points_calculator() -> PointsCalculator:
+    """Get or create the points calculator for the current snapshot"""
+    global _points_calculator
+    if _points_calculator is None:
+        _points_calculator = PointsCalculator(get_knowledge_snapshot())
+    return _points_calculator
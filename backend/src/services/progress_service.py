@@ -0,0 +1,131 @@
+"""
+Progress Service - Per-session progress events for streaming analysis updates
+"""
+import asyncio
+import threading
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from src.core.logging import logger
+
+
+# Events after which no further events are published for a session
+TERMINAL_EVENTS = {"analysis_completed", "analysis_failed"}
+
+
+class ProgressService:
+    """
+    Publishes analysis progress events and fans them out to subscribers.
+
+    The analysis itself runs in a worker thread (CrewAI's kickoff() is
+    blocking), while subscribers are async SSE handlers, so events are
+    handed to each subscriber's event loop with call_soon_threadsafe.
+    Every session keeps its event history so late subscribers replay
+    what they missed.
+    """
+
+    def __init__(self, max_sessions: int = 500):
+        self.max_sessions = max_sessions
+        self._events: Dict[str, List[Dict]] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, session_id: str, event: str, data: Optional[Dict] = None) -> Dict:
+        """Record an event for a session and push it to live subscribers"""
+        with self._lock:
+            history = self._events.setdefault(session_id, [])
+            payload = {
+                "id": len(history) + 1,
+                "event": event,
+                "session_id": session_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "data": data or {}
+            }
+            history.append(payload)
+            subscribers = list(self._subscribers.get(session_id, []))
+            self._evict_old_sessions()
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, payload)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                pass
+
+        logger.debug(f"Progress event {event} for session {session_id}")
+        return payload
+
+    def get_events(self, session_id: str) -> List[Dict]:
+        """Get all events recorded for a session"""
+        with self._lock:
+            return list(self._events.get(session_id, []))
+
+    async def subscribe(
+        self,
+        session_id: str,
+        heartbeat_seconds: float = 15.0
+    ) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield a session's events, replaying history first.
+
+        Yields None every ``heartbeat_seconds`` without events so the caller
+        can send a keep-alive. Stops after a terminal event.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        with self._lock:
+            history = list(self._events.get(session_id, []))
+            self._subscribers.setdefault(session_id, []).append((loop, queue))
+
+        try:
+            last_id = 0
+            for payload in history:
+                last_id = payload["id"]
+                yield payload
+                if payload["event"] in TERMINAL_EVENTS:
+                    return
+
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                # Skip events already replayed from history
+                if payload["id"] <= last_id:
+                    continue
+                last_id = payload["id"]
+                yield payload
+                if payload["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(session_id, [])
+                if (loop, queue) in subscribers:
+                    subscribers.remove((loop, queue))
+                if not subscribers:
+                    self._subscribers.pop(session_id, None)
+
+    def _evict_old_sessions(self):
+        """Drop the oldest finished sessions once over capacity (lock held)"""
+        if len(self._events) <= self.max_sessions:
+            return
+        for session_id in list(self._events):
+            if len(self._events) <= self.max_sessions:
+                break
+            history = self._events[session_id]
+            if history and history[-1]["event"] in TERMINAL_EVENTS and session_id not in self._subscribers:
+                del self._events[session_id]
+
+
+# Singleton instance
+_progress_service = None
+
+def get_progress_service() -> ProgressService:
+    """Get or create the progress service singleton"""
+    global _progress_service
+    if _progress_service is None:
+        _progress_service = ProgressService()
+    return _progress_service
@@ -0,0 +1,361 @@
+"""
+Rate Limiter - Client-side token-bucket governor for Groq traffic
+
+LLMService, ChatService and the CrewAI LLM all share one Groq API key. The
+governor tracks requests/min and tokens/min in two token buckets so bursts
+are queued or shed here, before Groq answers with 429s:
+
+- Priority classes: interactive chat > explore > async deep analysis.
+  Lower classes must leave a reserve in each bucket and wait behind any
+  queued higher-priority request.
+- Per-client quotas keyed by client IP, so one client cannot drain
+  the shared key.
+- Token usage is estimated from prompt size plus max_tokens before the
+  call and reconciled with the reported usage afterwards.
+
+The request's client and priority are carried in context variables set by
+LLMRequestContextMiddleware, so services do not need extra parameters.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+from src.core.config import settings
+from src.core.logging import logger
+
+
+class Priority(IntEnum):
+    """LLM request priority classes (lower value = more important)"""
+    CHAT = 0
+    EXPLORE = 1
+    ANALYSIS = 2
+
+
+# Share of each bucket a priority class must leave untouched for higher classes
+PRIORITY_RESERVE = {Priority.CHAT: 0.0, Priority.EXPLORE: 0.1, Priority.ANALYSIS: 0.3}
+
+# Longest a request may queue before it is shed (seconds)
+PRIORITY_MAX_WAIT = {Priority.CHAT: 5.0, Priority.EXPLORE: 15.0, Priority.ANALYSIS: 120.0}
+
+# Route prefix → priority; first match wins, so keep specific prefixes first
+ROUTE_PRIORITIES = (
+    ("/api/v1/chat", Priority.CHAT),
+    ("/api/v1/explore", Priority.EXPLORE),
+    ("/api/v1/analyze/real", Priority.EXPLORE),
+    ("/api/v1/analyze", Priority.ANALYSIS),
+)
+
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+MAX_TRACKED_CLIENTS = 10000
+
+_client_var: ContextVar[Optional[str]] = ContextVar("llm_client", default=None)
+_priority_var: ContextVar[Optional[Priority]] = ContextVar("llm_priority", default=None)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when an LLM request is shed instead of queued"""
+
+    def __init__(self, message: str, retry_after: float, scope: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.scope = scope
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket. The level may go negative when actual
+    usage exceeds the estimate; the debt is repaid by refill.
+    """
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken while leaving ``reserve`` of capacity"""
+        needed = min(self.capacity, amount + reserve * self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate if self.rate > 0 else float("inf")
+
+    def consume(self, amount: float):
+        self.level -= amount
+
+
+class LLMGovernor:
+    """
+    Admits, queues or sheds LLM calls against shared request/token budgets.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        client_requests_per_minute: int
+    ):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute)
+        self.client_requests_per_minute = client_requests_per_minute
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+        self._condition = threading.Condition()
+        self._waiting: Counter = Counter()
+        self._admitted: Counter = Counter()
+        self._shed: Counter = Counter()
+        self._wait_seconds: Counter = Counter()
+        self._tokens_estimated = 0
+        self._tokens_used = 0
+
+    def acquire(
+        self,
+        estimated_tokens: int,
+        priority: Optional[Priority] = None,
+        client_id: Optional[str] = None
+    ) -> int:
+        """
+        Block until the call may proceed, or raise RateLimitExceeded.
+
+        Priority and client default to the current request context.
+
+        Returns:
+            The token estimate that was charged (pass to record_usage)
+        """
+        priority = priority if priority is not None else _context_priority(Priority.EXPLORE)
+        client_id = client_id or _client_var.get()
+        reserve = PRIORITY_RESERVE[priority]
+        started = time.monotonic()
+        deadline = started + PRIORITY_MAX_WAIT[priority]
+
+        with self._condition:
+            now = time.monotonic()
+            client_bucket = self._client_bucket(client_id, now)
+            if client_bucket is not None and client_bucket.wait_time(1) > 0:
+                self._shed[priority.name] += 1
+                raise RateLimitExceeded(
+                    "Per-client LLM quota exceeded",
+                    retry_after=client_bucket.wait_time(1),
+                    scope="client"
+                )
+
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.requests.refill(now)
+                    self.tokens.refill(now)
+
+                    higher_waiting = any(self._waiting[p] for p in Priority if p < priority)
+                    if higher_waiting:
+                        wait = deadline - now
+                    else:
+                        wait = max(
+                            self.requests.wait_time(1, reserve),
+                            self.tokens.wait_time(estimated_tokens, reserve)
+                        )
+                        if wait == 0:
+                            self._admit(priority, estimated_tokens, client_bucket, now - started)
+                            return estimated_tokens
+
+                    if now + wait > deadline and not higher_waiting:
+                        # Would miss the deadline anyway - shed now instead of holding a slot
+                        self._shed[priority.name] += 1
+                        raise RateLimitExceeded(
+                            f"LLM capacity exhausted for {priority.name.lower()} requests",
+                            retry_after=wait,
+                            scope="global"
+                        )
+                    if now >= deadline:
+                        self._shed[priority.name] += 1
+                        raise RateLimitExceeded(
+                            "Timed out waiting behind higher-priority LLM requests",
+                            retry_after=1.0,
+                            scope="global"
+                        )
+                    self._condition.wait(timeout=min(wait, deadline - now))
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def charge(self, estimated_tokens: int, priority: Optional[Priority] = None):
+        """Record a call that could not be held back (e.g. from a library hook)"""
+        priority = priority if priority is not None else _context_priority(Priority.ANALYSIS)
+        with self._condition:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            self._admit(priority, estimated_tokens, None, 0.0)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Reconcile a charged estimate with the usage reported by Groq"""
+        if actual_tokens is None:
+            return
+        with self._condition:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+            self._tokens_used += actual_tokens
+            self._condition.notify_all()
+
+    def acquire_for_messages(self, messages: List[Dict], max_tokens: int) -> int:
+        """acquire() with the token estimate derived from the messages"""
+        return self.acquire(estimate_tokens(messages, max_tokens))
+
+    def stats(self) -> Dict:
+        """Current governor state for metrics"""
+        with self._condition:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                "limits": {
+                    "requestsPerMinute": self.requests.capacity,
+                    "tokensPerMinute": self.tokens.capacity,
+                    "clientRequestsPerMinute": self.client_requests_per_minute
+                },
+                "available": {
+                    "requests": round(self.requests.level, 2),
+                    "tokens": round(self.tokens.level)
+                },
+                "waiting": {p.name.lower(): self._waiting[p] for p in Priority},
+                "admitted": {p.name.lower(): self._admitted[p.name] for p in Priority},
+                "shed": {p.name.lower(): self._shed[p.name] for p in Priority},
+                "totalWaitSeconds": {p.name.lower(): round(self._wait_seconds[p.name], 2) for p in Priority},
+                "tokensEstimated": self._tokens_estimated,
+                "tokensUsed": self._tokens_used,
+                "trackedClients": len(self._clients)
+            }
+
+    def _admit(self, priority: Priority, tokens: int, client_bucket: Optional[TokenBucket], waited: float):
+        """Take from the buckets and update counters (lock held)"""
+        self.requests.consume(1)
+        self.tokens.consume(tokens)
+        if client_bucket is not None:
+            client_bucket.consume(1)
+        self._admitted[priority.name] += 1
+        self._wait_seconds[priority.name] += waited
+        self._tokens_estimated += tokens
+        if waited > 0.5:
+            logger.info(f"⏳ LLM {priority.name.lower()} request queued {waited:.1f}s by rate governor")
+
+    def _client_bucket(self, client_id: Optional[str], now: float) -> Optional[TokenBucket]:
+        """Per-client request bucket, least recently used evicted first (lock held)"""
+        if not client_id:
+            return None
+        bucket = self._clients.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.client_requests_per_minute, self.client_requests_per_minute)
+            self._clients[client_id] = bucket
+            if len(self._clients) > MAX_TRACKED_CLIENTS:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client_id)
+        bucket.refill(now)
+        return bucket
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: int = 0) -> int:
+    """Rough prompt size (~4 chars per token) plus the completion budget"""
+    prompt = sum(
+        len(str(m.get("content", ""))) // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE
+        if isinstance(m, dict) else len(str(m)) // CHARS_PER_TOKEN
+        for m in messages
+    )
+    return prompt + (max_tokens or 0)
+
+
+def priority_for_path(path: str) -> Priority:
+    """Priority class for an API route"""
+    for prefix, priority in ROUTE_PRIORITIES:
+        if path.startswith(prefix):
+            return priority
+    return Priority.EXPLORE
+
+
+def bind_request_context(client_id: Optional[str], priority: Priority):
+    """Set the current request's client and priority; returns reset tokens"""
+    return _client_var.set(client_id), _priority_var.set(priority)
+
+
+def reset_request_context(tokens):
+    client_token, priority_token = tokens
+    _client_var.reset(client_token)
+    _priority_var.reset(priority_token)
+
+
+def _context_priority(default: Priority) -> Priority:
+    """Priority bound to the current request, or ``default`` outside one (CHAT is 0, so no ``or``)"""
+    priority = _priority_var.get()
+    return priority if priority is not None else default
+
+
+_litellm_hook_installed = False
+
+
+def install_litellm_hook():
+    """
+    Route LiteLLM calls (used by the CrewAI LLM) through the governor.
+
+    LiteLLM swallows exceptions raised by callbacks, so a call that would be
+    shed is charged and allowed through rather than rejected; it still
+    waits its turn behind higher-priority traffic first.
+    """
+    global _litellm_hook_installed
+    if _litellm_hook_installed:
+        return
+    try:
+        import litellm
+        from litellm.integrations.custom_logger import CustomLogger
+    except ImportError:
+        logger.debug("LiteLLM not installed, CrewAI calls are not governed")
+        return
+
+    class GovernorCallback(CustomLogger):
+        def __init__(self):
+            super().__init__()
+            self._estimates: Dict[str, int] = {}
+
+        def log_pre_api_call(self, model, messages, kwargs):
+            max_tokens = (kwargs.get("optional_params") or {}).get("max_tokens") or 0
+            estimate = estimate_tokens(messages or [], max_tokens)
+            governor = get_llm_governor()
+            try:
+                governor.acquire(estimate, priority=_context_priority(Priority.ANALYSIS))
+            except RateLimitExceeded:
+                governor.charge(estimate)
+            self._estimates[kwargs.get("litellm_call_id")] = estimate
+
+        def log_success_event(self, kwargs, response_obj, start_time, end_time):
+            estimate = self._estimates.pop(kwargs.get("litellm_call_id"), None)
+            usage = getattr(response_obj, "usage", None)
+            if estimate is not None:
+                get_llm_governor().record_usage(estimate, getattr(usage, "total_tokens", None))
+
+        def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+            self._estimates.pop(kwargs.get("litellm_call_id"), None)
+
+    litellm.callbacks.append(GovernorCallback())
+    _litellm_hook_installed = True
+    logger.info("✅ LiteLLM calls routed through the LLM rate governor")
+
+
+# Singleton instance
+_llm_governor = None
+
+def get_llm_governor() -> LLMGovernor:
+    """Get or create the LLM governor singleton"""
+    global _llm_governor
+    if _llm_governor is None:
+        _llm_governor = LLMGovernor(
+            requests_per_minute=settings.GROQ_RPM_LIMIT,
+            tokens_per_minute=settings.GROQ_TPM_LIMIT,
+            client_requests_per_minute=settings.LLM_CLIENT_RPM_LIMIT
+        )
+    return _llm_governor
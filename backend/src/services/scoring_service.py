@@ -1,7 +1,10 @@
 """
 Scoring Service - Calculates and explains path scores
 """
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from src.core.constants import SCORE_THRESHOLDS, RISK_LEVELS
 
 
@@ -121,6 +124,80 @@ class ScoringService:
         
         return round(probability, 2), confidence
     
+    def score_batch(
+        self,
+        profile_match,
+        financial_readiness,
+        skill_demand,
+        risk_score,
+        timeline_fit,
+        path_steps,
+        has_blockers=False,
+        profile_strength=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many paths for many profiles in one vectorized pass.
+        
+        Every argument is a scalar or array-like; they are broadcast together,
+        so passing path-level components shaped (N, 1) and profile-level
+        components shaped (1, M) scores an N paths x M profiles grid. Results
+        match calculate_path_score / calculate_approval_probability /
+        rank_paths element for element.
+        
+        Args:
+            profile_match .. path_steps: Same meaning as calculate_path_score
+            has_blockers: Whether the path has blockers (approval penalty)
+            profile_strength: Profile strength for approval probability
+                (defaults to profile_match)
+            
+        Returns:
+            Dict of arrays with the broadcast shape:
+            - scores: rounded overall path scores (int)
+            - raw_scores: unrounded weighted scores
+            - probabilities: approval probabilities (0-1, 2 decimals)
+            - labels: score labels
+            - ranks: 1-based rank of each path along axis 0 (highest score
+              first, ties keep input order)
+        """
+        if profile_strength is None:
+            profile_strength = profile_match
+        
+        (profile_match, financial_readiness, skill_demand, risk_score,
+         timeline_fit, path_steps, has_blockers, profile_strength) = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (
+                profile_match, financial_readiness, skill_demand, risk_score,
+                timeline_fit, path_steps, has_blockers, profile_strength
+            ))
+        )
+        
+        complexity_score = np.maximum(0, 100 - (path_steps - 1) * 20)
+        
+        # Summed in the same order as calculate_path_score so results match bit for bit
+        raw_scores = profile_match * self.WEIGHTS["profile_match"]
+        raw_scores = raw_scores + financial_readiness * self.WEIGHTS["financial_readiness"]
+        raw_scores = raw_scores + skill_demand * self.WEIGHTS["skill_demand"]
+        raw_scores = raw_scores + (100 - risk_score) * self.WEIGHTS["risk_level"]
+        raw_scores = raw_scores + timeline_fit * self.WEIGHTS["timeline_fit"]
+        raw_scores = raw_scores + complexity_score * self.WEIGHTS["path_complexity"]
+        
+        # np.rint and round() both round half to even on the same double
+        scores = np.rint(raw_scores)
+        
+        probabilities = (
+            (scores / 100 * 0.5 + (100 - risk_score) / 100 * 0.5)
+            + (profile_strength - 50) / 200
+            - np.where(has_blockers.astype(bool), 0.15, 0)
+        )
+        probabilities = _round_like_python(np.clip(probabilities, 0.1, 0.95), 2)
+        
+        return {
+            "scores": scores.astype(int),
+            "raw_scores": raw_scores,
+            "probabilities": probabilities,
+            "labels": self._get_score_labels(raw_scores),
+            "ranks": _rank_descending(scores)
+        }
+    
     def rank_paths(self, paths_with_scores: List[Dict]) -> List[Dict]:
         """
         Rank paths by score and return with rankings.
@@ -164,6 +241,16 @@ class ScoringService:
                 return thresholds["label"]
         return "Unknown"
     
+    def _get_score_labels(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorized _get_score_label (first matching threshold wins)"""
+        labels = np.full(scores.shape, "Unknown", dtype=object)
+        unassigned = np.ones(scores.shape, dtype=bool)
+        for thresholds in SCORE_THRESHOLDS.values():
+            mask = unassigned & (scores >= thresholds["min"]) & (scores <= thresholds["max"])
+            labels[mask] = thresholds["label"]
+            unassigned &= ~mask
+        return labels
+    
     def _generate_explanation(self, components: Dict, final_score: float) -> str:
         """Generate natural language explanation of the score"""
         # Find top contributors
@@ -215,3 +302,31 @@ class ScoringService:
             return "Some challenges to address, but paths are still viable"
         else:
             return "Balanced profile with both strengths and areas for improvement"
+
+
+def _round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    np.round that agrees with built-in round().
+    
+    np.round scales by 10**ndigits before rounding, which can land on the
+    other side of a tie than round()'s correctly rounded result. Only values
+    sitting next to a tie can differ, so those few are redone with round().
+    """
+    rounded = np.array(np.round(values, ndigits))
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in map(tuple, np.argwhere(near_tie)):
+        rounded[index] = round(float(values[index]), ndigits)
+    return rounded
+
+
+def _rank_descending(scores: np.ndarray) -> np.ndarray:
+    """1-based ranks along axis 0, highest first, ties in input order"""
+    if scores.ndim == 0:
+        return np.ones((), dtype=int)
+    order = np.argsort(-scores, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[0] + 1).reshape(
+        (-1,) + (1,) * (scores.ndim - 1)
+    ), axis=0)
+    return ranks
@@ -0,0 +1,219 @@
+"""
+Sensitivity Service - Deterministic what-if sweeps over profile attributes
+
+Answers questions like "what if I had IELTS 7 / $10k more savings / one
+more year of experience" without an LLM call: each profile variant on the
+grid re-scores the candidate routes from the path graph, with the whole
+routes x variants grid scored in one ScoringService.score_batch pass.
+"""
+import copy
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.path_graph_service import PathGraph, get_path_graph
+from src.services.scoring_service import ScoringService
+from src.core.logging import logger
+
+
+EDUCATION_ORDER = ["high_school", "bachelors", "masters", "phd"]
+
+
+def _set_savings(profile: Dict, value: float):
+    profile.setdefault("financial", {})["savingsUsd"] = value
+
+
+def _set_experience(profile: Dict, value: float):
+    profile.setdefault("workExperience", {})["yearsOfExperience"] = int(value)
+
+
+def _set_education(profile: Dict, value: str):
+    profile.setdefault("education", {})["level"] = value
+
+
+def _set_ielts(profile: Dict, value: float):
+    languages = [
+        entry for entry in profile.get("languages") or []
+        if not (isinstance(entry, dict) and entry.get("language", "").lower() == "english")
+    ]
+    languages.append({"language": "English", "proficiency": "fluent", "ieltsScore": value})
+    profile["languages"] = languages
+
+
+def _set_timeline(profile: Dict, value: str):
+    profile.setdefault("goals", {})["timeline"] = value
+
+
+# attribute → (label, setter, default grid builder from the baseline profile)
+ATTRIBUTES: Dict[str, Tuple[str, Callable[[Dict, Any], None], Callable[[Dict], List[Any]]]] = {
+    "savingsUsd": (
+        "Savings (USD)",
+        _set_savings,
+        lambda p: [(p.get("financial", {}).get("savingsUsd", 0) or 0) + d for d in (5000, 10000, 20000)]
+    ),
+    "yearsOfExperience": (
+        "Years of experience",
+        _set_experience,
+        lambda p: [(p.get("workExperience", {}).get("yearsOfExperience", 0) or 0) + d for d in (1, 2, 3)]
+    ),
+    "educationLevel": (
+        "Education level",
+        _set_education,
+        lambda p: EDUCATION_ORDER[EDUCATION_ORDER.index(p.get("education", {}).get("level", "bachelors")) + 1:]
+        if p.get("education", {}).get("level", "bachelors") in EDUCATION_ORDER else []
+    ),
+    "ieltsScore": (
+        "IELTS band",
+        _set_ielts,
+        lambda p: [6.0, 7.0, 8.0]
+    ),
+    "timeline": (
+        "Timeline",
+        _set_timeline,
+        lambda p: [t for t in ("within_1_year", "within_2_years", "flexible")
+                   if t != p.get("goals", {}).get("timeline")]
+    ),
+}
+
+
+class SensitivityService:
+    """
+    Runs what-if sweeps over profile attributes.
+
+    The baseline profile and every perturbed variant form the columns of a
+    score grid whose rows are the candidate routes to the user's targets.
+    For each variant the best route's score and approval probability are
+    compared with the baseline to give the attribute's marginal impact.
+    """
+
+    def __init__(self, path_graph: PathGraph, scoring_service: ScoringService):
+        self.graph = path_graph
+        self.scoring = scoring_service
+
+    def analyze(
+        self,
+        user_profile: Dict,
+        attributes: Optional[List[str]] = None,
+        grid: Optional[Dict[str, List[Any]]] = None
+    ) -> Dict:
+        """
+        Sweep attributes and report their impact on the best path.
+
+        Args:
+            user_profile: Profile in the frontend (camelCase) format
+            attributes: Attributes to sweep (default: all supported)
+            grid: Optional explicit values per attribute, overriding defaults
+
+        Returns:
+            Baseline, per-attribute variant results and a ranking of
+            attributes by impact
+        """
+        started = time.perf_counter()
+        grid = grid or {}
+        attributes = [a for a in (attributes or list(ATTRIBUTES)) if a in ATTRIBUTES]
+
+        targets = user_profile.get("goals", {}).get("targetCountries", [])
+        origin = user_profile.get("nationality")
+        routes = [
+            route
+            for destination in targets
+            for route in self.graph.candidate_routes(destination, origin)
+        ]
+        if not routes:
+            raise ValueError("No candidate paths for the target countries")
+
+        # Column 0 is the baseline, then one column per (attribute, value)
+        variants = [("baseline", None, user_profile)]
+        for attribute in attributes:
+            _, setter, default_values = ATTRIBUTES[attribute]
+            for value in grid.get(attribute) or default_values(user_profile):
+                variant = copy.deepcopy(user_profile)
+                setter(variant, value)
+                variants.append((attribute, value, variant))
+
+        # Profile match depends only on the destination, not the whole route
+        matches = {
+            (destination, j): self.graph.profile_match(profile, destination)
+            for destination in {route[-1] for route in routes}
+            for j, (_, _, profile) in enumerate(variants)
+        }
+        components = [
+            [
+                self.graph.route_components(route, profile, matches[(route[-1], j)])
+                for j, (_, _, profile) in enumerate(variants)
+            ]
+            for route in routes
+        ]
+        batch = self.scoring.score_batch(**{
+            key: [[cell[key] for cell in row] for row in components]
+            for key in components[0][0]
+        })
+
+        # Best route per variant is the one ranked first in its column
+        best = np.argmin(batch["ranks"], axis=0)
+        columns = np.arange(len(variants))
+        best_scores = batch["scores"][best, columns]
+        best_probabilities = batch["probabilities"][best, columns]
+
+        def variant_result(column: int) -> Dict:
+            route = routes[best[column]]
+            return {
+                "score": int(best_scores[column]),
+                "approvalProbability": round(float(best_probabilities[column]) * 100),
+                "bestPath": {
+                    "id": "graph_" + "_".join(route).lower(),
+                    "countries": list(route)
+                }
+            }
+
+        baseline = variant_result(0)
+        results: Dict[str, Dict] = {}
+        for column, (attribute, value, _) in enumerate(variants[1:], start=1):
+            entry = results.setdefault(attribute, {
+                "attribute": attribute,
+                "label": ATTRIBUTES[attribute][0],
+                "variants": []
+            })
+            result = variant_result(column)
+            result.update({
+                "value": value,
+                "scoreDelta": result["score"] - baseline["score"],
+                "probabilityDelta": result["approvalProbability"] - baseline["approvalProbability"]
+            })
+            entry["variants"].append(result)
+
+        for entry in results.values():
+            entry["maxScoreDelta"] = max(v["scoreDelta"] for v in entry["variants"])
+            entry["maxProbabilityDelta"] = max(v["probabilityDelta"] for v in entry["variants"])
+
+        ranked = sorted(
+            results.values(),
+            key=lambda e: (e["maxScoreDelta"], e["maxProbabilityDelta"]),
+            reverse=True
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"📈 Sensitivity sweep: {len(routes)} paths x {len(variants)} variants in {elapsed_ms:.1f}ms"
+        )
+
+        return {
+            "baseline": baseline,
+            "attributes": ranked,
+            "mostImpactful": ranked[0]["attribute"] if ranked and ranked[0]["maxScoreDelta"] > 0 else None,
+            "gridSize": {"paths": len(routes), "variants": len(variants)},
+            "computeMs": round(elapsed_ms, 2),
+            "generatedAt": datetime.now().isoformat()
+        }
+
+
+# Singleton instance
+_sensitivity_service = None
+
+def get_sensitivity_service() -> SensitivityService:
+    """Get or create the sensitivity service singleton"""
+    global _sensitivity_service
+    if _sensitivity_service is None:
+        _sensitivity_service = SensitivityService(get_path_graph(), ScoringService())
+    return _sensitivity_service
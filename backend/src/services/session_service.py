@@ -6,12 +6,16 @@ from datetime import datetime
 import uuid
 
 from src.core.logging import logger
+from src.utils.serialization import dump_json
 
 
 class SessionService:
     """
     Manages user analysis sessions.
     In production, this would use Redis or a database.
+    
+    Completed results are also kept serialized ("result_json") so result
+    reads send stored bytes instead of re-encoding the payload.
     """
     
     def __init__(self):
@@ -27,6 +31,7 @@ class SessionService:
             "status": "pending",
             "user_profile": user_profile,
             "result": None,
+            "result_json": None,
             "error": None
         }
         
@@ -51,6 +56,7 @@ class SessionService:
             
             if result:
                 self._sessions[session_id]["result"] = result
+                self._sessions[session_id]["result_json"] = dump_json(result)
             if error:
                 self._sessions[session_id]["error"] = error
             
@@ -63,6 +69,13 @@ class SessionService:
             return session["result"]
         return None
     
+    def get_session_result_json(self, session_id: str) -> Optional[bytes]:
+        """Get the serialized result of a completed session"""
+        session = self.get_session(session_id)
+        if session and session["status"] == "completed":
+            return session.get("result_json")
+        return None
+    
     def delete_session(self, session_id: str):
         """Delete a session"""
         if session_id in self._sessions:
@@ -0,0 +1,210 @@
+"""
+Visa Catalog - Columnar table of every visa type across countries
+
+All ``visa_types`` of all countries are flattened into one NumPy structured
+array (one row per visa, one typed column per searchable attribute) using
+the normalized processing times and fees from the knowledge snapshot. A
+search is a handful of vectorized column comparisons and one lexsort, so
+it costs the same few array passes whether the corpus has 10 countries or
+190.
+"""
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.services.knowledge_model import Country, VisaType
+from src.services.visa_normalizer import fee_usd, processing_months
+
+
+# path_to_pr categories, ordered so "at least eventual" is pr_path >= EVENTUAL
+PR_NONE, PR_EVENTUAL, PR_DIRECT = 0, 1, 2
+PR_LABELS = {PR_NONE: "none", PR_EVENTUAL: "eventual", PR_DIRECT: "direct"}
+PR_FILTERS = {"direct": PR_DIRECT, "eventual": PR_EVENTUAL, "any": PR_EVENTUAL}
+
+# Tri-state flags: a visa that does not say is "unknown", never a match
+UNKNOWN, NO, YES = -1, 0, 1
+
+CATALOG_DTYPE = np.dtype([
+    ("country", np.int32),
+    ("region", np.int32),
+    ("processing_min", np.float64),
+    ("processing_max", np.float64),
+    ("fee_min_usd", np.float64),
+    ("fee_max_usd", np.float64),
+    ("funds_usd", np.float64),
+    ("work_permitted", np.int8),
+    ("family_allowed", np.int8),
+    ("employer_tied", np.int8),
+    ("pr_path", np.int8),
+    ("pr_years", np.float64),
+    ("friendliness", np.float64),
+])
+
+# Sort key → column; NaN values always sort last
+SORT_COLUMNS = {
+    "processing": "processing_max",
+    "fee": "fee_min_usd",
+    "pr_years": "pr_years",
+    "friendliness": "friendliness",
+}
+
+_PR_YEARS = re.compile(r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(year|month)s?", re.IGNORECASE)
+_PR_WORDS = re.compile(r"\bpr\b|\bilr\b|residen|citizenship|green card|permanent", re.IGNORECASE)
+
+
+class VisaCatalog:
+    """
+    Columnar, filterable table over the visa types of a set of countries.
+    """
+
+    def __init__(self, countries: Dict[str, Country]):
+        self.country_codes: List[str] = []
+        self.country_names: List[str] = []
+        self.regions: List[str] = []
+        self.visas: List[VisaType] = []
+
+        rows = []
+        for country in countries.values():
+            country_index = len(self.country_codes)
+            self.country_codes.append(country.code)
+            self.country_names.append(country.name)
+            if country.region not in self.regions:
+                self.regions.append(country.region)
+
+            for visa in country.visa_types:
+                months = processing_months(visa)
+                fee = fee_usd(visa)
+                funds = visa.normalized.get("financial_requirement")
+                pr_path, pr_years = _pr_route(visa.path_to_pr)
+                rows.append((
+                    country_index,
+                    self.regions.index(country.region),
+                    months["min"],
+                    months["max"],
+                    fee["min"],
+                    fee["max"],
+                    funds["min_usd"] if funds else np.nan,
+                    _flag(visa.work_permitted),
+                    _flag(visa.family_allowed),
+                    _flag(visa.employer_tied),
+                    pr_path,
+                    pr_years,
+                    country.immigration_friendliness,
+                ))
+                self.visas.append(visa)
+
+        self.table = np.array(rows, dtype=CATALOG_DTYPE)
+        self._region_lookup = {region.lower(): i for i, region in enumerate(self.regions)}
+        self._country_lookup = {code.lower(): i for i, code in enumerate(self.country_codes)}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def search(
+        self,
+        max_processing_months: Optional[float] = None,
+        work_permitted: Optional[bool] = None,
+        family_allowed: Optional[bool] = None,
+        employer_tied: Optional[bool] = None,
+        path_to_pr: Optional[str] = None,
+        max_pr_years: Optional[float] = None,
+        max_fee_usd: Optional[float] = None,
+        regions: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        sort: str = "processing",
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Visas matching every given predicate, sorted by ``sort``. Raises
+        ValueError for an unknown sort key or path_to_pr filter.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {sorted(SORT_COLUMNS)}")
+        t = self.table
+        mask = np.ones(len(t), dtype=bool)
+
+        if max_processing_months is not None:
+            mask &= t["processing_max"] <= max_processing_months
+        if max_fee_usd is not None:
+            mask &= t["fee_min_usd"] <= max_fee_usd
+        if max_pr_years is not None:
+            mask &= t["pr_years"] <= max_pr_years
+        for column, wanted in (
+            ("work_permitted", work_permitted),
+            ("family_allowed", family_allowed),
+            ("employer_tied", employer_tied),
+        ):
+            if wanted is not None:
+                mask &= t[column] == (YES if wanted else NO)
+        if path_to_pr:
+            if path_to_pr.lower() == "none":
+                mask &= t["pr_path"] == PR_NONE
+            elif path_to_pr.lower() in PR_FILTERS:
+                mask &= t["pr_path"] >= PR_FILTERS[path_to_pr.lower()]
+            else:
+                raise ValueError(f"Unknown path_to_pr '{path_to_pr}', expected direct, eventual, any or none")
+        if regions:
+            wanted_regions = [self._region_lookup.get(r.strip().lower(), -1) for r in regions]
+            mask &= np.isin(t["region"], wanted_regions)
+        if countries:
+            wanted_countries = [self._country_lookup.get(c.strip().lower(), -1) for c in countries]
+            mask &= np.isin(t["country"], wanted_countries)
+
+        matches = np.flatnonzero(mask)
+        values = t[SORT_COLUMNS[sort]][matches].astype(float)
+        key = -values if descending else values
+        # lexsort: last key is primary; NaN last, then value, then catalog order
+        order = matches[np.lexsort((matches, key, np.isnan(values)))]
+        if limit is not None:
+            order = order[:limit]
+        return [self._row(i) for i in order]
+
+    def _row(self, i: int) -> Dict:
+        row = self.table[i]
+        visa = self.visas[i]
+        return {
+            "country": self.country_names[row["country"]],
+            "countryCode": self.country_codes[row["country"]],
+            "region": self.regions[row["region"]],
+            "type": visa.type,
+            "name": visa.name,
+            "processingTime": visa.processing_time,
+            "processingMonths": {"min": float(row["processing_min"]), "max": float(row["processing_max"])},
+            "applicationFeeUsd": {"min": float(row["fee_min_usd"]), "max": float(row["fee_max_usd"])},
+            "financialRequirementUsd": None if np.isnan(row["funds_usd"]) else float(row["funds_usd"]),
+            "workPermitted": _flag_value(row["work_permitted"]),
+            "familyAllowed": _flag_value(row["family_allowed"]),
+            "employerTied": _flag_value(row["employer_tied"]),
+            "pathToPr": visa.path_to_pr,
+            "prPath": PR_LABELS[int(row["pr_path"])],
+            "prYears": None if np.isnan(row["pr_years"]) else float(row["pr_years"]),
+            "immigrationFriendliness": None if np.isnan(row["friendliness"]) else float(row["friendliness"]),
+        }
+
+
+def _flag(value) -> int:
+    return UNKNOWN if value is None else (YES if value else NO)
+
+
+def _flag_value(flag) -> Optional[bool]:
+    return None if flag == UNKNOWN else bool(flag == YES)
+
+
+def _pr_route(text: str):
+    """
+    (category, years until PR) from a path_to_pr description. Years are
+    only read when the text is about PR itself (not "after 18 months" of
+    some other switch), taking the upper end of a range.
+    """
+    lowered = (text or "").lower()
+    if "direct pr" in lowered and not lowered.startswith("no "):
+        return PR_DIRECT, 0.0
+    if not lowered or lowered.startswith("no ") or lowered.startswith("long-term residence"):
+        return PR_NONE, np.nan
+    match = _PR_YEARS.search(lowered)
+    if not match or not _PR_WORDS.search(lowered):
+        return PR_EVENTUAL, np.nan
+    amount = float(match.group(2) or match.group(1))
+    return PR_EVENTUAL, amount / 12 if match.group(3) == "month" else amount
@@ -0,0 +1,124 @@
+"""
+Visa Normalizer - Numeric ranges for free-form visa fields
+
+``processing_time``, ``application_fee`` and ``financial_requirement`` in
+``data/countries/*.json`` are written for people ("6-8 months",
+"CAD 155 + LMIA fee CAD 1,000", "CAD 13,757 (single) to CAD 36,407 (family
+of 7+)"). When the knowledge snapshot is compiled, each VisaType gets a
+``normalized`` mapping next to the raw text with month ranges and money
+ranges in the local currency and in USD (``currency_conversion_usd``), so
+consumers do arithmetic instead of re-parsing strings.
+"""
+import re
+from typing import Dict, Optional
+
+# Currency of "$"-style amounts in each country's data
+LOCAL_CURRENCY = {
+    "AU": "AUD", "CA": "CAD", "DE": "EUR", "JP": "JPY", "NL": "EUR",
+    "PT": "EUR", "SG": "SGD", "AE": "AED", "GB": "GBP", "US": "USD",
+}
+SYMBOL_CURRENCY = {"€": "EUR", "£": "GBP", "¥": "JPY"}
+
+DURATION_MONTHS = {"day": 1 / 30, "week": 1 / 4.3, "month": 1.0, "year": 12.0}
+
+# Processing time assumed when a visa gives none
+DEFAULT_PROCESSING_MONTHS = 6.0
+
+_DURATION = re.compile(
+    r"(?P<low>\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(?P<high>\d+(?:\.\d+)?))?\s*(?P<unit>day|week|month|year)s?",
+    re.IGNORECASE
+)
+_MONEY = re.compile(
+    r"(?P<currency>[€£$¥]|\b(?:AED|AUD|CAD|EUR|GBP|JPY|SGD|USD)\s?)"
+    r"(?P<low>\d[\d,]*(?:\.\d+)?)(?:\s*-\s*(?P<high>\d[\d,]*(?:\.\d+)?))?(?P<plus>\+)?"
+    r"(?:\s*/\s*(?P<per>year|month))?",
+    re.IGNORECASE
+)
+_RANGE_JOINER = re.compile(r"\bto\b|^\s*-\s*$", re.IGNORECASE)
+
+
+def parse_duration(text: str) -> Optional[Dict[str, float]]:
+    """First duration in a string as a month range: '2-4 weeks' → {min: 0.47, max: 0.93}"""
+    match = _DURATION.search(text or "")
+    if not match:
+        return None
+    factor = DURATION_MONTHS[match.group("unit").lower()]
+    low = float(match.group("low"))
+    high = float(match.group("high") or low)
+    return {"min": round(low * factor, 2), "max": round(high * factor, 2)}
+
+
+def parse_money(text: str, country_code: str, rates: Dict[str, float]) -> Optional[Dict]:
+    """
+    Money range of a fee or requirement string. Amounts joined by "to" form
+    one range, amounts joined by anything else ("+") add up; "/year" and
+    "/month" amounts are kept apart as a yearly recurring cost. Returns
+    None when the string has no amount.
+    """
+    text = text or ""
+    one_off = [0.0, 0.0]
+    annual = 0.0
+    currency = None
+    open_ended = False
+    previous_end = None
+
+    for match in _MONEY.finditer(text):
+        symbol = match.group("currency").strip()
+        found = SYMBOL_CURRENCY.get(symbol, LOCAL_CURRENCY.get(country_code, "USD") if symbol == "$" else symbol.upper())
+        currency = currency or found
+        # Amounts in a second currency are converted into the first
+        factor = rates.get(found, 1.0) / rates.get(currency, 1.0) if found != currency else 1.0
+        low = float(match.group("low").replace(",", "")) * factor
+        high = float((match.group("high") or match.group("low")).replace(",", "")) * factor
+        open_ended = open_ended or bool(match.group("plus"))
+
+        per = (match.group("per") or "").lower()
+        if per:
+            annual += low * (12 if per == "month" else 1)
+        elif previous_end is not None and _RANGE_JOINER.search(text[previous_end:match.start()]):
+            one_off[1] = max(one_off[1], high)
+        else:
+            one_off = [one_off[0] + low, one_off[1] + high]
+        previous_end = match.end()
+
+    if currency is None:
+        return None
+    # "£716 + endorsement fee": an extra charge without a figure
+    if any(part.strip()[:1].isalpha() and not _MONEY.search(part) for part in text.split("+")[1:]):
+        open_ended = True
+    rate = rates.get(currency, 1.0)
+    money = {
+        "currency": currency,
+        "min": round(one_off[0], 2),
+        "max": round(one_off[1], 2),
+        "min_usd": round(one_off[0] * rate, 2),
+        "max_usd": round(one_off[1] * rate, 2),
+        "open_ended": open_ended,
+    }
+    if annual:
+        money["annual"] = round(annual, 2)
+        money["annual_usd"] = round(annual * rate, 2)
+    return money
+
+
+def normalize_visa(visa: Dict, country_code: str, rates: Dict[str, float]) -> Dict:
+    """Parsed forms of a visa's free-form fields (None where a field has no number)"""
+    return {
+        "processing_months": parse_duration(visa.get("processing_time")),
+        "application_fee": parse_money(visa.get("application_fee"), country_code, rates),
+        "financial_requirement": parse_money(visa.get("financial_requirement"), country_code, rates),
+    }
+
+
+def processing_months(visa) -> Dict[str, float]:
+    """Normalized processing time of a VisaType, or the default when unknown"""
+    months = visa.normalized.get("processing_months") if visa is not None else None
+    if not months:
+        return {"min": DEFAULT_PROCESSING_MONTHS, "max": DEFAULT_PROCESSING_MONTHS}
+    return {"min": months["min"], "max": months["max"]}
+
+
+def fee_usd(visa) -> Dict[str, float]:
+    """Application fee range of a VisaType in USD (0 when unknown)"""
+    fee = visa.normalized.get("application_fee") if visa is not None else None
+    return {"min": fee["min_usd"], "max": fee["max_usd"]} if fee else {"min": 0.0, "max": 0.0}
@@ -0,0 +1,19 @@
+"""
+JSON Serialization - orjson encoding shared by responses and cached sessions
+"""
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize to compact JSON bytes.
+
+    orjson handles dicts, lists, datetimes and numpy values natively; anything
+    else (Pydantic models, sets, ...) falls back to FastAPI's jsonable_encoder.
+    """
+    return orjson.dumps(content, default=jsonable_encoder, option=ORJSON_OPTIONS)
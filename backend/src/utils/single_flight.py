@@ -0,0 +1,158 @@
+"""
+Single-Flight - Coalesce concurrent identical calls into one execution
+
+A double-clicked "Analyze" or a frontend retry would otherwise start a
+second multi-second LLM pipeline for the same profile. Calls are keyed by a
+canonical hash of their inputs; while one is running, identical calls wait
+on its future and receive the same result (or exception).
+
+Progress events emitted by the running call are fanned out to every
+caller's listener, and replayed to callers that join late, so each session
+still sees the full agent timeline.
+"""
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from src.core.logging import logger
+
+Listener = Callable[[str, Dict], None]
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Canonical hash of JSON-like inputs.
+
+    Keys are sorted, so dicts that differ only in insertion order (e.g. a
+    profile rebuilt by a different route) hash the same.
+    """
+    canonical = orjson.dumps(
+        parts,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+class _Call:
+    """One in-flight execution and the callers waiting on it."""
+
+    __slots__ = ("future", "listeners", "events", "waiters", "lock")
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.listeners: List[Listener] = []
+        self.events: List[Tuple[str, Dict]] = []
+        self.waiters = 1
+        self.lock = threading.Lock()
+
+    def join(self, listener: Optional[Listener]):
+        """Attach a listener, replaying events it missed"""
+        if listener is None:
+            return
+        with self.lock:
+            missed = list(self.events)
+            self.listeners.append(listener)
+        for event, data in missed:
+            _deliver(listener, event, data)
+
+    def notify(self, event: str, data: Dict = None):
+        with self.lock:
+            self.events.append((event, data))
+            listeners = list(self.listeners)
+        for listener in listeners:
+            _deliver(listener, event, data)
+
+
+def _deliver(listener: Listener, event: str, data: Dict):
+    try:
+        listener(event, data)
+    except Exception as e:
+        logger.warning(f"Progress listener failed on {event}: {e}")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Results are shared between callers, so they must be treated as
+    read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[Listener], Any],
+        listener: Optional[Listener] = None
+    ) -> Any:
+        """
+        Run ``fn(notify)`` once per key at a time and return its result.
+
+        Args:
+            key: Canonical key (see ``fingerprint``)
+            fn: The work; called with a ``notify(event, data)`` callable that
+                reaches every joined caller's listener
+            listener: Optional (event, data) callable for this caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        call.join(listener)
+
+        if not leader:
+            logger.info(f"🔗 Joined in-flight {self.name} ({call.waiters} callers)")
+            return call.future.result()
+
+        try:
+            result = fn(call.notify)
+        except BaseException as e:
+            call.future.set_exception(e)
+            raise
+        else:
+            call.future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "inFlight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced
+            }
+
+
+# Registry of named flights
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get or create the SingleFlight for an operation"""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_stats() -> Dict:
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.stats() for name, flight in flights.items()}
@@ -0,0 +1,260 @@
+"""
+Structured Output - Tolerant JSON extraction and schema validation for LLM output
+
+LLM responses often wrap JSON in markdown fences or prose, leave trailing
+commas, or get truncated at the token limit. ``extract_json`` recovers the
+first JSON value in a single scan of the text; ``parse_structured_output``
+validates it against a Pydantic schema and, when a repair callable is
+supplied, makes exactly one targeted repair attempt before giving up.
+"""
+import json
+import re
+from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound=BaseModel)
+
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_CLOSERS = {"{": "}", "[": "]"}
+_MAX_TRUNCATION_CUTS = 8
+
+
+class StructuredOutputError(ValueError):
+    """Raised when LLM output cannot be turned into the expected schema"""
+
+    def __init__(self, message: str, raw_output: str = "", errors: Optional[List[str]] = None):
+        super().__init__(message)
+        self.raw_output = raw_output
+        self.errors = errors or []
+
+
+def extract_json(text: str) -> Any:
+    """
+    Extract the first JSON object or array from free-form LLM text.
+
+    Handles markdown code fences, surrounding prose, trailing commas,
+    smart quotes, Python literals and output truncated mid-structure.
+
+    Raises:
+        StructuredOutputError: If no JSON value can be recovered
+    """
+    if not text or not text.strip():
+        raise StructuredOutputError("Empty output", raw_output=text or "")
+
+    candidates = [m.group(1) for m in _FENCE_PATTERN.finditer(text)] + [text]
+    for candidate in candidates:
+        candidate = candidate.strip()
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+
+        value = _scan_for_json(candidate)
+        if value is not None:
+            return value
+
+    raise StructuredOutputError("No JSON object found in output", raw_output=text)
+
+
+def parse_structured_output(
+    text: str,
+    schema: Type[T],
+    repair: Optional[Callable[[str], str]] = None,
+) -> T:
+    """
+    Parse LLM output into a validated Pydantic model.
+
+    Args:
+        text: Raw LLM output
+        schema: Pydantic model the output must satisfy
+        repair: Optional callable that sends a prompt to an LLM and returns
+            its raw reply. Called at most once, with a prompt listing the
+            exact validation errors.
+
+    Returns:
+        Validated instance of ``schema``
+
+    Raises:
+        StructuredOutputError: If the output (and the single repair attempt,
+            if any) cannot be validated
+    """
+    try:
+        return _validate(text, schema)
+    except StructuredOutputError as first_error:
+        if repair is None:
+            raise
+
+        repaired = repair(build_repair_prompt(schema, text, first_error.errors))
+        try:
+            return _validate(repaired, schema)
+        except StructuredOutputError as second_error:
+            raise StructuredOutputError(
+                f"{schema.__name__} still invalid after repair",
+                raw_output=repaired,
+                errors=second_error.errors,
+            ) from second_error
+
+
+def build_repair_prompt(schema: Type[BaseModel], raw_output: str, errors: List[str]) -> str:
+    """Build a targeted prompt asking the LLM to fix only the listed problems"""
+    error_lines = "\n".join(f"- {e}" for e in errors) or "- Output was not valid JSON"
+    return f"""The following output was supposed to be a JSON object matching the `{schema.__name__}` schema, but it failed validation.
+
+## Problems:
+{error_lines}
+
+## JSON Schema:
+{json.dumps(schema.model_json_schema(), separators=(",", ":"))}
+
+## Original Output:
+{raw_output[:8000]}
+
+Fix ONLY the listed problems and keep all other content unchanged.
+Return ONLY the corrected JSON object, with no markdown and no explanation."""
+
+
+def _validate(text: str, schema: Type[T]) -> T:
+    """Extract JSON from text and validate it against the schema"""
+    data = extract_json(text)
+
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        # Models sometimes wrap the payload in a single top-level key
+        if isinstance(data, dict) and len(data) == 1:
+            inner = next(iter(data.values()))
+            if isinstance(inner, dict):
+                try:
+                    return schema.model_validate(inner)
+                except ValidationError:
+                    pass
+
+        errors = [
+            f"{'.'.join(str(p) for p in err['loc']) or '<root>'}: {err['msg']}"
+            for err in e.errors()
+        ]
+        raise StructuredOutputError(
+            f"{schema.__name__} validation failed with {len(errors)} error(s)",
+            raw_output=text,
+            errors=errors,
+        ) from e
+
+
+def _scan_for_json(text: str) -> Any:
+    """
+    Walk the text once, tracking bracket depth and string state, and return
+    the first balanced (or truncated-then-closed) JSON value that parses.
+    """
+    start = -1
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+
+    i = 0
+    while i < len(text):
+        ch = text[i]
+
+        if start < 0:
+            if ch in _CLOSERS:
+                start = i
+                stack = [ch]
+            i += 1
+            continue
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            if stack and _CLOSERS[stack[-1]] == ch:
+                stack.pop()
+            if not stack:
+                value = _loads_lenient(text[start:i + 1])
+                if value is not None:
+                    return value
+                # Not valid JSON - resume scanning after this opener
+                i = start + 1
+                start = -1
+                continue
+        i += 1
+
+    if start >= 0 and stack:
+        return _close_truncated(text[start:])
+    return None
+
+
+def _loads_lenient(candidate: str) -> Any:
+    """json.loads with common LLM mistakes cleaned up"""
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    cleaned = candidate.translate(_SMART_QUOTES)
+    cleaned = _TRAILING_COMMA_PATTERN.sub(r"\1", cleaned)
+    cleaned = re.sub(
+        r"(?<=[:\[,\s])(True|False|None)(?=\s*[,}\]])",
+        lambda m: _PYTHON_LITERALS[m.group(1)],
+        cleaned,
+    )
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        return None
+
+
+def _close_truncated(fragment: str) -> Any:
+    """
+    Close a JSON value that was cut off before its closing brackets.
+
+    Each attempt closes any open string and brackets; if that does not parse,
+    the fragment is cut back to the previous comma and retried.
+    """
+    for _ in range(_MAX_TRUNCATION_CUTS):
+        stack, in_string = _open_brackets(fragment)
+        candidate = fragment + ('"' if in_string else "")
+        candidate = candidate.rstrip().rstrip(",")
+        value = _loads_lenient(candidate + "".join(_CLOSERS[o] for o in reversed(stack)))
+        if value is not None:
+            return value
+
+        cut = fragment.rfind(",")
+        if cut <= 0:
+            return None
+        fragment = fragment[:cut]
+    return None
+
+
+def _open_brackets(fragment: str) -> Tuple[List[str], bool]:
+    """Return the unclosed brackets and whether the fragment ends inside a string"""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+
+    for ch in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]" and stack and _CLOSERS[stack[-1]] == ch:
+            stack.pop()
+
+    return stack, in_string
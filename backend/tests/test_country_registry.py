@@ -0,0 +1,74 @@
+"""
+Country registry: identifier resolution and free-text detection
+"""
+import pytest
+
+from src.services.chat_service import ChatService
+from src.services.country_registry import get_country_registry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return get_country_registry()
+
+
+@pytest.mark.parametrize("text, iso2, key", [
+    ("GB", "GB", "uk"),
+    ("gbr", "GB", "uk"),
+    ("uk", "GB", "uk"),
+    ("United Kingdom", "GB", "uk"),
+    ("Great Britain", "GB", "uk"),
+    ("USA", "US", "usa"),
+    ("U.S.A.", "US", "usa"),
+    ("United States of America", "US", "usa"),
+    ("usa", "US", "usa"),
+    ("UAE", "AE", "uae"),
+    ("Emirates", "AE", "uae"),
+    ("  canada ", "CA", "canada"),
+    ("the Netherlands", "NL", "netherlands"),
+    ("Holland", "NL", "netherlands"),
+    ("Indian", "IN", None),
+    ("british", "GB", "uk"),
+    ("IND", "IN", None),
+    ("express entry", "CA", "canada"),
+])
+def test_resolve(registry, text, iso2, key):
+    assert registry.code(text) == iso2
+    assert registry.key(text) == key
+
+
+@pytest.mark.parametrize("text", ["", "Atlantis", "pole", "dane", "finn", "kiwi"])
+def test_resolve_unknown(registry, text):
+    assert registry.resolve(text) is None
+
+
+def test_name_falls_back_to_input(registry):
+    assert registry.name("GB") == "United Kingdom"
+    assert registry.name("Atlantis") == "Atlantis"
+
+
+def test_codes_dedupes_and_drops_unknown(registry):
+    assert registry.codes(["UK", "GB", "Atlantis", "Canada"]) == ["GB", "CA"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Language and demonym words are not country mentions
+    ("What English test score do I need for Canada Express Entry?", ["CA"]),
+    ("I am Indian and want a German Blue Card", ["DE"]),
+    ("Do I need to speak Dutch or French in the Netherlands?", ["NL"]),
+    ("Is the IELTS required if my partner is a Kiwi or a Pole?", []),
+    # Names, aliases, dotted abbreviations and programme names are
+    ("Move from the U.S.A. to the UK via Dubai", ["US", "GB", "AE"]),
+    ("H1B or Green Card options", ["US"]),
+    ("South Korea vs South Africa", ["KR", "ZA"]),
+    # Bare ISO codes only count uppercase ("in", "can" are English words)
+    ("can IN citizens go to CAN", ["IN", "CA"]),
+    ("can in citizens apply", []),
+])
+def test_find_in_text(registry, text, expected):
+    assert [record.iso2 for record in registry.find_in_text(text)] == expected
+
+
+def test_chat_detects_only_named_countries():
+    chat = ChatService.__new__(ChatService)
+    assert chat._detect_countries("What English test score do I need for Canada Express Entry?") == ["CA"]
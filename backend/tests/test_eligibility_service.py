@@ -0,0 +1,99 @@
+"""
+Eligibility engine tests: eligible / borderline / ineligible classification
+"""
+import pytest
+
+from src.services.eligibility_service import STATUS_LABELS, get_eligibility_engine
+
+
+def make_profile(age=29, education="masters", ielts=7.0, experience=3, income=60000, savings=20000):
+    return {
+        "age": age,
+        "education": {"level": education},
+        "workExperience": {"yearsOfExperience": experience},
+        "languages": [{"language": "English", "ieltsScore": ielts}] if ielts is not None else [],
+        "financial": {"annualIncomeUsd": income, "savingsUsd": savings},
+    }
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return get_eligibility_engine()
+
+
+def verdict(engine, profile, country, visa_type):
+    evaluation = engine.evaluate(profile, [country])
+    for label in STATUS_LABELS:
+        for visa in evaluation[label]:
+            if visa["visaType"] == visa_type:
+                return label, {check["check"]: check["status"] for check in visa["unmet"]}
+    raise AssertionError(f"{country} {visa_type} was not evaluated")
+
+
+@pytest.mark.parametrize("profile, country, visa_type, status, unmet", [
+    # Express Entry: CLB 7 (IELTS 6.0), 1 year experience, ~USD 10,180 settlement funds
+    (make_profile(), "CA", "express_entry", "eligible", {}),
+    (make_profile(savings=9000), "CA", "express_entry", "borderline", {"funds": "borderline"}),
+    (make_profile(savings=5000), "CA", "express_entry", "ineligible", {"funds": "ineligible"}),
+    (make_profile(ielts=5.5), "CA", "express_entry", "borderline", {"english": "borderline"}),
+    (make_profile(ielts=5.0), "CA", "express_entry", "ineligible", {"english": "ineligible"}),
+    # No English score at all is unknown, not a failure
+    (make_profile(ielts=None), "CA", "express_entry", "borderline", {"english": "borderline"}),
+    # Australia 189: under 45
+    (make_profile(age=44), "Australia", "skilled_independent", "eligible", {}),
+    (make_profile(age=45), "Australia", "skilled_independent", "borderline", {"age": "borderline"}),
+    (make_profile(age=47), "Australia", "skilled_independent", "ineligible", {"age": "ineligible"}),
+    # Blue Card: a degree is required; the salary applies to the job offer, so low income is only borderline
+    (make_profile(income=20000), "germany", "eu_blue_card", "borderline", {"salary": "borderline"}),
+    (make_profile(education="diploma"), "germany", "eu_blue_card", "ineligible", {"education": "ineligible"}),
+    # Japan: a degree or 10 years of experience
+    (make_profile(education="diploma", experience=12), "JP", "engineer_specialist", "eligible", {}),
+    (make_profile(education="diploma", experience=9), "JP", "engineer_specialist", "borderline", {"education": "borderline"}),
+    (make_profile(education="diploma", experience=3), "JP", "engineer_specialist", "ineligible", {"education": "ineligible"}),
+    # UAE Green Visa: the salary minimum is waived with 3+ years of experience
+    (make_profile(income=10000, experience=3), "UAE", "green_visa", "eligible", {}),
+    (make_profile(income=10000, experience=1), "UAE", "green_visa", "borderline", {"salary": "borderline"}),
+])
+def test_classification(engine, profile, country, visa_type, status, unmet):
+    assert verdict(engine, profile, country, visa_type) == (status, unmet)
+
+
+def test_evaluate_only_target_countries(engine):
+    evaluation = engine.evaluate(make_profile(), ["Canada", "GB"])
+    codes = {visa["countryCode"] for label in STATUS_LABELS for visa in evaluation[label]}
+    assert codes == {"CA", "GB"}
+    assert evaluation["evaluatedVisas"] == sum(len(evaluation[label]) for label in STATUS_LABELS)
+
+
+def test_batch_matches_single_evaluation(engine):
+    profiles = [make_profile(), make_profile(savings=9000), make_profile(age=47, ielts=5.0)]
+    status = engine.evaluate_batch(profiles)["status"]
+    for column, profile in enumerate(profiles):
+        evaluation = engine.evaluate(profile)
+        by_visa = {
+            (visa["countryCode"], visa["visaType"]): label
+            for label in STATUS_LABELS for visa in evaluation[label]
+        }
+        for row, visa in enumerate(engine.visas):
+            assert STATUS_LABELS[status[row, column]] == by_visa[(visa.code, visa.visa_type)]
+
+
+def test_resolve_countries(engine):
+    assert engine.resolve_countries(["canada", "UK", "British", "Atlantis"]) == {"CA", "GB"}
+
+
+def test_prompt_summary_screens_out_ineligible(engine):
+    summary = engine.prompt_summary(make_profile(savings=5000), ["CA"])
+    assert "Screened out (hard requirements not met): Canada" in summary
+    assert "Express Entry" in summary.split("Screened out")[1]
+
+
+def test_filter_country_data(engine):
+    filtered = engine.filter_country_data(
+        [{"code": "CA", "name": "Canada", "visa_types": ["unfiltered"]}, {"code": "XX", "name": "Elsewhere"}],
+        make_profile(savings=5000)
+    )
+    canada, unknown = filtered
+    assert "express_entry" not in {visa["type"] for visa in canada["visa_types"]}
+    assert any("Express Entry" in name for name in canada["screened_out_visas"])
+    assert unknown == {"code": "XX", "name": "Elsewhere"}
@@ -0,0 +1,91 @@
+"""
+Points tests: CRS, Australia 189/190 and UK Skilled Worker totals
+"""
+import pytest
+
+from src.services.points_service import BLOCKED_MATCH_CAP, get_points_calculator
+
+
+def make_profile(age=29, education="masters", ielts=7.0, experience=3, income=None, claims=None):
+    profile = {
+        "age": age,
+        "education": {"level": education},
+        "workExperience": {"yearsOfExperience": experience},
+        "languages": [{"language": "English", "ieltsScore": ielts}] if ielts is not None else [],
+        "financial": {"annualIncomeUsd": income},
+    }
+    if claims:
+        profile["pointsClaims"] = claims
+    return profile
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return get_points_calculator()
+
+
+@pytest.mark.parametrize("profile, system, points, blocked", [
+    # CRS: age 110 + masters 135 + CLB 9 (4 x 31) + transferability 50 + 50
+    (make_profile(), "canada_crs", 469, False),
+    # ... + provincial nomination 600
+    (make_profile(claims={"provincialNomination": True}), "canada_crs", 1069, False),
+    # ... + 1 year Canadian experience 40 (transferability stays capped at 100)
+    (make_profile(claims={"canadianExperienceYears": 1}), "canada_crs", 509, False),
+    # Age 35: 77 + bachelors 120 + CLB 7 (4 x 17) + transferability 13 + 13
+    (make_profile(age=35, education="bachelors", ielts=6.0, experience=1), "canada_crs", 291, False),
+    # IELTS 5.5 is CLB 6 (4 x 9, no transferability), below the FSW minimum
+    (make_profile(ielts=5.5), "canada_crs", 281, True),
+    # Australia 189: age 30 + English 10 + experience 5 + masters 15 (no partner points unless claimed)
+    (make_profile(), "australia_189", 60, False),
+    (make_profile(claims={"partnerPoints": 10}), "australia_189", 70, False),
+    # 190 adds 5 nomination points
+    (make_profile(), "australia_190", 65, False),
+    (make_profile(age=45), "australia_189", 30, True),
+    (make_profile(ielts=5.5), "australia_189", 50, True),
+    # UK: job offer 20 + skill level 20 + English 10 + salary 20
+    (make_profile(claims={"ukJobOffer": True, "ukSalaryGbp": 30000}), "uk_skilled_worker", 70, False),
+    (make_profile(claims={"ukJobOffer": True, "ukSalaryGbp": 24000}), "uk_skilled_worker", 60, False),
+    # PhD in a STEM field adds 20
+    (
+        {**make_profile(education="phd", claims={"ukJobOffer": True, "ukSalaryGbp": 30000}),
+         "education": {"level": "phd", "field": "Computer Science"}},
+        "uk_skilled_worker", 90, False
+    ),
+    # No job offer claimed: nothing for the offer and blocked
+    (make_profile(claims={"ukSalaryGbp": 30000}), "uk_skilled_worker", 30, True),
+])
+def test_totals(calculator, profile, system, points, blocked):
+    result = calculator.evaluate(profile, [system])[system]
+    assert result["points"] == points
+    assert sum(result["breakdown"].values()) == points
+    assert bool(result["blockers"]) == blocked
+
+
+def test_unclaimed_facts_score_zero(calculator):
+    results = calculator.evaluate({})
+    assert {key: result["points"] for key, result in results.items()} == {
+        "canada_crs": 0,
+        "australia_189": 0,
+        "australia_190": 5,
+        "uk_skilled_worker": 0,
+    }
+    assert results["uk_skilled_worker"]["blockers"] == ["A sponsored job offer is mandatory"]
+
+
+def test_blocked_destination_match_is_capped(calculator):
+    assert calculator.profile_match("GB", make_profile()) <= BLOCKED_MATCH_CAP
+    assert calculator.profile_match("GB", make_profile(claims={"ukJobOffer": True, "ukSalaryGbp": 30000})) == 100.0
+    assert calculator.profile_match("JP", make_profile()) is None
+
+
+def test_batch_matches_single(calculator):
+    profiles = [make_profile(), make_profile(age=40, ielts=8.0), {}]
+    batch = calculator.evaluate_batch(profiles)
+    assert batch == [calculator.evaluate(profile) for profile in profiles]
+
+
+def test_resolve_systems(calculator):
+    assert calculator.resolve_systems(["AU"]) == ["australia_189", "australia_190"]
+    assert calculator.resolve_systems(["gb", "canada_crs"]) == ["uk_skilled_worker", "canada_crs"]
+    with pytest.raises(ValueError):
+        calculator.resolve_systems(["NZ"])
@@ -0,0 +1,71 @@
+"""
+Rate governor tests: priority classes taken from the request context
+"""
+import pytest
+
+from src.services.rate_limiter import (
+    LLMGovernor,
+    Priority,
+    RateLimitExceeded,
+    TokenBucket,
+    bind_request_context,
+    reset_request_context,
+)
+
+ESTIMATE = 100
+
+
+@pytest.fixture
+def governor():
+    """Token budget with exactly one call's worth left and (practically) no refill"""
+    governor = LLMGovernor(requests_per_minute=100, tokens_per_minute=1000, client_requests_per_minute=100)
+    governor.tokens = TokenBucket(capacity=1000, per_minute=1)
+    governor.tokens.level = ESTIMATE
+    return governor
+
+
+@pytest.fixture
+def bound():
+    tokens = []
+
+    def bind(priority):
+        tokens.append(bind_request_context(None, priority))
+
+    yield bind
+    for token in reversed(tokens):
+        reset_request_context(token)
+
+
+def test_chat_context_is_admitted_under_chat_reserve(governor, bound):
+    bound(Priority.CHAT)
+    assert governor.acquire(ESTIMATE) == ESTIMATE
+    admitted = governor.stats()["admitted"]
+    assert admitted["chat"] == 1
+    assert admitted["explore"] == 0
+
+
+@pytest.mark.parametrize("priority", [Priority.EXPLORE, Priority.ANALYSIS])
+def test_lower_priorities_keep_the_reserve(governor, bound, priority):
+    bound(priority)
+    with pytest.raises(RateLimitExceeded) as error:
+        governor.acquire(ESTIMATE)
+    assert error.value.scope == "global"
+    assert governor.stats()["shed"][priority.name.lower()] == 1
+
+
+@pytest.mark.parametrize("priority, counted", [
+    (Priority.CHAT, "chat"),
+    (Priority.EXPLORE, "explore"),
+    (None, "analysis"),
+])
+def test_charge_uses_context_priority(governor, bound, priority, counted):
+    if priority is not None:
+        bound(priority)
+    governor.charge(ESTIMATE)
+    assert governor.stats()["admitted"][counted] == 1
+
+
+def test_acquire_defaults_to_explore_outside_a_request():
+    governor = LLMGovernor(requests_per_minute=100, tokens_per_minute=1000, client_requests_per_minute=100)
+    governor.acquire(ESTIMATE)
+    assert governor.stats()["admitted"]["explore"] == 1
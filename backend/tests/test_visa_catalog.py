@@ -0,0 +1,93 @@
+"""
+Visa catalog tests: search filters, sort order and path_to_pr parsing
+"""
+import math
+
+import pytest
+
+from src.services.knowledge_snapshot import get_knowledge_snapshot
+from src.services.visa_catalog import PR_DIRECT, PR_EVENTUAL, PR_NONE, VisaCatalog, _pr_route
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return VisaCatalog(get_knowledge_snapshot().countries)
+
+
+def keys(results):
+    return {(visa["countryCode"], visa["type"]) for visa in results}
+
+
+def test_every_visa_is_a_row(catalog):
+    countries = get_knowledge_snapshot().countries.values()
+    assert len(catalog) == sum(len(country.visa_types) for country in countries)
+    assert len(catalog.search()) == len(catalog)
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"path_to_pr": "direct"}, {("AU", "skilled_independent"), ("AU", "skilled_nominated"), ("CA", "express_entry"), ("CA", "pnp")}),
+    ({"path_to_pr": "None"}, {("AE", "employment_visa"), ("AE", "golden_visa"), ("AE", "green_visa")}),
+    ({"work_permitted": False}, {("DE", "job_seeker")}),
+    ({"employer_tied": False, "regions": ["middle east"]}, {("AE", "golden_visa"), ("AE", "green_visa")}),
+    ({"countries": ["ca"], "max_processing_months": 8}, {("CA", "express_entry"), ("CA", "work_permit"), ("CA", "study_permit")}),
+    # Visas without a stated PR timeline never match a PR-years limit
+    ({"max_pr_years": 1}, {
+        ("AU", "skilled_independent"), ("AU", "skilled_nominated"), ("CA", "express_entry"), ("CA", "pnp"),
+        ("SG", "employment_pass"), ("JP", "highly_skilled_professional"),
+    }),
+    ({"max_fee_usd": 50, "countries": ["JP", "DE"]}, {
+        ("JP", "highly_skilled_professional"), ("JP", "engineer_specialist"), ("JP", "startup_visa"), ("JP", "student"),
+    }),
+    # "Does not say" is unknown and never matches either answer
+    ({"family_allowed": False}, set()),
+    ({"countries": ["Atlantis"]}, set()),
+])
+def test_filters(catalog, filters, expected):
+    assert keys(catalog.search(**filters)) == expected
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_puts_missing_values_last(catalog, descending):
+    years = [visa["prYears"] for visa in catalog.search(sort="pr_years", descending=descending)]
+    known = [value for value in years if value is not None]
+    assert years[:len(known)] == known
+    assert known == sorted(known, reverse=descending)
+    assert len(known) < len(years)
+
+
+def test_sort_ties_keep_catalog_order(catalog):
+    # Every Japanese visa has the same fee
+    results = catalog.search(sort="fee", countries=["JP"])
+    assert len({visa["applicationFeeUsd"]["min"] for visa in results}) == 1
+    japan = catalog.country_codes.index("JP")
+    in_order = [visa.type for visa, row in zip(catalog.visas, catalog.table) if row["country"] == japan]
+    assert [visa["type"] for visa in results] == in_order
+
+
+def test_limit(catalog):
+    fastest = catalog.search(sort="processing", limit=3)
+    assert len(fastest) == 3
+    assert fastest == catalog.search(sort="processing")[:3]
+
+
+@pytest.mark.parametrize("filters", [{"sort": "cost"}, {"path_to_pr": "soon"}])
+def test_rejects_unknown_options(catalog, filters):
+    with pytest.raises(ValueError):
+        catalog.search(**filters)
+
+
+@pytest.mark.parametrize("text, category, years", [
+    ("Direct PR on arrival", PR_DIRECT, 0.0),
+    ("No direct PR path. Consider Golden Visa for long-term.", PR_NONE, None),
+    ("Long-term residence, not citizenship", PR_NONE, None),
+    ("", PR_NONE, None),
+    ("5 years continuous residence → ILR", PR_EVENTUAL, 5.0),
+    ("Graduate route (2-3 years) → Skilled Worker → ILR", PR_EVENTUAL, 3.0),
+    ("Can apply for PR after 6 months, typically approved after 2+ years", PR_EVENTUAL, 0.5),
+    # A duration that is not about PR is not a PR timeline
+    ("Can move within EU after 18 months", PR_EVENTUAL, None),
+])
+def test_pr_route(text, category, years):
+    parsed_category, parsed_years = _pr_route(text)
+    assert parsed_category == category
+    assert math.isnan(parsed_years) if years is None else parsed_years == years
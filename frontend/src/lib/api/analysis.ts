@@ -215,6 +215,69 @@ export async function pollForAnalysisResult(
     throw new Error("Analysis timed out");
 }
 
+export interface AnalysisProgressEvent {
+    id: number;
+    event:
+        | "analysis_started"
+        | "agent_started"
+        | "agent_completed"
+        | "fallback_started"
+        | "analysis_completed"
+        | "analysis_failed";
+    session_id: string;
+    timestamp: string;
+    data: any;
+}
+
+/**
+ * Stream async analysis progress over Server-Sent Events.
+ * Calls onEvent as each agent starts/finishes (with partial output)
+ * and resolves with the final result.
+ */
+export function streamAnalysisProgress(
+    sessionId: string,
+    onEvent?: (event: AnalysisProgressEvent) => void
+): Promise<AnalysisResponse> {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(
+            `${API_BASE_URL}/api/v1/analyze/stream/${sessionId}`
+        );
+        let finished = false;
+
+        const handle = (message: MessageEvent) => {
+            const event: AnalysisProgressEvent = JSON.parse(message.data);
+            if (onEvent) {
+                onEvent(event);
+            }
+            if (event.event === "analysis_completed") {
+                finished = true;
+                source.close();
+                resolve(event.data.result);
+            } else if (event.event === "analysis_failed") {
+                finished = true;
+                source.close();
+                reject(new Error(event.data.error || "Analysis failed"));
+            }
+        };
+
+        [
+            "analysis_started",
+            "agent_started",
+            "agent_completed",
+            "fallback_started",
+            "analysis_completed",
+            "analysis_failed",
+        ].forEach((name) => source.addEventListener(name, handle as EventListener));
+
+        source.onerror = () => {
+            if (!finished) {
+                source.close();
+                reject(new Error("Progress stream disconnected"));
+            }
+        };
+    });
+}
+
 /**
  * Unified analysis function that supports both modes.
  * @param request - The analysis request
@@ -224,7 +287,8 @@ export async function pollForAnalysisResult(
 export async function analyzeProfileWithMode(
     request: AnalysisRequest,
     mode: "fast" | "deep" = "fast",
-    onProgress?: (status: AsyncAnalysisStatusResponse) => void
+    onProgress?: (status: AsyncAnalysisStatusResponse) => void,
+    onEvent?: (event: AnalysisProgressEvent) => void
 ): Promise<AnalysisResponse> {
     if (mode === "fast") {
         // Direct Groq LLM call
@@ -232,6 +296,17 @@ export async function analyzeProfileWithMode(
     } else {
         // CrewAI multi-agent async analysis
         const startResponse = await startAsyncAnalysis(request);
+        if (typeof EventSource !== "undefined") {
+            try {
+                return await streamAnalysisProgress(startResponse.session_id, onEvent);
+            } catch (error) {
+                const status = await getAnalysisStatus(startResponse.session_id);
+                if (status.status === "failed") {
+                    throw error;
+                }
+                console.warn("Progress stream unavailable, falling back to polling", error);
+            }
+        }
         return pollForAnalysisResult(
             startResponse.session_id,
             60,